@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+文章规范化流水线
+各类源解析出的原始条目逐条流过同一组阶段：
+
+    解析 → 时间窗口 → 去重 → 分类 / 规范化 → 数量上限 → 补充（翻译）
+
+每个阶段是一个可调用对象，接收条目字典，返回（可能修改过的）条目，返回 None 表示丢弃。
+ArticlePipeline.run 是生成器：条目逐个向下游传递，凑够数量后不再从上游取条目，
+所以过滤总是发生在摘要清洗、翻译这类昂贵操作之前，内存占用与源的条目数无关。
+边下载边解析的场景用 ArticlePipeline.push 逐条推入。
+"""
+
+import hashlib
+from datetime import datetime
+
+SUMMARY_MAX_CHARS = 250
+TITLE_MAX_CHARS = 150
+
+
+def matches_keywords(keywords, title, summary=''):
+    """标题或摘要中是否包含任一关键词（不区分大小写）"""
+    content = f"{title} {summary}".lower()
+    return any(keyword in content for keyword in keywords)
+
+
+class ArticlePipeline:
+    """按顺序组合的条目处理阶段"""
+
+    def __init__(self, stages, max_entries=None, max_articles=None):
+        """
+        Args:
+            stages: 阶段列表，依次作用于每个条目
+            max_entries: 最多查看多少条原始条目
+            max_articles: 最多产出多少篇文章
+        """
+        self.stages = list(stages)
+        self.max_entries = max_entries
+        self.max_articles = max_articles
+        self.scanned = 0
+        self.kept = 0
+
+    @property
+    def full(self):
+        if self.max_articles is not None and self.kept >= self.max_articles:
+            return True
+        return self.max_entries is not None and self.scanned >= self.max_entries
+
+    def push(self, entry):
+        """处理一条条目，返回文章；被某个阶段丢弃时返回 None"""
+        self.scanned += 1
+        for stage in self.stages:
+            entry = stage(entry)
+            if entry is None:
+                return None
+        self.kept += 1
+        return entry
+
+    def run(self, entries):
+        """逐条处理上游条目并产出文章；数量凑够后立即停止，不再消费上游"""
+        if self.full:
+            return
+        for entry in entries:
+            article = self.push(entry)
+            if article is not None:
+                yield article
+            if self.full:
+                return
+
+
+class TimeWindow:
+    """丢弃发布时间早于 cutoff 的条目（没有时间的按当前时间处理），并记录连续过期的条目数"""
+
+    def __init__(self, cutoff):
+        self.cutoff = cutoff
+        self.stale = 0
+
+    def __call__(self, entry):
+        published = entry.get('published') or datetime.now()
+        if published < self.cutoff:
+            self.stale += 1
+            return None
+        self.stale = 0
+        entry['published'] = published
+        return entry
+
+
+def require_title_and_link(entry):
+    """去掉标题、链接首尾空白，缺少任一项的条目丢弃"""
+    entry['title'] = entry.get('title', '').strip()
+    entry['link'] = entry.get('link', '').strip()
+    if not entry['title'] or not entry['link']:
+        return None
+    return entry
+
+
+class Dedupe:
+    """按链接去重；条目没有 id 时用链接哈希的前 8 位"""
+
+    def __init__(self):
+        self.seen = set()
+
+    def __call__(self, entry):
+        link_hash = hashlib.md5(entry['link'].encode()).hexdigest()
+        if link_hash in self.seen:
+            return None
+        self.seen.add(link_hash)
+        entry.setdefault('id', link_hash[:8])
+        return entry
+
+
+class KeywordFilter:
+    """AI 类型的源只保留命中关键词的条目（事实类型全部保留）"""
+
+    def __init__(self, article_type, keywords, use_summary=True, importance=None):
+        """
+        Args:
+            use_summary: 是否连同摘要一起匹配（为 False 时只看标题，摘要可以延后提取）
+            importance: 命中后设置的重要度；None 表示不修改
+        """
+        self.article_type = article_type
+        self.keywords = keywords
+        self.use_summary = use_summary
+        self.importance = importance
+
+    def __call__(self, entry):
+        if self.article_type != 'ai':
+            return entry
+        summary = entry.get('summary', '') if self.use_summary else ''
+        if not matches_keywords(self.keywords, entry['title'], summary):
+            return None
+        if self.importance is not None:
+            entry['importance'] = self.importance
+        return entry
+
+
+class Normalize:
+    """把条目整理成统一的文章字典：清洗并截断摘要、格式化时间、补全源信息"""
+
+    def __init__(self, source, article_type, clean_summary=None, default_category='general'):
+        """
+        Args:
+            clean_summary: 摘要清洗函数（如去除 HTML 标签）；None 表示摘要已是纯文本
+        """
+        self.source = source
+        self.article_type = article_type
+        self.clean_summary = clean_summary
+        self.default_category = default_category
+
+    def __call__(self, entry):
+        if 'summary' in entry:
+            summary = entry['summary']
+            # 摘要可以是延迟求值的函数，只有走到这一步的条目才会提取
+            if callable(summary):
+                summary = summary()
+            summary = summary.strip()
+            if summary and self.clean_summary:
+                summary = self.clean_summary(summary)
+            entry['summary'] = summary[:SUMMARY_MAX_CHARS] + '...' if len(summary) > SUMMARY_MAX_CHARS else summary
+
+        entry['title'] = entry['title'][:TITLE_MAX_CHARS]
+        entry['time'] = (entry.pop('published', None) or datetime.now()).strftime('%Y-%m-%d %H:%M')
+        entry.setdefault('source', self.source['name'])
+        entry.setdefault('category', self.source.get('category', self.default_category))
+        entry.setdefault('lang', self.source.get('lang', 'en'))
+        entry.setdefault('importance', 6)
+        entry['type'] = self.article_type
+        return entry
+
+
+class Translate:
+    """为英文文章补充翻译字段（放在流水线最后，只翻译通过所有过滤的文章）"""
+
+    def __init__(self, translate):
+        """
+        Args:
+            translate: 翻译函数 (title, summary) -> {'title', 'summary'}
+        """
+        self.translate = translate
+
+    def __call__(self, article):
+        if article.get('lang') != 'en':
+            return article
+        return apply_translation(article, self.translate(article['title'], article.get('summary', '')))
+
+
+def apply_translation(article, translated):
+    """把翻译结果 {'title', 'summary'} 写入文章的翻译字段"""
+    article['title_translated'] = translated['title']
+    if 'summary' in article:
+        article['summary_translated'] = translated['summary']
+    return article
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+解析性能基准测试
+
+用法:
+    python benchmarks.py arxiv                       # 使用生成的模拟页面
+    python benchmarks.py arxiv --arxiv-page saved.html   # 使用保存下来的真实页面（可多次指定）
+    python benchmarks.py summaries --feed saved.xml  # 使用保存下来的 RSS/Atom（可多次指定）
+    python benchmarks.py bytes --feed big.xml --html-page listing.html   # 解码后解析 vs 直接解析 bytes（含内存峰值）
+    python benchmarks.py feeds --feed saved.xml      # RSS/Atom 吞吐 + 与 feedparser 的结果一致性
+    python benchmarks.py structured --html-page listing.html   # JSON-LD 快速路径 vs DOM 解析
+    python benchmarks.py partial --html-page listing.html      # 整页解析 vs 只解析前几个条目（含内存峰值）
+    python benchmarks.py pool --feed saved.xml       # 解析阶段用线程池 vs 进程池（含启动开销）
+    python benchmarks.py arxiv --repeat 50
+
+每个基准比较新旧两种实现，输出中位数耗时、最快耗时和加速比，并检查两者结果一致。
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+
+import feedparser
+from bs4 import BeautifulSoup
+
+from news_parsers import (
+    _parse_arxiv_listing_bs, _parse_arxiv_listing_lxml, _parse_html_dom, _parse_rss_feedparser,
+    _parse_rss_lxml, ParseStage, parse_html_listing, parse_rss_feed, strip_html,
+)
+from structured_data import extract_structured_entries
+
+BENCH_SOURCE = {'name': 'Benchmark', 'url': 'https://example.com/', 'category': 'tech', 'lang': 'en'}
+
+
+def _timeit(func, repeat):
+    """执行 repeat 次，返回每次耗时（秒）列表"""
+    func()  # 预热
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _report(title, rows):
+    """
+    打印对比表格
+
+    Args:
+        rows: [(方案名, 耗时列表)]，第一行作为基准
+    """
+    print(f"\n📊 {title}")
+    baseline = statistics.median(rows[0][1])
+    for name, timings in rows:
+        median = statistics.median(timings)
+        print(f"   {name:<28} 中位数 {median * 1000:8.2f} ms | 最快 {min(timings) * 1000:8.2f} ms | "
+              f"加速比 {baseline / median:5.1f}x")
+
+
+def _peak_memory(func):
+    """执行一次 func，返回期间 Python 分配的内存峰值（字节）"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _report_memory(rows):
+    """打印内存峰值对比：rows 为 [(方案名, 峰值字节)]"""
+    for name, peak in rows:
+        print(f"   {name:<28} 内存峰值 {peak / 1024 / 1024:8.2f} MB")
+
+
+def _comparable(articles):
+    """去掉与解析无关、每次都会变化的字段"""
+    return [{k: v for k, v in article.items() if k != 'time'} for article in articles or []]
+
+
+def synthetic_arxiv_listing(count=250):
+    """生成与 arXiv /list/cs.AI/recent 结构一致的模拟列表页"""
+    entries = []
+    for i in range(count):
+        paper_id = f"2410.{i:05d}"
+        entries.append(
+            f"<dt><a name='item{i + 1}'>[{i + 1}]</a>"
+            f"<a href='/abs/{paper_id}' title='Abstract' id='{paper_id}'>arXiv:{paper_id}</a> "
+            f"[<a href='/pdf/{paper_id}' title='Download PDF'>pdf</a>, "
+            f"<a href='https://arxiv.org/html/{paper_id}v1' title='View HTML'>html</a>]</dt>"
+            f"<dd><div class='meta'>"
+            f"<div class='list-title mathjax'><span class='descriptor'>Title:</span> "
+            f"Scaling Reasoning in Large Language Models, Part {i}</div>"
+            f"<div class='list-authors'><a href='/a/alice_1'>Alice Zhang</a>, "
+            f"<a href='/a/bob_1'>Bob Li</a>, <a href='/a/carol_1'>Carol Wang</a></div>"
+            f"<div class='list-comments mathjax'><span class='descriptor'>Comments:</span> 12 pages</div>"
+            f"<div class='list-subjects'><span class='descriptor'>Subjects:</span> "
+            f"<span class='primary-subject'>Artificial Intelligence (cs.AI)</span></div>"
+            f"<p class='mathjax'>We study how chain-of-thought supervision affects reasoning "
+            f"in transformer models. {'Experiments show consistent gains. ' * 8}</p>"
+            f"</div></dd>"
+        )
+    return (
+        "<!DOCTYPE html><html lang='en'><head><meta charset='utf-8'><title>Artificial Intelligence</title>"
+        "<script>window.MathJax = {};</script></head><body><div id='header'>arXiv</div>"
+        f"<div id='dlpage'><h1>Artificial Intelligence</h1><dl id='articles'>{''.join(entries)}</dl></div>"
+        "<footer>About Help Contact</footer></body></html>"
+    ).encode('utf-8')
+
+
+def bench_arxiv(args):
+    """arXiv 列表页：BeautifulSoup vs lxml XPath"""
+    repeat = args.repeat
+    pages = _load_pages(args.arxiv_page)
+    if not pages:
+        pages = [('模拟页面 (250 篇)', synthetic_arxiv_listing())]
+
+    for label, content in pages:
+        bs_result = _parse_arxiv_listing_bs(content, BENCH_SOURCE, 'utf-8')
+        lxml_result = _parse_arxiv_listing_lxml(content, BENCH_SOURCE, 'utf-8')
+        if _comparable(bs_result) != _comparable(lxml_result):
+            print(f"⚠️  {label}: 两种解析结果不一致")
+
+        _report(f"arXiv 列表页解析 - {label} ({len(content) / 1024:.0f} KB)", [
+            ('BeautifulSoup', _timeit(lambda: _parse_arxiv_listing_bs(content, BENCH_SOURCE, 'utf-8'), repeat)),
+            ('lxml XPath', _timeit(lambda: _parse_arxiv_listing_lxml(content, BENCH_SOURCE, 'utf-8'), repeat)),
+        ])
+
+
+def _load_pages(paths):
+    """读取保存下来的页面文件，返回 [(文件名, bytes)]"""
+    pages = []
+    for path in paths or []:
+        with open(path, 'rb') as f:
+            pages.append((path, f.read()))
+    return pages
+
+
+def synthetic_feed(count=40):
+    """生成摘要为富文本 HTML 的模拟 RSS（类似 WordPress 输出的全文摘要）"""
+    now = datetime.now()
+    paragraph = (
+        "<p>OpenAI&#8217;s latest <a href='https://example.com/model'>model</a> shows "
+        "<strong>strong</strong> results on reasoning benchmarks &mdash; researchers say the gains "
+        "come from better data.&nbsp;The company said it will publish details later.</p>"
+    )
+    items = []
+    for i in range(count):
+        body = (
+            f"<figure><img src='https://example.com/{i}.jpg' alt='cover &amp; image'/>"
+            f"<figcaption>Photo {i}</figcaption></figure>" + paragraph * 12 +
+            "<ul><li>Point one</li><li>Point two</li></ul><script>track();</script>"
+        )
+        items.append(
+            f"<item><title>AI story {i}</title><link>https://example.com/{i}</link>"
+            f"<pubDate>{format_datetime(now - timedelta(hours=i))}</pubDate>"
+            f"<description><![CDATA[{body}]]></description></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel><title>Bench</title>'
+        + ''.join(items) + '</channel></rss>'
+    ).encode('utf-8')
+
+
+def _bs_summary(summary):
+    """原来的做法：每条摘要构造一棵 BeautifulSoup 树"""
+    return BeautifulSoup(summary, 'html.parser').get_text()[:250]
+
+
+def _same_text(a, b):
+    """忽略空白差异后，较短的一方是否是另一方的前缀（两者截断位置可能不同）"""
+    a, b = ''.join(a.split()), ''.join(b.split())
+    n = min(len(a), len(b))
+    return a[:n] == b[:n]
+
+
+def bench_summaries(args):
+    """RSS 摘要去标签：BeautifulSoup vs strip_html"""
+    feeds = _load_pages(args.feed) or [('模拟 feed (40 条富文本摘要)', synthetic_feed())]
+
+    for label, content in feeds:
+        summaries = [entry.get('summary', '') for entry in feedparser.parse(content).entries]
+        summaries = [s for s in summaries if s]
+        if not summaries:
+            print(f"⚠️  {label}: 没有摘要，跳过")
+            continue
+
+        matched = sum(_same_text(_bs_summary(s), strip_html(s, 250)) for s in summaries)
+        size = sum(len(s) for s in summaries) / len(summaries)
+        _report(f"RSS 摘要去标签 - {label} ({len(summaries)} 条，平均 {size:.0f} 字符，"
+                f"文本一致 {matched}/{len(summaries)})", [
+            ('BeautifulSoup.get_text', _timeit(lambda: [_bs_summary(s) for s in summaries], args.repeat)),
+            ('strip_html', _timeit(lambda: [strip_html(s, 250) for s in summaries], args.repeat)),
+        ])
+
+
+def bench_feeds(args):
+    """
+    RSS/Atom：feedparser vs lxml 快速路径（吞吐；--feed 指定的 feed 同时检查两者结果一致）
+
+    格式变体的对照语料在 tests/test_feed_parity.py 中。
+    """
+    cutoff = datetime.now() - timedelta(hours=48)
+
+    pages = _load_pages(args.feed)
+    if pages:
+        print("\n🧪 结果一致性（lxml 快速路径 vs feedparser）")
+    for label, content in pages:
+        for article_type in ('fact', 'ai'):
+            expected = _parse_rss_feedparser(content, BENCH_SOURCE, article_type, cutoff)
+            fast = _parse_rss_lxml(content, BENCH_SOURCE, article_type, cutoff)
+            if fast is None:
+                status = '↩️  不规范，回退 feedparser'
+            elif _comparable(fast) == _comparable(expected):
+                status = '✓ 一致'
+            else:
+                status = '❌ 不一致'
+            print(f"   {label:<36} {article_type:<4} {status}")
+
+    samples = pages or [('模拟 feed (400 条)', synthetic_feed(400))]
+    for label, content in samples:
+        _report(f"RSS 解析吞吐 - {label} ({len(content) / 1024:.0f} KB)", [
+            ('feedparser', _timeit(lambda: _parse_rss_feedparser(content, BENCH_SOURCE, 'fact', cutoff), args.repeat)),
+            ('lxml 快速路径', _timeit(lambda: _parse_rss_lxml(content, BENCH_SOURCE, 'fact', cutoff), args.repeat)),
+        ])
+
+
+def synthetic_listing(count=400):
+    """生成较大的 HTML 列表页（每个条目带较长的摘要）"""
+    items = ''.join(
+        f"<article class='post-card'><h2><a href='/post/{i}'>AI story {i}</a></h2>"
+        f"<p class='excerpt'>{'Large language models keep improving. ' * 20}</p></article>"
+        for i in range(count)
+    )
+    return f"<html><head><meta charset='utf-8'></head><body><main>{items}</main></body></html>".encode('utf-8')
+
+
+def bench_bytes(args):
+    """先解码成 str 再解析 vs 直接把 bytes 交给解析器（耗时与内存峰值）"""
+    cutoff = datetime.now() - timedelta(days=365)
+    feeds = _load_pages(args.feed) or [('模拟 feed (400 条)', synthetic_feed(400))]
+    for label, content in feeds:
+        via_str = lambda: _parse_rss_feedparser(content.decode('utf-8', errors='replace'), BENCH_SOURCE, 'fact', cutoff)
+        via_bytes = lambda: _parse_rss_feedparser(content, BENCH_SOURCE, 'fact', cutoff, 'utf-8')
+        _report(f"RSS 解析 - {label} ({len(content) / 1024:.0f} KB)", [
+            ('decode → str → feedparser', _timeit(via_str, args.repeat)),
+            ('bytes → feedparser', _timeit(via_bytes, args.repeat)),
+        ])
+        _report_memory([
+            ('decode → str → feedparser', _peak_memory(via_str)),
+            ('bytes → feedparser', _peak_memory(via_bytes)),
+        ])
+
+    pages = _load_pages(args.html_page) or [('模拟列表页 (400 条)', synthetic_listing())]
+    for label, content in pages:
+        via_str = lambda: parse_html_listing(content.decode('utf-8', errors='replace'), BENCH_SOURCE, 'fact')
+        via_bytes = lambda: parse_html_listing(content, BENCH_SOURCE, 'fact', 'utf-8')
+        _report(f"HTML 列表页解析 - {label} ({len(content) / 1024:.0f} KB)", [
+            ('decode → str → BeautifulSoup', _timeit(via_str, args.repeat)),
+            ('bytes → BeautifulSoup', _timeit(via_bytes, args.repeat)),
+        ])
+        _report_memory([
+            ('decode → str → BeautifulSoup', _peak_memory(via_str)),
+            ('bytes → BeautifulSoup', _peak_memory(via_bytes)),
+        ])
+
+
+def synthetic_structured_listing(count=60):
+    """生成带 JSON-LD ItemList 的列表页（同时保留 DOM 条目，两条路径都能解析）"""
+    now = datetime.now()
+    elements = ','.join(
+        f'{{"@type":"ListItem","position":{i + 1},"item":{{"@type":"NewsArticle","headline":"AI story {i}",'
+        f'"url":"https://example.com/post/{i}","datePublished":"{(now - timedelta(hours=i)).strftime("%Y-%m-%dT%H:%M:%S")}",'
+        f'"description":"Large language models keep improving."}}}}'
+        for i in range(count)
+    )
+    ld_json = f'{{"@context":"https://schema.org","@type":"ItemList","itemListElement":[{elements}]}}'
+    nav = ''.join(f"<li><a href='/section/{i}'>Section {i}</a></li>" for i in range(200))
+    items = ''.join(
+        f"<article class='post-card'><h2><a href='/post/{i}'>AI story {i}</a></h2>"
+        f"<p class='excerpt'>{'Large language models keep improving. ' * 20}</p></article>"
+        for i in range(count)
+    )
+    return (
+        f"<html><head><meta charset='utf-8'><script type='application/ld+json'>{ld_json}</script></head>"
+        f"<body><nav><ul>{nav}</ul></nav><main>{items}</main></body></html>"
+    ).encode('utf-8')
+
+
+def bench_structured(args):
+    """HTML 列表页：DOM 启发式解析 vs JSON-LD 结构化元数据"""
+    cutoff = datetime.now() - timedelta(hours=48)
+    pages = _load_pages(args.html_page) or [('模拟列表页 (60 条 + JSON-LD)', synthetic_structured_listing())]
+    for label, content in pages:
+        entries = extract_structured_entries(content, 'utf-8')
+        if entries is None:
+            print(f"\n⚠️  {label}: 没有可用的结构化元数据，只能走 DOM 解析")
+            continue
+        dated = sum(1 for entry in entries if entry['published'])
+        print(f"\n🗂️  {label}: 结构化条目 {len(entries)} 条，其中 {dated} 条带发布时间")
+        _report(f"HTML 列表页解析 - {label} ({len(content) / 1024:.0f} KB)", [
+            ('DOM 启发式', _timeit(lambda: _parse_html_dom(content, BENCH_SOURCE, 'fact', 'utf-8'), args.repeat)),
+            ('结构化元数据', _timeit(lambda: parse_html_listing(content, BENCH_SOURCE, 'fact', 'utf-8', None, cutoff), args.repeat)),
+        ])
+
+
+def synthetic_homepage(count=200):
+    """生成带大段导航、脚本和页脚的首页（条目只占页面前部的一小部分）"""
+    nav = ''.join(f"<li><a href='/section/{i}'>Section {i}</a></li>" for i in range(300))
+    script = f"<script>var config = {{{','.join(f'k{i}: {i}' for i in range(2000))}}};</script>"
+    footer = ''.join(f"<div class='footer-link'><a href='/about/{i}'>About {i}</a></div>" for i in range(500))
+    return (
+        f"<html><head><meta charset='utf-8'>{script}</head><body><nav><ul>{nav}</ul></nav>"
+        f"{synthetic_listing(count).decode('utf-8').split('<body>')[1].split('</body>')[0]}"
+        f"<footer>{footer}</footer></body></html>"
+    ).encode('utf-8')
+
+
+def bench_partial(args):
+    """HTML 列表页：整页构建 DOM vs 只构建学习到的条目选择器命中的前几个条目（耗时与内存峰值）"""
+    pages = _load_pages(args.html_page) or [('模拟首页 (200 条 + 导航/脚本/页脚)', synthetic_homepage())]
+    for label, content in pages:
+        expected, profile = _parse_html_dom(content, BENCH_SOURCE, 'fact', 'utf-8', partial=False)
+        if not profile:
+            print(f"\n⚠️  {label}: 没有找到列表条目，跳过")
+            continue
+        full = lambda: _parse_html_dom(content, BENCH_SOURCE, 'fact', 'utf-8', profile, partial=False)
+        partial = lambda: _parse_html_dom(content, BENCH_SOURCE, 'fact', 'utf-8', profile, partial=True)
+        same = _comparable(partial()[0]) == _comparable(full()[0])
+        print(f"\n🧩 {label}: 条目选择器 {profile['item']}，结果{'一致' if same else '不一致 ❌'}")
+        _report(f"HTML 列表页解析 - {label} ({len(content) / 1024:.0f} KB)", [
+            ('整页解析', _timeit(full, args.repeat)),
+            ('局部解析', _timeit(partial, args.repeat)),
+        ])
+        _report_memory([
+            ('整页解析', _peak_memory(full)),
+            ('局部解析', _peak_memory(partial)),
+        ])
+
+
+def bench_pool(args):
+    """
+    解析阶段：线程池 vs spawn 进程池（一次运行的完整开销，含创建和关闭执行器）
+
+    实际运行时 spawn 子进程还要重新导入主脚本（google.generativeai 等），
+    这里的进程池只导入本文件，测得的进程池开销是下限。
+    """
+    cutoff = datetime.now() - timedelta(hours=48)
+    feeds = [content for _, content in _load_pages(args.feed)] or [synthetic_feed(40) for _ in range(12)]
+
+    def run(use_processes):
+        stage = ParseStage(use_processes=use_processes)
+        try:
+            futures = [stage.submit(parse_rss_feed, content, BENCH_SOURCE, 'fact', cutoff) for content in feeds]
+            return [future.result() for future in futures]
+        finally:
+            stage.shutdown()
+
+    size = sum(len(content) for content in feeds) / 1024
+    repeat = min(args.repeat, 5)
+    _report(f"解析阶段 - {len(feeds)} 个 feed，共 {size:.0f} KB", [
+        ('线程池', _timeit(lambda: run(False), repeat)),
+        ('进程池 (spawn)', _timeit(lambda: run(True), repeat)),
+    ])
+
+
+BENCHMARKS = {
+    'arxiv': bench_arxiv,
+    'summaries': bench_summaries,
+    'bytes': bench_bytes,
+    'feeds': bench_feeds,
+    'structured': bench_structured,
+    'partial': bench_partial,
+    'pool': bench_pool,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='解析性能基准测试')
+    parser.add_argument('benchmark', nargs='*',
+                        help=f"要运行的基准（默认全部）: {', '.join(BENCHMARKS)}")
+    parser.add_argument('--arxiv-page', action='append', help='保存下来的 arXiv 列表页，可多次指定')
+    parser.add_argument('--feed', action='append', help='保存下来的 RSS/Atom 文件，可多次指定')
+    parser.add_argument('--html-page', action='append', help='保存下来的 HTML 列表页，可多次指定')
+    parser.add_argument('--repeat', type=int, default=20, help='每种方案的重复次数')
+    args = parser.parse_args()
+
+    unknown = [name for name in args.benchmark if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"未知的基准: {', '.join(unknown)}")
+
+    for name in args.benchmark or list(BENCHMARKS):
+        BENCHMARKS[name](args)
+
+
+if __name__ == '__main__':
+    main()
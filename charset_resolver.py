@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+字符集识别模块
+按 BOM → Content-Type → XML/HTML 声明 → 上次记住的编码 → UTF-8 校验 → 统计检测 的顺序确定编码。
+统计检测只作用于响应开头的一小段，识别结果按源保存到磁盘，下次运行直接复用。
+"""
+
+import os
+import re
+import codecs
+import threading
+from collections import Counter
+
+from requests.compat import chardet
+
+from http_cache import DEFAULT_CACHE_DIR
+from json_store import load_json, save_json
+
+# 查找 XML/HTML 编码声明时只看开头这么多字节
+DECLARATION_PREFIX_BYTES = 4096
+
+# 校验编码与统计检测时只看开头这么多字节
+DETECT_PREFIX_BYTES = 32 * 1024
+
+_BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+_CONTENT_TYPE_CHARSET = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+_XML_DECLARATION = re.compile(rb'^\s*<\?xml[^>]*?encoding\s*=\s*["\']([\w.:-]+)["\']', re.I)
+_META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.I)
+
+
+def normalize_encoding(name):
+    """统一编码名称（GB 系列统一为 gb18030，ascii 按 utf-8 处理），未知编码返回 None"""
+    if not name:
+        return None
+    try:
+        name = codecs.lookup(name.strip().lower()).name
+    except LookupError:
+        return None
+    if name in ('gb2312', 'gbk', 'gb18030', 'hz'):
+        return 'gb18030'
+    if name == 'ascii':
+        return 'utf-8'
+    return name
+
+
+def declared_encoding(content, content_type=None):
+    """
+    不做统计检测，只从 BOM、Content-Type 和文档内声明中取编码
+
+    Returns:
+        tuple: (编码或None, 来源 'bom'/'header'/'document')
+    """
+    for bom, encoding in _BOMS:
+        if content.startswith(bom):
+            return encoding, 'bom'
+
+    match = _CONTENT_TYPE_CHARSET.search(content_type or '')
+    encoding = normalize_encoding(match.group(1)) if match else None
+    if encoding:
+        return encoding, 'header'
+
+    prefix = content[:DECLARATION_PREFIX_BYTES]
+    match = _XML_DECLARATION.match(prefix) or _META_CHARSET.search(prefix)
+    encoding = normalize_encoding(match.group(1).decode('ascii', 'ignore')) if match else None
+    if encoding:
+        return encoding, 'document'
+
+    return None, None
+
+
+def _decodes_cleanly(content, encoding):
+    """用 encoding 严格解码开头一段（末尾被截断的多字节字符不算错误）"""
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)('strict')
+        decoder.decode(content[:DETECT_PREFIX_BYTES], final=len(content) <= DETECT_PREFIX_BYTES)
+        return True
+    except (UnicodeDecodeError, LookupError):
+        return False
+
+
+class CharsetResolver:
+    """按源识别并记住响应编码（线程安全，结果持久化到磁盘）"""
+
+    def __init__(self, cache_dir=None):
+        self.path = os.path.join(cache_dir or DEFAULT_CACHE_DIR, 'charsets.json')
+        self._lock = threading.Lock()
+        self._known = load_json(self.path)
+        self._dirty = False
+        # 每种识别方式的使用次数：bom/header/document/memory/utf-8/detected
+        self.stats = Counter()
+
+    def _remember(self, key, encoding, how):
+        with self._lock:
+            self.stats[how] += 1
+            if key and self._known.get(key) != encoding:
+                self._known[key] = encoding
+                self._dirty = True
+        return encoding
+
+    def resolve(self, key, content, content_type=None):
+        """
+        确定响应内容的编码
+
+        Args:
+            key: 源的标识（通常是源 URL），用于记住识别结果
+            content: 响应体 bytes
+            content_type: Content-Type 响应头
+        """
+        if not content:
+            return 'utf-8'
+
+        encoding, how = declared_encoding(content, content_type)
+        if encoding and _decodes_cleanly(content, encoding):
+            return self._remember(key, encoding, how)
+
+        with self._lock:
+            known = self._known.get(key)
+        if known and _decodes_cleanly(content, known):
+            return self._remember(key, known, 'memory')
+
+        if _decodes_cleanly(content, 'utf-8'):
+            return self._remember(key, 'utf-8', 'utf-8')
+
+        detected = chardet.detect(content[:DETECT_PREFIX_BYTES]).get('encoding')
+        return self._remember(key, normalize_encoding(detected) or encoding or 'utf-8', 'detected')
+
+    def get_stats(self):
+        """返回各识别方式的使用次数"""
+        with self._lock:
+            return dict(self.stats)
+
+    def save(self):
+        """把识别结果写回磁盘（没有变化时跳过）"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = dict(self._known)
+            self._dirty = False
+        try:
+            save_json(self.path, data)
+        except OSError as e:
+            print(f"  ⚠️  保存编码识别结果失败: {e}")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+熔断与重试预算模块
+- 每个新闻源一个熔断器（closed / open / half_open），状态跨运行持久化，
+  已知失效的源在冷却期内直接跳过，冷却结束后放行一次试探请求
+- 全局重试预算，防止大量源同时失败时出现重试风暴
+- 解析 Retry-After 响应头
+"""
+
+import os
+import time
+import threading
+from email.utils import parsedate_to_datetime
+
+from http_cache import DEFAULT_CACHE_DIR
+from json_store import load_json, save_json
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+def parse_retry_after(value):
+    """解析 Retry-After（秒数或 HTTP 日期），返回需要等待的秒数；无法解析时返回 None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+class CircuitBreaker:
+    """按新闻源记录连续失败次数的熔断器（状态保存在磁盘上）"""
+
+    def __init__(self, cache_dir=None, failure_threshold=2,
+                 base_cooldown=12 * 3600, max_cooldown=7 * 86400):
+        """
+        Args:
+            failure_threshold: 连续失败多少次后熔断（404/410 立即熔断）
+            base_cooldown: 第一次熔断的冷却时间（秒），之后每次熔断翻倍
+            max_cooldown: 冷却时间上限（秒）
+        """
+        self.path = os.path.join(cache_dir or DEFAULT_CACHE_DIR, 'circuit_breakers.json')
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self._lock = threading.Lock()
+        self._states = load_json(self.path)
+        self.skipped = []
+        # 本次运行已放行试探请求、结果还没出来的源（不持久化：中断的试探下次运行重新放行）
+        self._probing = set()
+
+    def save(self):
+        """把熔断状态写回磁盘"""
+        with self._lock:
+            data = dict(self._states)
+        try:
+            save_json(self.path, data)
+        except OSError as e:
+            print(f"  ⚠️  保存熔断状态失败: {e}")
+
+    def _state(self, key):
+        return self._states.setdefault(key, {'state': CLOSED, 'failures': 0, 'trips': 0, 'opened_at': 0})
+
+    def allow(self, key, name=None):
+        """是否允许请求该源；冷却结束的熔断源转为 half_open，每次运行只放行一次试探"""
+        with self._lock:
+            state = self._state(key)
+            if state['state'] == CLOSED:
+                return True
+            if state['state'] == OPEN:
+                cooldown = min(self.max_cooldown, self.base_cooldown * 2 ** max(0, state['trips'] - 1))
+                if time.time() - state['opened_at'] < cooldown:
+                    self.skipped.append(name or key)
+                    return False
+                state['state'] = HALF_OPEN
+            # half_open：试探请求已经放行过，结果出来前不再放行
+            if key in self._probing:
+                self.skipped.append(name or key)
+                return False
+            self._probing.add(key)
+            return True
+
+    def record_success(self, key):
+        with self._lock:
+            self._probing.discard(key)
+            state = self._state(key)
+            state.update({'state': CLOSED, 'failures': 0, 'trips': 0, 'opened_at': 0})
+
+    def record_failure(self, key, permanent=False):
+        """
+        记录一次失败（所有重试都失败之后调用）
+
+        只记录源本身的失败（服务器错误、连接或传输失败）；因时间预算或 Retry-After
+        过长而放弃的请求不应调用。
+
+        Args:
+            permanent: 404/410 等明确失效的响应，立即熔断
+        """
+        with self._lock:
+            self._probing.discard(key)
+            state = self._state(key)
+            state['failures'] += 1
+            if permanent or state['state'] == HALF_OPEN or state['failures'] >= self.failure_threshold:
+                state['state'] = OPEN
+                state['trips'] += 1
+                state['opened_at'] = time.time()
+
+    def get_open_sources(self):
+        """返回本次运行因熔断被跳过的源"""
+        with self._lock:
+            return list(self.skipped)
+
+
+class RetryBudget:
+    """整次运行共享的重试次数预算（线程安全）"""
+
+    def __init__(self, max_retries=10):
+        self.max_retries = max_retries
+        self.used = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def try_consume(self):
+        """消耗一次重试机会；预算用完时返回 False"""
+        with self._lock:
+            if self.used >= self.max_retries:
+                self.denied += 1
+                return False
+            self.used += 1
+            return True
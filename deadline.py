@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+运行时间预算模块
+为整次运行设置截止时间，各阶段据此收紧超时、跳过来不及完成的工作，
+并记录因预算不足而被放弃的内容，供报告汇总。
+"""
+
+import re
+import time
+import threading
+
+
+def parse_budget(value):
+    """
+    解析时间预算参数
+
+    支持 '120'、'120s'、'2m'、'1m30s' 等写法，返回秒数（float）。
+    """
+    if value is None or value == '':
+        return None
+    text = str(value).strip().lower()
+    if re.fullmatch(r'\d+(\.\d+)?', text):
+        return float(text)
+    match = re.fullmatch(r'(?:(\d+(?:\.\d+)?)m)?(?:(\d+(?:\.\d+)?)s)?', text)
+    if not match or not any(match.groups()):
+        raise ValueError(f"无法解析时间预算: {value}（示例: 120s、2m、1m30s）")
+    minutes, seconds = match.groups()
+    return float(minutes or 0) * 60 + float(seconds or 0)
+
+
+class DeadlineExceeded(BaseException):
+    """
+    时间预算已用完，当前工作被放弃
+
+    与 asyncio.CancelledError 一样继承 BaseException，不会被各抓取方法里的
+    except Exception 当作普通错误吞掉，而是一直传到负责记录放弃的地方。
+    """
+
+
+class Deadline:
+    """运行截止时间（budget 为 None 时不限时）"""
+
+    def __init__(self, budget_seconds=None, _expires_at=None, _parent=None):
+        self.budget_seconds = budget_seconds
+        if _expires_at is not None:
+            self.expires_at = _expires_at
+        elif budget_seconds is not None:
+            self.expires_at = time.monotonic() + budget_seconds
+        else:
+            self.expires_at = None
+        # 子阶段与整体共享同一份放弃记录
+        if _parent is not None:
+            self.dropped = _parent.dropped
+            self._lock = _parent._lock
+        else:
+            self.dropped = []
+            self._lock = threading.Lock()
+
+    @property
+    def limited(self):
+        return self.expires_at is not None
+
+    def remaining(self):
+        """剩余秒数；不限时返回 None"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def can_afford(self, seconds):
+        """剩余时间是否还够做一件预计耗时 seconds 秒的事"""
+        remaining = self.remaining()
+        return remaining is None or remaining > seconds
+
+    def cap_timeout(self, timeout):
+        """把单次操作的超时收紧到剩余时间以内（至少保留 0.1 秒）"""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        return max(0.1, min(timeout, remaining))
+
+    def stage(self, fraction):
+        """
+        为某个阶段划出子预算：截止时间为当前剩余时间的 fraction 比例，
+        不会晚于整体截止时间，放弃记录与整体共享
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return Deadline(_parent=self)
+        return Deadline(
+            budget_seconds=remaining * fraction,
+            _expires_at=time.monotonic() + remaining * fraction,
+            _parent=self,
+        )
+
+    def drop(self, stage, item, reason='超出时间预算'):
+        """记录一项因时间预算被放弃的工作"""
+        with self._lock:
+            self.dropped.append({'stage': stage, 'item': item, 'reason': reason})
+
+    def summary(self):
+        """按阶段汇总被放弃的工作：{阶段: [条目, ...]}"""
+        grouped = {}
+        with self._lock:
+            for record in self.dropped:
+                grouped.setdefault(record['stage'], []).append(record['item'])
+        return grouped
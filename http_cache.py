@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+HTTP 磁盘缓存模块
+按 RFC 9111 判断缓存新鲜度，过期后用 ETag/Last-Modified 发起条件请求重新验证。
+缓存内容是解析、规范化之后的文章列表，命中或 304 时下载和解析都可以跳过。
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import Counter
+from email.utils import parsedate_to_datetime
+
+from json_store import save_json
+
+# 默认缓存目录（可通过环境变量 NEWS_CACHE_DIR 修改）
+DEFAULT_CACHE_DIR = os.getenv('NEWS_CACHE_DIR', '.news_cache')
+
+# 没有显式过期信息时，启发式新鲜度的上限（秒）
+HEURISTIC_MAX_LIFETIME = 3600
+
+# 超过该天数未使用（读取或写入）的缓存条目会在清理时删除
+MAX_ENTRY_AGE_DAYS = 7
+
+
+def _parse_http_date(value):
+    """解析 HTTP 日期头，返回时间戳；无法解析时返回 None"""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def _parse_cache_control(value):
+    """解析 Cache-Control 头为 {指令: 值} 字典（指令名小写）"""
+    directives = {}
+    for part in (value or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, arg = part.partition('=')
+        directives[name.strip().lower()] = arg.strip().strip('"') or None
+    return directives
+
+
+def _parse_seconds(value):
+    """解析 delta-seconds，非法值返回 None"""
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class HTTPCache:
+    """基于磁盘的 HTTP 缓存（私有缓存语义，按 URL + 变体存储文章列表）"""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = os.path.join(cache_dir or DEFAULT_CACHE_DIR, 'http')
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # 每个源的命中统计：hit（新鲜命中）/ revalidated（304）/ miss（重新下载）
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def _path(self, url, variant):
+        key = hashlib.sha256(f"{variant}|{url}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def record(self, source_name, event):
+        """记录一次缓存事件"""
+        with self._lock:
+            self.stats.setdefault(source_name, Counter())[event] += 1
+
+    def get_stats(self):
+        """返回每个源的缓存统计"""
+        with self._lock:
+            return {name: dict(counter) for name, counter in self.stats.items()}
+
+    def lookup(self, url, variant='default'):
+        """读取缓存条目，不存在或损坏时返回 None（读取时刷新文件修改时间，作为最近使用时间）"""
+        path = self._path(url, variant)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('url') != url or entry.get('variant') != variant:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def current_age(self, entry, now=None):
+        """RFC 9111 4.2.3：当前年龄 = 修正后的初始年龄 + 驻留时间"""
+        now = now or time.time()
+        return entry.get('initial_age', 0) + max(0, now - entry.get('response_time', now))
+
+    def is_fresh(self, entry, now=None):
+        """条目是否仍然新鲜（可以不经验证直接使用）"""
+        if entry.get('no_cache'):
+            return False
+        return self.current_age(entry, now) < entry.get('freshness_lifetime', 0)
+
+    def conditional_headers(self, entry):
+        """为过期条目生成条件请求头"""
+        headers = {}
+        if not entry:
+            return headers
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def _apply_headers(self, entry, response_headers, response_time):
+        """根据响应头计算验证器、年龄和新鲜度寿命，返回是否允许存储"""
+        cache_control = _parse_cache_control(response_headers.get('Cache-Control'))
+        if 'no-store' in cache_control:
+            return False
+        if response_headers.get('Vary', '').strip() == '*':
+            return False
+
+        date_value = _parse_http_date(response_headers.get('Date')) or response_time
+        age_value = _parse_seconds(response_headers.get('Age')) or 0
+        apparent_age = max(0, response_time - date_value)
+
+        if response_headers.get('ETag'):
+            entry['etag'] = response_headers['ETag']
+        if response_headers.get('Last-Modified'):
+            entry['last_modified'] = response_headers['Last-Modified']
+
+        # 私有缓存忽略 s-maxage；max-age 优先于 Expires
+        max_age = _parse_seconds(cache_control.get('max-age'))
+        expires = _parse_http_date(response_headers.get('Expires'))
+        if max_age is not None:
+            lifetime = max_age
+        elif response_headers.get('Expires'):
+            # 无法解析的 Expires 视为已过期
+            lifetime = max(0, expires - date_value) if expires else 0
+        else:
+            # 启发式新鲜度：Last-Modified 距今时长的 10%
+            last_modified = _parse_http_date(entry.get('last_modified'))
+            lifetime = 0
+            if last_modified:
+                lifetime = min(HEURISTIC_MAX_LIFETIME, max(0, (date_value - last_modified) * 0.1))
+
+        pragma_no_cache = not cache_control and 'no-cache' in response_headers.get('Pragma', '').lower()
+        entry['no_cache'] = 'no-cache' in cache_control or pragma_no_cache
+        entry['freshness_lifetime'] = lifetime
+        entry['initial_age'] = max(apparent_age, age_value)
+        entry['response_time'] = response_time
+        return True
+
+    def store(self, url, variant, response_headers, articles, extra=None):
+        """
+        保存一次 200 响应对应的文章列表
+
+        Args:
+            extra: 可选的附加字段（与文章一起保存，命中时从条目中读取）
+        """
+        entry = {'url': url, 'variant': variant}
+        if not self._apply_headers(entry, response_headers, time.time()):
+            self.delete(url, variant)
+            return None
+        entry.update(extra or {})
+        entry['articles'] = articles
+        self._write(url, variant, entry)
+        return entry
+
+    def update(self, entry):
+        """保存修改过内容的条目（验证器和新鲜度不变）"""
+        self._write(entry['url'], entry['variant'], entry)
+
+    def refresh(self, entry, response_headers):
+        """收到 304 后用新响应头更新条目（RFC 9111 4.3.4）"""
+        if not self._apply_headers(entry, response_headers, time.time()):
+            self.delete(entry['url'], entry['variant'])
+            return entry
+        self._write(entry['url'], entry['variant'], entry)
+        return entry
+
+    def delete(self, url, variant):
+        try:
+            os.remove(self._path(url, variant))
+        except OSError:
+            pass
+
+    def _write(self, url, variant, entry):
+        try:
+            save_json(self._path(url, variant), entry, indent=None)
+        except OSError as e:
+            print(f"  ⚠️  写入HTTP缓存失败: {e}")
+
+    def prune(self, max_age_days=MAX_ENTRY_AGE_DAYS):
+        """删除长时间未使用的缓存条目（包括 URL 已不再请求的孤立条目）"""
+        cutoff = time.time() - max_age_days * 86400
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
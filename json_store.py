@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+JSON 状态文件读写
+选择器 profile、熔断状态、编码识别结果等跨运行保存的小文件共用：
+读取失败按空状态处理，写入先写临时文件再原子替换，中途失败不会留下半个文件。
+"""
+
+import os
+import json
+import tempfile
+
+
+def load_json(path):
+    """读取 JSON 文件；文件不存在或内容损坏时返回空字典"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_json(path, data, indent=2):
+    """
+    原子地写入 JSON 文件（先写同目录下的临时文件，再替换目标文件）
+
+    Raises:
+        OSError: 写入失败（临时文件已删除，目标文件保持原样）
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory or '.', exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or None, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
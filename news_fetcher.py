@@ -5,17 +5,30 @@
 """
 
 import os
-import re
 import json
 import requests
-import hashlib
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
 import time
 from bs4 import BeautifulSoup
-import feedparser
-from urllib.parse import urljoin, urlparse
-from collections import Counter
+from collections import Counter, namedtuple
 import random
+import threading
+from urllib.parse import urlencode
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from article_pipeline import ArticlePipeline, Translate, apply_translation
+from charset_resolver import CharsetResolver
+from circuit_breaker import CircuitBreaker, RetryBudget, parse_retry_after
+from deadline import Deadline, DeadlineExceeded
+from http_cache import HTTPCache
+from rate_limiter import DomainRateLimiter, extract_domain
+from selector_profiles import SelectorProfileStore
+from single_flight import SingleFlight
+from news_parsers import (
+    ParseStage, StreamingFeedParser, is_ai_related, parse_arxiv_api,
+    parse_arxiv_listing, parse_rss_feed, parse_html_listing, parse_hackernews,
+)
 
 # 尝试导入 fake_useragent（可选）
 try:
@@ -37,26 +50,229 @@ except ImportError:
     aiohttp = None
 
 
+# 合并请求时保存的响应：只保留状态码、响应头和响应体，不持有 Response 对象和连接
+FetchedResponse = namedtuple('FetchedResponse', ['status_code', 'headers', 'content'])
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """带连接复用统计的连接池适配器"""
+    
+    def __init__(self, *args, **kwargs):
+        # 被淘汰/关闭的连接池的统计需要先记下来，否则会随连接池一起丢失
+        self._retired_stats = Counter()
+        super().__init__(*args, **kwargs)
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        pools = self.poolmanager.pools
+        dispose = pools.dispose_func
+        
+        def _retire(pool):
+            self._record_pool(pool, self._retired_stats)
+            if dispose:
+                dispose(pool)
+        
+        pools.dispose_func = _retire
+    
+    @staticmethod
+    def _record_pool(pool, stats):
+        stats['new'] += pool.num_connections
+        stats['requests'] += pool.num_requests
+    
+    def connection_stats(self):
+        """汇总新建连接数与复用连接数"""
+        stats = Counter(self._retired_stats)
+        pools = self.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                self._record_pool(pool, stats)
+        stats['reused'] = max(0, stats['requests'] - stats['new'])
+        return stats
+
+
 class NewsFetcher:
     """新闻抓取器 - 负责从各种来源抓取新闻"""
     
-    def __init__(self, baidu_translate_func=None):
+    def __init__(self, baidu_translate_func=None, cache_dir=None, translator=None):
         """
         初始化新闻抓取器
         
         Args:
             baidu_translate_func: 可选的百度翻译函数，用于翻译英文内容
+            cache_dir: 可选的持久化缓存目录（默认 .news_cache）
+            translator: 可选的批量翻译器（如 translation.BaiduTranslator），提供时优先于逐篇翻译函数
         """
         self.forty_eight_hours_ago = datetime.now() - timedelta(hours=48)
         self.baidu_translate = baidu_translate_func or self._default_translate
+        self.translator = translator
+        # 为 False 时抓取阶段不翻译，由调用方只翻译最终展示的文章
+        self.translate_on_fetch = True
+        self._translation_futures = []
+        self._translation_lock = threading.Lock()
         
-        # 请求频率控制
-        self.domain_delays = {}
+        # 请求频率控制（按域名的令牌桶，不同域名互不阻塞）
         self.min_delay_between_requests = 2
-        self.max_concurrent_requests = 3
+        self.max_concurrent_requests = 3  # 同一域名的最大并发请求数
+        self.max_fetch_workers = 6  # 同步模式并行抓取的线程数
+        self._abandoned_executors = []  # 超出时间预算时未等待完成的抓取线程池，close() 时等待它们退出
+        self._domain_slots = {}
+        self._domain_slots_lock = threading.Lock()
+        self.domain_rate_limits = {}  # 按域名覆盖速率：{'arxiv.org': {'rate': 0.2, 'burst': 1}}
+        self.rate_limiter = DomainRateLimiter(
+            min_interval=self.min_delay_between_requests,
+            domain_limits=self.domain_rate_limits,
+        )
+        
+        # 连接池：整个抓取器共用一个长连接会话（keep-alive，TLS 握手每个主机只做一次）
+        self.pool_connections = 20  # 缓存的主机连接池数量
+        self.session = self._create_session()
+        
+        # 同一次运行中相同的请求只发一次（同一 URL 被配置为多个源时共享下载结果，
+        # 包括先后抓取的情况；只保留响应体和响应头，见 FetchedResponse）
+        self.inflight_requests = SingleFlight(keep_results=True)
         
         # 摘要缓存
         self.abstract_cache = {}
+        
+        # arXiv API：用 id_list 一次请求批量获取论文元数据（可通过 ARXIV_API_URL 指向本地替身服务）
+        self.arxiv_api_url = os.getenv('ARXIV_API_URL', 'https://export.arxiv.org/api/query')
+        self.arxiv_batch_size = 50
+        
+        # HTTP 磁盘缓存（跨运行保存验证器和规范化后的文章）
+        self.http_cache = HTTPCache(cache_dir)
+        
+        # 响应编码识别（按源记住识别结果，避免每次对全文做统计检测）
+        self.charsets = CharsetResolver(cache_dir)
+        
+        # HTML 源学习到的选择器（跨运行保存）
+        self.selector_profiles = SelectorProfileStore(cache_dir)
+        
+        # 解析阶段（线程池；响应都很小，进程池的启动开销得不偿失）
+        self.parse_stage = ParseStage()
+        
+        # 运行时间预算（默认不限时，由调用方替换为带预算的 Deadline）
+        self.deadline = Deadline()
+        
+        # 熔断器（跨运行持久化）与整次运行共享的重试预算
+        self.circuit_breaker = CircuitBreaker(cache_dir)
+        self.retry_budget = RetryBudget(max_retries=10)
+        self.max_retry_after = 60  # 服务器要求等待超过该秒数时直接放弃
+        
+        # 流式下载 RSS：收集到足够文章后立即断开，不下载剩余内容
+        self.stream_feeds = True
+        self.stream_chunk_size = 16 * 1024
+        self.stream_stats = {}
+        self._stream_lock = threading.Lock()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+    
+    def _create_session(self):
+        """创建带连接池的共享会话（每个主机最多保持 max_concurrent_requests 条连接）"""
+        session = requests.Session()
+        self.http_adapter = PooledHTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.max_concurrent_requests,
+        )
+        session.mount('https://', self.http_adapter)
+        session.mount('http://', self.http_adapter)
+        return session
+    
+    def close(self):
+        """关闭共享会话，释放所有连接（先等待被放弃的抓取线程退出，它们仍在使用会话和解析阶段）"""
+        self._join_abandoned_fetches()
+        self.session.close()
+        self.parse_stage.shutdown()
+        self.http_cache.prune()
+        self.circuit_breaker.save()
+        self.selector_profiles.save()
+        self.charsets.save()
+    
+    def get_connection_stats(self):
+        """返回连接统计：新建连接数、复用连接数、请求总数"""
+        stats = self.http_adapter.connection_stats()
+        return {
+            'new': stats['new'],
+            'reused': stats['reused'],
+            'requests': stats['requests'],
+        }
+    
+    def get_coalesce_stats(self):
+        """返回请求合并统计：实际发出的请求数和共享结果的请求数"""
+        return self.inflight_requests.get_stats()
+    
+    def get_retry_stats(self):
+        """返回重试预算使用情况与本次因熔断跳过的源"""
+        return {
+            'used': self.retry_budget.used,
+            'denied': self.retry_budget.denied,
+            'limit': self.retry_budget.max_retries,
+            'skipped': self.circuit_breaker.get_open_sources(),
+        }
+    
+    def get_stream_stats(self):
+        """返回每个源的流式下载统计：已下载字节、总字节、节省字节、是否提前结束"""
+        with self._stream_lock:
+            return {name: dict(stats) for name, stats in self.stream_stats.items()}
+    
+    def _record_stream(self, source, bytes_read, content_length, stopped_early):
+        """记录一次流式下载（总大小或已下载字节未知时节省量记为 None）"""
+        try:
+            total = int(content_length)
+        except (TypeError, ValueError):
+            total = None
+        saved = max(0, total - bytes_read) if total is not None and bytes_read is not None else None
+        with self._stream_lock:
+            self.stream_stats[source['name']] = {
+                'read': bytes_read, 'total': total, 'saved': saved, 'early': stopped_early,
+            }
+    
+    def get_charset_stats(self):
+        """返回编码识别方式的统计（bom/header/document/memory/utf-8/detected）"""
+        return self.charsets.get_stats()
+    
+    def get_cache_stats(self):
+        """返回每个源的HTTP缓存统计（hit/revalidated/miss）"""
+        return self.http_cache.get_stats()
+    
+    def _cache_lookup(self, source, url, variant):
+        """
+        查询HTTP缓存
+        
+        Returns:
+            tuple: (缓存条目或None, 新鲜命中时的文章列表或None)
+        """
+        entry = self.http_cache.lookup(url, variant)
+        if entry and self.http_cache.is_fresh(entry):
+            return entry, self._serve_from_cache(source, entry, 'hit')
+        return entry, None
+    
+    def _serve_from_cache(self, source, entry, event):
+        """从缓存条目返回仍在48小时窗口内的文章"""
+        self.http_cache.record(source['name'], event)
+        cutoff = self.forty_eight_hours_ago.strftime('%Y-%m-%d %H:%M')
+        articles = [a for a in entry.get('articles', []) if a.get('time', '') >= cutoff]
+        label = '缓存命中' if event == 'hit' else '内容未变更 (304)'
+        print(f"  ✓ {source['name']} {label} ({len(articles)}篇)")
+        # 保存时尚未完成翻译的文章重新提交（翻译记忆命中时立即补上）
+        if self.translator is not None:
+            self._translate_articles([a for a in articles if 'title_translated' not in a])
+        return articles
+    
+    def _cache_revalidated(self, source, entry, response_headers):
+        """处理 304 响应：刷新缓存条目并返回缓存的文章"""
+        entry = self.http_cache.refresh(entry, response_headers)
+        return self._serve_from_cache(source, entry, 'revalidated')
+    
+    def _cache_store(self, source, url, variant, response_headers, articles, extra=None):
+        """保存新下载并解析的文章（翻译在后台进行，保存的是当前的快照）"""
+        self.http_cache.record(source['name'], 'miss')
+        self.http_cache.store(url, variant, response_headers, [dict(article) for article in articles], extra)
     
     def _default_translate(self, title, summary):
         """默认翻译函数（不翻译）"""
@@ -100,466 +316,393 @@ class NewsFetcher:
     
     def _extract_domain(self, url):
         """从URL提取域名用于频率控制"""
-        try:
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower()
-            if domain.startswith('www.'):
-                domain = domain[4:]
-            return domain
-        except:
-            return 'unknown'
+        return extract_domain(url)
     
     def _wait_if_needed(self, url):
-        """根据频率控制策略等待适当时间"""
-        domain = self._extract_domain(url)
-        current_time = time.time()
-        
-        if domain in self.domain_delays:
-            elapsed = current_time - self.domain_delays[domain]
-            if elapsed < self.min_delay_between_requests:
-                wait_time = self.min_delay_between_requests - elapsed
-                print(f"  ⏳ 频率控制: 等待 {wait_time:.1f} 秒后再请求 {domain}")
-                time.sleep(wait_time)
-        
-        self.domain_delays[domain] = time.time()
+        """根据频率控制策略等待适当时间（只阻塞当前线程；等待会超出时间预算时抛出 DeadlineExceeded）"""
+        self.rate_limiter.acquire(url, self.deadline)
+    
+    async def _wait_if_needed_async(self, url):
+        """根据频率控制策略等待适当时间（只挂起当前协程；等待会超出时间预算时抛出 DeadlineExceeded）"""
+        await self.rate_limiter.acquire_async(url, self.deadline)
+    
+    def get_rate_limit_stats(self):
+        """返回每个域名的频率控制等待统计"""
+        return self.rate_limiter.get_stats()
+    
+    def _parse(self, func, *args):
+        """在解析阶段执行解析函数，超出时间预算时抛出 DeadlineExceeded"""
+        return self.parse_stage.run(func, *args, deadline=self.deadline)
     
     def _is_ai_related(self, title, summary=''):
         """检查内容是否与AI相关"""
-        content = f"{title} {summary}".lower()
-        ai_keywords = [
-            'ai', 'artificial intelligence', 'machine learning', 
-            'deep learning', 'neural network', 'llm', 'gpt', 'transformer',
-            '人工智能', '机器学习', '深度学习', '大模型', '生成式AI', 
-            '计算机视觉', '图像生成', '训练', 'AIGC', 'Diffusion模型', 
-            'MoE模型', 'RLHF'
-        ]
-        return any(keyword in content for keyword in ai_keywords)
+        return is_ai_related(title, summary)
     
-    def fetch_arxiv(self, source):
-        """抓取Arxiv AI论文（带重试机制）"""
-        max_retries = 3
-        base_delay = 3
-        articles = []
+    def _translate_articles(self, articles):
+        """
+        流水线的补充阶段：为解析阶段产出的英文文章补充翻译字段
+
+        有批量翻译器时只提交翻译、不等待：每篇文章挂上一个 Future，翻译完成时写入翻译字段，
+        抓取线程立即继续处理下一个源。需要译文时先调用 wait_for_translations。
+        """
+        if not self.translate_on_fetch:
+            return articles
+        if self.translator is None:
+            return list(ArticlePipeline([Translate(self.baidu_translate)]).run(articles))
+        english = [article for article in articles if article.get('lang') == 'en']
+        if not english:
+            return articles
+        futures = self.translator.submit_many([(a['title'], a.get('summary', '')) for a in english])
+        applied = [self._attach_translation(article, future) for article, future in zip(english, futures)]
+        with self._translation_lock:
+            self._translation_futures.extend(applied)
+        return articles
+    
+    @staticmethod
+    def _attach_translation(article, future):
+        """翻译完成时写入文章；返回的 Future 在译文写入之后才完成"""
+        applied = Future()
+        
+        def _apply(done):
+            try:
+                apply_translation(article, done.result())
+            finally:
+                applied.set_result(article)
+        
+        future.add_done_callback(_apply)
+        return applied
+    
+    def _take_translation_futures(self):
+        with self._translation_lock:
+            futures, self._translation_futures = self._translation_futures, []
+        return [future for future in futures if not future.done()]
+    
+    def wait_for_translations(self, timeout=None):
+        """
+        等待已提交的翻译全部写回文章
+        
+        Returns:
+            int: 超时后仍未完成的翻译数（这些文章在报告中显示原文）
+        """
+        pending = self._take_translation_futures()
+        if not pending:
+            return 0
+        print(f"⏳ 等待 {len(pending)} 篇文章的翻译完成...")
+        _, not_done = wait(pending, timeout=timeout)
+        return len(not_done)
+    
+    def _html_request_headers(self, url):
+        """HTML页面抓取使用的请求头"""
+        headers = self._get_headers(url)
+        headers.update({
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Accept-Encoding': 'gzip, deflate',
+            'Referer': 'https://www.google.com/'
+        })
+        return headers
+    
+    def _hackernews_request(self, source, article_type):
+        """生成 Hacker News API 的请求 URL 与请求头"""
+        timestamp = int(self.forty_eight_hours_ago.timestamp())
+        url = source['url'].format(timestamp)
+        
+        if article_type == 'fact' and 'query=AI' in url:
+            url = url.replace('&query=AI', '')
+        
+        headers = self._get_headers(url)
+        headers.update({
+            'Accept': 'application/json, text/plain, */*',
+            'Accept-Language': 'en-US,en;q=0.9',
+        })
+        return url, headers
+    
+    def _backoff_delay(self, base_delay, attempt):
+        """指数退避加随机抖动"""
+        return base_delay * (2 ** attempt) + random.uniform(0, 1)
+    
+    def _classify_response(self, source, status, response_headers, cache_entry):
+        """
+        判断一次响应该如何处理
+        
+        Returns:
+            tuple: (动作, 服务器要求的等待秒数或None)
+                   动作为 'ok'（可用）、'gone'（源已失效）、'retry'（可重试）、'give_up'（放弃）
+        """
+        if status == 200 or (status == 304 and cache_entry):
+            return 'ok', None
+        if status in (404, 410):
+            print(f"  ⚠️  {source['name']} 页面不存在 ({status})")
+            return 'gone', None
+        if status in (429, 503):
+            retry_after = parse_retry_after(response_headers.get('Retry-After'))
+            if retry_after is not None and retry_after > self.max_retry_after:
+                print(f"  ⚠️  {source['name']} HTTP {status}，要求 {retry_after:.0f} 秒后重试，放弃本次抓取")
+                return 'give_up', None
+            print(f"  ⚠️  {source['name']} 请求过于频繁 (HTTP {status})")
+            return 'retry', retry_after
+        if status == 403:
+            print(f"  ⚠️  {source['name']} 访问被拒绝 (403)")
+        else:
+            print(f"  ⚠️  {source['name']} HTTP {status}")
+        return 'retry', None
+    
+    def _next_retry_delay(self, source, attempt, max_retries, base_delay, retry_after=None):
+        """
+        计算下一次重试前的等待秒数；不再重试时返回 None
+        
+        剩余时间预算不够等待后重试时抛出 DeadlineExceeded（放弃由抓取该源的调用方记录）
+        """
+        if attempt >= max_retries - 1:
+            return None
+        delay = retry_after if retry_after is not None else self._backoff_delay(base_delay, attempt)
+        if not self.deadline.can_afford(delay):
+            print(f"  ⏱️  {source['name']} 剩余时间不足，放弃重试")
+            raise DeadlineExceeded(f"{source['name']} 剩余时间不足以重试")
+        if not self.retry_budget.try_consume():
+            print(f"  ⚠️  {source['name']} 全局重试预算已用完，不再重试")
+            return None
+        print(f"     等待 {delay:.1f} 秒后重试第 {attempt + 2} 次...")
+        return delay
+    
+    def _check_shortened_timeout(self, source, request_timeout, timeout):
+        """超时是被时间预算收紧后才发生的：不算源失败，抛出 DeadlineExceeded"""
+        if request_timeout < timeout:
+            print(f"  ⏱️  {source['name']} 请求未在剩余时间内完成")
+            raise DeadlineExceeded(f"{source['name']} 请求未在剩余时间内完成")
+    
+    def _request_key(self, url, cache_entry):
+        """请求合并的键：URL 加条件请求头（缓存验证器不同的请求不能共享 304）"""
+        return url, tuple(sorted(self.http_cache.conditional_headers(cache_entry).items()))
+    
+    def _request(self, source, url, headers, timeout, max_retries=3, base_delay=2, cache_entry=None, stream=False):
+        """
+        发起带重试的 GET 请求（熔断、全局重试预算、Retry-After 统一在这里处理）
+        
+        非流式请求按 URL 合并：相同的请求正在进行或本次运行中已经完成时，共享它的响应。
+        
+        Args:
+            stream: 为 True 时不预先读取响应体，由调用方读取并关闭响应（流式响应只能读一次，不合并）
+        
+        Returns:
+            200 响应，或有缓存条目时的 304 响应（非流式请求为 FetchedResponse，流式请求为
+            requests.Response）；失败返回 None
+        """
+        if stream:
+            return self._request_with_retries(source, url, headers, timeout, max_retries, base_delay, cache_entry, stream)
+        return self.inflight_requests.do(
+            self._request_key(url, cache_entry), self._request_fetched,
+            source, url, headers, timeout, max_retries, base_delay, cache_entry
+        )
+    
+    def _request_fetched(self, source, url, headers, timeout, max_retries, base_delay, cache_entry):
+        """读取完整响应体，只保留合并共享需要的部分"""
+        response = self._request_with_retries(source, url, headers, timeout, max_retries, base_delay, cache_entry)
+        if response is None:
+            return None
+        return FetchedResponse(response.status_code, response.headers, response.content)
+    
+    def _request_with_retries(self, source, url, headers, timeout, max_retries, base_delay, cache_entry, stream=False):
+        if not self.circuit_breaker.allow(source['url'], source['name']):
+            print(f"  ⛔ {source['name']} 近期持续失败，熔断中，跳过")
+            return None
+        
+        request_headers = dict(headers)
+        request_headers.update(self.http_cache.conditional_headers(cache_entry))
         
         for attempt in range(max_retries):
+            retry_after = None
+            request_timeout = self.deadline.cap_timeout(timeout)
             try:
-                response = requests.get(
-                    source['url'], 
-                    headers=self._get_headers(source['url']), 
-                    timeout=20
-                )
-                
-                if response.status_code != 200:
-                    print(f"  ⚠️  {source['name']} HTTP {response.status_code}")
-                    if attempt < max_retries - 1:
-                        delay = base_delay * (attempt + 1)
-                        print(f"     等待 {delay} 秒后重试第 {attempt + 2} 次...")
-                        time.sleep(delay)
-                        continue
-                    return articles
-                
-                response.encoding = 'utf-8'
-                
-                try:
-                    soup = BeautifulSoup(response.text, 'lxml')
-                except:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                
-                dt_list = soup.find_all('dt')
-                dd_list = soup.find_all('dd')
-                
-                if not dt_list:
-                    print(f"  ⚠️  {source['name']} 未找到 <dt> 元素")
-                    return articles
-                
-                for dt, dd in zip(dt_list[:10], dd_list[:10]):
-                    paper_id = None
-                    link_elem = dt.find('a')
-                    if link_elem and 'href' in link_elem:
-                        href = link_elem['href']
-                        if '/abs/' in href:
-                            paper_id = href.split('/abs/')[-1].strip('/')
-                        elif '/html/' in href:
-                            paper_id = href.split('/html/')[-1].split('/')[0]
-                    
-                    if not paper_id:
-                        continue
-                    
-                    title_elem = dd.find('div', class_='list-title')
-                    authors_elem = dd.find('div', class_='list-authors')
-                    abstract_elem = dd.find('p', class_='abstract') or dd.find('p')
-                    
-                    if title_elem:
-                        title = title_elem.get_text().replace('Title:', '').strip()
-                        authors = authors_elem.get_text().replace('Authors:', '').strip() if authors_elem else ''
-                        abstract = abstract_elem.get_text().strip() if abstract_elem else ''
-                        
-                        article = {
-                            'id': f"arxiv_{paper_id}",
-                            'title': f"[论文] {title[:120]}",
-                            'link': f'https://arxiv.org/abs/{paper_id}',
-                            'source': source['name'],
-                            'summary': abstract[:250] + '...' if len(abstract) > 250 else abstract,
-                            'authors': authors,
-                            'category': 'research',
-                            'importance': 9,
-                            'time': datetime.now().strftime('%Y-%m-%d %H:%M'),
-                            'type': 'ai',
-                            'lang': 'en'
-                        }
-                        translated = self.baidu_translate(article['title'], article['summary'])
-                        article['title_translated'] = translated['title']
-                        article['summary_translated'] = translated['summary']
-                        articles.append(article)
-                
-                print(f"  ✓ {source['name']} 抓取完成 ({len(articles)}篇)")
-                return articles
-                
+                self._wait_if_needed(url)
+                response = self.session.get(url, headers=request_headers, stream=stream, timeout=request_timeout)
+                action, retry_after = self._classify_response(source, response.status_code, response.headers, cache_entry)
+                if action == 'ok':
+                    self.circuit_breaker.record_success(source['url'])
+                    return response
+                response.close()
+                if action == 'gone':
+                    self.circuit_breaker.record_failure(source['url'], permanent=True)
+                    return None
+                if action == 'give_up':
+                    # 服务器正常响应，只是要求等待过久，不计入熔断
+                    return None
             except requests.exceptions.Timeout:
+                self._check_shortened_timeout(source, request_timeout, timeout)
                 print(f"  ⚠️  {source['name']} 请求超时")
-                if attempt < max_retries - 1:
-                    delay = base_delay * (attempt + 1)
-                    time.sleep(delay)
             except requests.exceptions.ConnectionError as e:
                 print(f"  ⚠️  {source['name']} 连接错误: {e}")
-                if attempt < max_retries - 1:
-                    delay = base_delay * (attempt + 1)
-                    time.sleep(delay)
-            except Exception as e:
-                print(f"  ⚠️  {source['name']} 抓取失败: {e}")
+            except requests.exceptions.RequestException as e:
+                print(f"  ⚠️  {source['name']} 请求失败: {e}")
+            
+            delay = self._next_retry_delay(source, attempt, max_retries, base_delay, retry_after)
+            if delay is None:
+                break
+            time.sleep(delay)
+        
+        self.circuit_breaker.record_failure(source['url'])
+        return None
+    
+    def fetch_arxiv(self, source):
+        """抓取Arxiv AI论文（带重试机制）"""
+        articles = []
+        
+        cache_entry, cached = self._cache_lookup(source, source['url'], 'ai')
+        if cached is None:
+            response = self._request(source, source['url'], self._get_headers(source['url']), 20,
+                                     max_retries=3, base_delay=3, cache_entry=cache_entry)
+            if response is None:
                 return articles
+            if response.status_code == 304:
+                cached = self._cache_revalidated(source, cache_entry, response.headers)
+        if cached is not None:
+            missing = self._restore_arxiv_metadata(cache_entry, cached)
+            if missing and self.prefetch_arxiv_metadata(missing):
+                self._update_arxiv_cache(cache_entry)
+            return cached
         
+        try:
+            parsed = self._parse(parse_arxiv_listing, response.content, source)
+            if parsed is None:
+                print(f"  ⚠️  {source['name']} 未找到 <dt> 元素")
+                return articles
+            self.prefetch_arxiv_metadata(parsed)
+            articles = self._translate_articles(parsed)
+        except Exception as e:
+            print(f"  ⚠️  {source['name']} 抓取失败: {e}")
+            return articles
+        
+        self._cache_store(source, source['url'], 'ai', response.headers, articles,
+                          {'abstracts': self._arxiv_abstracts(articles)})
+        print(f"  ✓ {source['name']} 抓取完成 ({len(articles)}篇)")
         return articles
     
     def fetch_rss(self, source, article_type='ai'):
         """通用RSS抓取方法（同步版本）"""
-        max_retries = 3
-        base_delay = 2
         articles = []
         
-        self._wait_if_needed(source['url'])
+        cache_entry, cached = self._cache_lookup(source, source['url'], article_type)
+        if cached is not None:
+            return cached
         
-        for attempt in range(max_retries):
-            try:
-                session = requests.Session()
-                response = session.get(
-                    source['url'], 
-                    headers=self._get_headers(source['url']), 
-                    timeout=25
+        response = self._request(source, source['url'], self._get_headers(source['url']), 25,
+                                 max_retries=3, base_delay=2, cache_entry=cache_entry,
+                                 stream=self.stream_feeds)
+        if response is None:
+            return articles
+        if response.status_code == 304:
+            response.close()
+            return self._cache_revalidated(source, cache_entry, response.headers)
+        
+        try:
+            if self.stream_feeds:
+                parsed, content = self._stream_feed(source, response, article_type)
+            else:
+                parsed, content = None, response.content
+            
+            # 流式解析失败（如编码声明缺失、XML 不规范）时用 feedparser 完整解析
+            if parsed is None:
+                parsed = self._parse(
+                    parse_rss_feed, content, source, article_type,
+                    self.forty_eight_hours_ago,
+                    self.charsets.resolve(source['url'], content, response.headers.get('Content-Type'))
                 )
-                
-                if response.status_code == 404:
-                    print(f"  ⚠️  {source['name']} 页面不存在 (404)")
-                    return articles
-                elif response.status_code == 403:
-                    print(f"  ⚠️  {source['name']} 访问被拒绝 (403)")
-                    if attempt < max_retries - 1:
-                        delay = base_delay * (2 ** attempt) + random.uniform(0, 3)
-                        time.sleep(delay)
-                        continue
-                    return articles
-                elif response.status_code != 200:
-                    print(f"  ⚠️  {source['name']} HTTP {response.status_code}")
-                    if attempt < max_retries - 1:
-                        delay = base_delay * (attempt + 1) + random.uniform(0, 1)
-                        time.sleep(delay)
-                        continue
-                    return articles
-                
-                # 设置正确的编码
-                if response.apparent_encoding:
-                    apparent = response.apparent_encoding.lower()
-                    if 'gb' in apparent or 'gbk' in apparent or 'gb2312' in apparent:
-                        response.encoding = 'gbk'
-                    else:
-                        response.encoding = 'utf-8'
-                elif 'zh' in source.get('lang', ''):
-                    response.encoding = 'utf-8'
-                
-                feed = feedparser.parse(response.text)
-                
-                if not feed.entries:
-                    print(f"  ⚠️  {source['name']} 返回空内容")
-                    return articles
-                
-                seen_links = set()
-                
-                for entry in feed.entries[:20]:
-                    if len(articles) >= 5:
-                        break
-                    
-                    pub_time = None
-                    if hasattr(entry, 'published_parsed'):
-                        pub_time = datetime(*entry.published_parsed[:6])
-                    elif hasattr(entry, 'updated_parsed'):
-                        pub_time = datetime(*entry.updated_parsed[:6])
-                    
-                    if not pub_time:
-                        pub_time = datetime.now()
-                    
-                    if pub_time < self.forty_eight_hours_ago:
-                        continue
-                    
-                    title = entry.get('title', '').strip()
-                    summary = entry.get('summary', '').strip()
-                    link = entry.get('link', '').strip()
-                    
-                    if not title or not link:
-                        continue
-                    
-                    link_hash = hashlib.md5(link.encode()).hexdigest()
-                    if link_hash in seen_links:
-                        continue
-                    seen_links.add(link_hash)
-                    
-                    if summary:
-                        soup = BeautifulSoup(summary, 'html.parser')
-                        summary = soup.get_text()[:250]
-                    
-                    article = {
-                        'id': link_hash[:8],
-                        'title': title[:150],
-                        'link': link,
-                        'source': source['name'],
-                        'summary': summary[:250] + '...' if len(summary) > 250 else summary,
-                        'category': source.get('category', 'general'),
-                        'lang': source.get('lang', 'en'),
-                        'importance': 6,
-                        'time': pub_time.strftime('%Y-%m-%d %H:%M'),
-                        'type': article_type
-                    }
-                    
-                    if article['lang'] == 'en':
-                        translated = self.baidu_translate(title, summary)
-                        article['title_translated'] = translated['title']
-                        article['summary_translated'] = translated['summary']
-                    
-                    if article_type == 'ai':
-                        if self._is_ai_related(title, summary):
-                            article['importance'] = 8
-                            articles.append(article)
-                    else:
-                        articles.append(article)
-                
-                print(f"  ✓ {source['name']} 抓取完成 ({len(articles)}篇)")
+            if parsed is None:
+                print(f"  ⚠️  {source['name']} 返回空内容")
                 return articles
-                
-            except requests.exceptions.Timeout:
-                print(f"  ⚠️  {source['name']} 请求超时")
-                if attempt < max_retries - 1:
-                    time.sleep(base_delay * (attempt + 1))
-            except Exception as e:
-                print(f"  ⚠️  {source['name']} 抓取失败: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(base_delay)
+            articles = self._translate_articles(parsed)
+        except Exception as e:
+            print(f"  ⚠️  {source['name']} 抓取失败: {e}")
+            return articles
         
+        self._cache_store(source, source['url'], article_type, response.headers, articles)
+        print(f"  ✓ {source['name']} 抓取完成 ({len(articles)}篇)")
         return articles
     
+    def _stream_feed(self, source, response, article_type):
+        """
+        边下载边解析 RSS，收集到足够的文章后立即断开连接
+        
+        Returns:
+            tuple: (文章列表, 已下载的内容)；流式解析失败时文章列表为 None，内容为完整响应体
+        """
+        parser = StreamingFeedParser(source, article_type, self.forty_eight_hours_ago)
+        try:
+            for chunk in response.iter_content(chunk_size=self.stream_chunk_size):
+                if parser.feed(chunk):
+                    break
+                if self.deadline.expired():
+                    raise DeadlineExceeded(f"{source['name']} 下载未在时间预算内完成")
+            # 按线路上的（压缩后）字节数统计
+            wire_bytes = response.raw.tell()
+        finally:
+            response.close()
+        self._record_stream(source, wire_bytes, response.headers.get('Content-Length'), parser.stopped_early)
+        return parser.finish(), parser.content
+    
     def fetch_html(self, source, article_type='fact'):
         """HTML页面解析方法"""
-        max_retries = 2
         articles = []
         
-        for attempt in range(max_retries):
-            try:
-                self._wait_if_needed(source['url'])
-                
-                headers = self._get_headers(source['url'])
-                headers.update({
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept-Encoding': 'gzip, deflate',
-                    'Referer': 'https://www.google.com/'
-                })
-                
-                response = requests.get(source['url'], headers=headers, timeout=25)
-                
-                if response.status_code != 200:
-                    print(f"  ⚠️  {source['name']} HTTP {response.status_code}")
-                    if attempt < max_retries - 1:
-                        time.sleep(3)
-                        continue
-                    return articles
-                
-                response.encoding = response.apparent_encoding or 'utf-8'
-                
-                try:
-                    soup = BeautifulSoup(response.text, 'lxml')
-                except:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                
-                seen_links = set()
-                
-                selectors_to_try = [
-                    'article', 'div.post-block', 'div.post-card',
-                    'div.tease-card', 'div.article-card', 'div.entry-content',
-                    'div.content-card', 'section.article',
-                ]
-                
-                article_items = []
-                for selector in selectors_to_try:
-                    article_items = soup.select(selector)
-                    if article_items:
-                        break
-                
-                if not article_items:
-                    article_items = soup.find_all(['h2', 'h3'])
-                
-                for item in article_items[:15]:
-                    if len(articles) >= 5:
-                        break
-                    
-                    title_elem = None
-                    link_elem = None
-                    
-                    if item.name == 'article':
-                        title_elem = item.find('h2') or item.find('h3') or item.find('h1')
-                        link_elem = item.find('a')
-                    elif item.name in ['h2', 'h3']:
-                        title_elem = item
-                        link_elem = item.find('a')
-                    else:
-                        title_elem = item.find('h2') or item.find('h3') or item.find('h1')
-                        link_elem = item.find('a')
-                    
-                    if not title_elem or not link_elem:
-                        continue
-                    
-                    title = title_elem.get_text().strip()
-                    link = link_elem.get('href', '')
-                    
-                    if link and not link.startswith('http'):
-                        link = urljoin(source['url'], link)
-                    
-                    if not title or not link:
-                        continue
-                    
-                    link_hash = hashlib.md5(link.encode()).hexdigest()
-                    if link_hash in seen_links:
-                        continue
-                    seen_links.add(link_hash)
-                    
-                    if article_type == 'ai' and not self._is_ai_related(title):
-                        continue
-                    
-                    summary = ''
-                    excerpt_elem = item.find(class_=re.compile(r'excerpt|summary|description'))
-                    if excerpt_elem:
-                        summary = excerpt_elem.get_text().strip()
-                    elif item.name == 'article':
-                        p_elem = item.find('p')
-                        if p_elem:
-                            summary = p_elem.get_text().strip()
-                    
-                    article = {
-                        'id': link_hash[:8],
-                        'title': title[:150],
-                        'link': link,
-                        'source': source['name'],
-                        'summary': summary[:250] + '...' if len(summary) > 250 else summary,
-                        'category': source.get('category', 'general'),
-                        'lang': source.get('lang', 'en'),
-                        'importance': 6,
-                        'time': datetime.now().strftime('%Y-%m-%d %H:%M'),
-                        'type': article_type
-                    }
-                    
-                    if article['lang'] == 'en':
-                        translated = self.baidu_translate(title, summary)
-                        article['title_translated'] = translated['title']
-                        article['summary_translated'] = translated['summary']
-                    
-                    articles.append(article)
-                
-                print(f"  ✓ {source['name']} HTML解析完成 ({len(articles)}篇)")
-                return articles
-                
-            except requests.exceptions.Timeout:
-                print(f"  ⚠️  {source['name']} 请求超时")
-                if attempt < max_retries - 1:
-                    time.sleep(3)
-            except Exception as e:
-                print(f"  ❌ {source['name']} HTML解析出错: {e}")
-                return articles
+        cache_entry, cached = self._cache_lookup(source, source['url'], article_type)
+        if cached is not None:
+            return cached
+        
+        response = self._request(source, source['url'], self._html_request_headers(source['url']), 25,
+                                 max_retries=2, base_delay=3, cache_entry=cache_entry)
+        if response is None:
+            return articles
+        if response.status_code == 304:
+            return self._cache_revalidated(source, cache_entry, response.headers)
         
+        try:
+            encoding = self.charsets.resolve(source['url'], response.content, response.headers.get('Content-Type'))
+            articles, profile = self._parse(
+                parse_html_listing, response.content, source, article_type, encoding,
+                self.selector_profiles.get(source['url']), self.forty_eight_hours_ago
+            )
+            self._remember_selectors(source, profile)
+            articles = self._translate_articles(articles)
+        except Exception as e:
+            print(f"  ❌ {source['name']} HTML解析出错: {e}")
+            return []
+        
+        self._cache_store(source, source['url'], article_type, response.headers, articles)
+        print(f"  ✓ {source['name']} HTML解析完成 ({len(articles)}篇)")
         return articles
     
+    def _remember_selectors(self, source, profile):
+        """保存 HTML 源本次使用的选择器，首次学习或重新学习时提示"""
+        if self.selector_profiles.update(source['url'], profile):
+            print(f"  🧭 {source['name']} 学习到条目选择器: {profile['item']}")
+    
     def fetch_hackernews(self, source, article_type='ai'):
         """Hacker News抓取方法"""
-        max_retries = 3
-        retry_delay = 2
         articles = []
         
-        for attempt in range(max_retries):
-            try:
-                timestamp = int(self.forty_eight_hours_ago.timestamp())
-                url = source['url'].format(timestamp)
-                
-                if article_type == 'fact' and 'query=AI' in url:
-                    url = url.replace('&query=AI', '')
-                
-                headers = self._get_headers(url)
-                headers.update({
-                    'Accept': 'application/json, text/plain, */*',
-                    'Accept-Language': 'en-US,en;q=0.9',
-                })
-                
-                response = requests.get(url, headers=headers, timeout=20)
-                
-                if response.status_code != 200:
-                    print(f"  ⚠️  {source['name']} HTTP {response.status_code}")
-                    if attempt < max_retries - 1:
-                        time.sleep(retry_delay)
-                        continue
-                    return articles
-                
-                hits = response.json().get('hits', [])
-                seen_links = set()
-                
-                for hit in hits[:10]:
-                    link = hit.get('url', f"https://news.ycombinator.com/item?id={hit.get('objectID')}")
-                    link_hash = hashlib.md5(link.encode()).hexdigest()
-                    if link_hash in seen_links:
-                        continue
-                    seen_links.add(link_hash)
-                    
-                    title = hit.get('title', '')
-                    
-                    if article_type == 'ai' and not any(kw in title.lower() for kw in ['ai', 'llm', 'gpt', 'openai', 'anthropic']):
-                        continue
-                    
-                    article = {
-                        'id': f"hn_{hit.get('objectID', '')}",
-                        'title': title,
-                        'link': link,
-                        'source': source['name'],
-                        'points': hit.get('points', 0),
-                        'comments': hit.get('num_comments', 0),
-                        'category': source.get('category', 'tech'),
-                        'importance': min(9, 6 + (hit.get('points', 0) // 20)),
-                        'time': datetime.fromtimestamp(hit.get('created_at_i', 0)).strftime('%Y-%m-%d %H:%M'),
-                        'type': article_type,
-                        'lang': source.get('lang', 'en')
-                    }
-                    
-                    if article['lang'] == 'en':
-                        translated = self.baidu_translate(title, '')
-                        article['title_translated'] = translated['title']
-                    
-                    articles.append(article)
-                
-                print(f"  ✓ {source['name']} 抓取完成 ({len(articles)}篇)")
-                return articles
-                
-            except requests.exceptions.Timeout:
-                print(f"  ⚠️  {source['name']} 请求超时")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-            except Exception as e:
-                print(f"  ⚠️  {source['name']} 抓取出错: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
+        url, headers = self._hackernews_request(source, article_type)
+        
+        # 请求 URL 带每次运行都不同的时间戳，缓存按源配置的 URL 保存
+        cache_entry, cached = self._cache_lookup(source, source['url'], article_type)
+        if cached is not None:
+            return cached
+        
+        response = self._request(source, url, headers, 20,
+                                 max_retries=3, base_delay=2, cache_entry=cache_entry)
+        if response is None:
+            return articles
+        if response.status_code == 304:
+            return self._cache_revalidated(source, cache_entry, response.headers)
         
+        try:
+            articles = self._parse(parse_hackernews, response.content, source, article_type)
+            articles = self._translate_articles(articles)
+        except Exception as e:
+            print(f"  ⚠️  {source['name']} 抓取出错: {e}")
+            return []
+        
+        self._cache_store(source, source['url'], article_type, response.headers, articles)
+        print(f"  ✓ {source['name']} 抓取完成 ({len(articles)}篇)")
         return articles
     
     def fetch_arxiv_abstract(self, url):
@@ -567,12 +710,16 @@ class NewsFetcher:
         if url in self.abstract_cache:
             return self.abstract_cache[url]
         
+        if self.deadline.expired():
+            self.deadline.drop('摘要', url)
+            return ""
+        
         try:
             headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self.session.get(url, headers=headers, timeout=self.deadline.cap_timeout(10))
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.content, 'html.parser')
             abstract_tag = soup.find('blockquote', class_='abstract')
             if abstract_tag:
                 abstract_text = abstract_tag.text.strip()
@@ -586,6 +733,176 @@ class NewsFetcher:
             self.abstract_cache[url] = ""
             return ""
     
+    def _arxiv_batches(self, articles):
+        """找出摘要缓存中还没有的 arXiv 论文，按批次返回 ID 列表"""
+        paper_ids = []
+        for article in articles:
+            if not article.get('id', '').startswith('arxiv_') or article['link'] in self.abstract_cache:
+                continue
+            paper_id = article['id'][len('arxiv_'):]
+            if paper_id not in paper_ids:
+                paper_ids.append(paper_id)
+        size = self.arxiv_batch_size
+        return [paper_ids[i:i + size] for i in range(0, len(paper_ids), size)]
+    
+    def _arxiv_api_request(self, paper_ids):
+        """生成 arXiv API 批量查询的源配置、URL 与请求头"""
+        source = {'name': 'arXiv API', 'url': self.arxiv_api_url}
+        query = urlencode({'id_list': ','.join(paper_ids), 'max_results': len(paper_ids)}, safe=',')
+        headers = self._get_headers(self.arxiv_api_url)
+        headers['Accept'] = 'application/atom+xml, application/xml;q=0.9, */*;q=0.8'
+        return source, f"{self.arxiv_api_url}?{query}", headers
+    
+    def _apply_arxiv_metadata(self, articles, content):
+        """解析 API 响应，补全文章的作者、分类、日期和空摘要，并填充摘要缓存"""
+        try:
+            papers = parse_arxiv_api(content)
+        except Exception as e:
+            print(f"  ⚠️  arXiv API 响应解析失败: {e}")
+            return 0
+        
+        applied = 0
+        for article in articles:
+            paper = papers.get(article.get('id', '')[len('arxiv_'):])
+            if not paper:
+                continue
+            self.abstract_cache[article['link']] = paper['summary']
+            if not article.get('summary'):
+                abstract = paper['summary']
+                article['summary'] = abstract[:250] + '...' if len(abstract) > 250 else abstract
+            if not article.get('authors'):
+                article['authors'] = ', '.join(paper['authors'])
+            article['categories'] = paper['categories']
+            article['published'] = paper['published'][:10]
+            applied += 1
+        return applied
+    
+    def _arxiv_abstracts(self, articles):
+        """这些论文已获取到的完整摘要 {链接: 摘要}，随列表页一起缓存"""
+        return {
+            article['link']: self.abstract_cache[article['link']]
+            for article in articles if self.abstract_cache.get(article['link'])
+        }
+    
+    def _restore_arxiv_metadata(self, entry, articles):
+        """
+        缓存路径：把缓存条目中保存的完整摘要放回摘要缓存（深度分析不必再请求）
+        
+        Returns:
+            list: 还没有 API 元数据的文章（保存时 API 请求失败或超出时间预算）
+        """
+        for link, abstract in entry.get('abstracts', {}).items():
+            self.abstract_cache.setdefault(link, abstract)
+        return [article for article in articles if 'categories' not in article]
+    
+    def _update_arxiv_cache(self, entry):
+        """缓存的文章补全元数据后写回条目，下次命中时不再请求"""
+        entry['abstracts'] = self._arxiv_abstracts(entry['articles'])
+        self.http_cache.update(entry)
+    
+    def prefetch_arxiv_metadata(self, articles):
+        """
+        用 arXiv API 的 id_list 批量获取论文元数据，代替之后逐篇请求论文详情页
+        
+        Returns:
+            int: 获取到元数据的论文数
+        """
+        applied = 0
+        for paper_ids in self._arxiv_batches(articles):
+            if self.deadline.expired():
+                self.deadline.drop('摘要', f"arXiv API ({len(paper_ids)}篇)")
+                break
+            source, url, headers = self._arxiv_api_request(paper_ids)
+            try:
+                response = self._request(source, url, headers, 20, max_retries=2, base_delay=3)
+            except DeadlineExceeded:
+                # 元数据只是补充，放弃后文章仍可使用
+                self.deadline.drop('摘要', f"arXiv API ({len(paper_ids)}篇)")
+                break
+            if response is not None:
+                applied += self._apply_arxiv_metadata(articles, response.content)
+        if applied:
+            print(f"  ✓ arXiv API 批量获取 {applied} 篇论文元数据")
+        return applied
+    
+    def _domain_slot(self, url):
+        """同一域名的并发上限（线程版）"""
+        domain = self._extract_domain(url)
+        with self._domain_slots_lock:
+            if domain not in self._domain_slots:
+                self._domain_slots[domain] = threading.BoundedSemaphore(self.max_concurrent_requests)
+            return self._domain_slots[domain]
+    
+    def _fetch_source_timed(self, source, article_type):
+        """
+        抓取单个源并计时，异常不向外传播
+        
+        Returns:
+            tuple: (source, articles, 耗时秒数)；因时间预算放弃时返回 None（由 fetch_many 统一记录）
+        """
+        start = time.time()
+        if self.deadline.expired():
+            return None
+        slot = self._domain_slot(source['url'])
+        if not slot.acquire(timeout=self.deadline.remaining()):
+            return None
+        try:
+            articles = self.fetch_from_source(source, article_type)
+        except DeadlineExceeded:
+            return None
+        except Exception as e:
+            print(f"  ❌ {source['name']} 抓取失败: {e}")
+            articles = []
+        finally:
+            slot.release()
+        return source, articles, time.time() - start
+    
+    def fetch_many(self, sources, article_type='ai'):
+        """
+        用有界线程池并行抓取多个新闻源（同步模式）
+        
+        Returns:
+            list: [(source, articles, 耗时秒数)]，顺序与 sources 一致
+        """
+        if not sources:
+            return []
+        
+        start = time.time()
+        workers = min(self.max_fetch_workers, len(sources))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='news-fetch')
+        futures = [
+            executor.submit(self._fetch_source_timed, source, article_type)
+            for source in sources
+        ]
+        
+        # 超出时间预算时不再等待未完成的源；被放弃的源只在这里记录一次
+        done, not_done = wait(futures, timeout=self.deadline.remaining())
+        results = []
+        for source, future in zip(sources, futures):
+            result = future.result() if future in done else None
+            if result is None:
+                self.deadline.drop('抓取', source['name'])
+                print(f"  ⏱️  {source['name']} 超出时间预算，已放弃")
+                result = (source, [], time.time() - start)
+            results.append(result)
+        
+        if not_done:
+            # 仍在运行的线程在下一次检查时间预算时（频率控制等待、解析、流式下载）退出，
+            # close() 关闭会话和解析阶段之前等待它们
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._abandoned_executors.append(executor)
+        else:
+            executor.shutdown()
+        return results
+    
+    def _join_abandoned_fetches(self):
+        """等待超出时间预算后被放弃的抓取线程退出"""
+        executors, self._abandoned_executors = self._abandoned_executors, []
+        if executors:
+            print("⏳ 等待超出时间预算的抓取线程退出...")
+        for executor in executors:
+            executor.shutdown(wait=True)
+    
     def fetch_from_source(self, source, article_type='ai'):
         """
         根据源类型自动选择合适的抓取方法
@@ -616,78 +933,396 @@ class NewsFetcher:
 class AsyncNewsFetcher(NewsFetcher):
     """异步新闻抓取器"""
     
-    async def fetch_rss_async(self, session, source, article_type='ai'):
-        """异步RSS抓取"""
+    def __init__(self, baidu_translate_func=None, cache_dir=None, translator=None):
+        super().__init__(baidu_translate_func=baidu_translate_func, cache_dir=cache_dir, translator=translator)
+        # 每个域名的并发信号量（同一域名最多 max_concurrent_requests 个并发请求）
+        self._domain_semaphores = {}
+        # aiohttp 的请求不经过 PooledHTTPAdapter，连接统计由会话的 trace 回调记录
+        self._async_connection_stats = Counter()
+    
+    def create_session(self):
+        """创建异步抓取共用的 aiohttp 会话（每个主机的连接数与并发上限一致）"""
+        self._require_async()
+        
+        # 信号量绑定当前事件循环，新会话重新创建
+        self._domain_semaphores = {}
+        connector = aiohttp.TCPConnector(
+            limit_per_host=self.max_concurrent_requests,
+            ttl_dns_cache=300,
+        )
+        return aiohttp.ClientSession(connector=connector, trace_configs=[self._connection_trace()])
+    
+    def _connection_trace(self):
+        """统计异步会话的请求数、新建连接数和复用连接数"""
+        stats = self._async_connection_stats
+        
+        async def on_request_start(session, context, params):
+            stats['requests'] += 1
+        
+        async def on_connection_create_end(session, context, params):
+            stats['new'] += 1
+        
+        async def on_connection_reuseconn(session, context, params):
+            stats['reused'] += 1
+        
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace
+    
+    def get_connection_stats(self):
+        """连接统计：同步会话（如深度分析时的摘要请求）与异步会话之和"""
+        stats = super().get_connection_stats()
+        for key in ('new', 'reused', 'requests'):
+            stats[key] += self._async_connection_stats[key]
+        return stats
+    
+    def _domain_semaphore(self, url):
+        domain = self._extract_domain(url)
+        if domain not in self._domain_semaphores:
+            self._domain_semaphores[domain] = asyncio.Semaphore(self.max_concurrent_requests)
+        return self._domain_semaphores[domain]
+    
+    def _require_async(self):
         if not ASYNC_AVAILABLE:
             raise RuntimeError("异步功能不可用：请先安装 aiohttp")
+    
+    async def _get_async(self, session, url, headers, timeout, reader=None):
+        """
+        发起异步 GET 请求并读取响应体（读完即释放连接，重试等待时不占用连接）
+        
+        Args:
+            reader: 可选的协程函数 reader(response)，用于流式读取 200 响应体，其返回值作为响应体返回
         
+        Returns:
+            tuple: (状态码, 响应头, 响应体bytes, 响应头声明的字符集)
+        """
+        timeout = aiohttp.ClientTimeout(total=self.deadline.cap_timeout(timeout))
+        async with session.get(url, headers=headers, timeout=timeout) as response:
+            if response.status != 200:
+                body = b''
+            elif reader is not None:
+                body = await reader(response)
+            else:
+                body = await response.read()
+            return response.status, response.headers, body, response.charset
+    
+    async def prefetch_arxiv_metadata_async(self, session, articles):
+        """异步批量获取 arXiv 论文元数据（与同步版本一致）"""
+        applied = 0
+        for paper_ids in self._arxiv_batches(articles):
+            if self.deadline.expired():
+                self.deadline.drop('摘要', f"arXiv API ({len(paper_ids)}篇)")
+                break
+            source, url, headers = self._arxiv_api_request(paper_ids)
+            try:
+                result = await self._request_async(session, source, url, headers, 20, max_retries=2, base_delay=3)
+            except DeadlineExceeded:
+                self.deadline.drop('摘要', f"arXiv API ({len(paper_ids)}篇)")
+                break
+            if result is not None:
+                applied += self._apply_arxiv_metadata(articles, result[2])
+        if applied:
+            print(f"  ✓ arXiv API 批量获取 {applied} 篇论文元数据")
+        return applied
+    
+    async def _translate_articles_async(self, articles):
+        """异步版补充阶段：批量翻译器只挂上 Future；逐篇翻译函数放到线程里执行，不阻塞事件循环"""
+        if self.translate_on_fetch and self.translator is None:
+            return await asyncio.get_running_loop().run_in_executor(None, self._translate_articles, articles)
+        return self._translate_articles(articles)
+    
+    async def wait_for_translations_async(self, timeout=None):
+        """异步版 wait_for_translations：等待期间事件循环仍可处理其他任务"""
+        pending = self._take_translation_futures()
+        if not pending:
+            return 0
+        print(f"⏳ 等待 {len(pending)} 篇文章的翻译完成...")
+        _, not_done = await asyncio.wait([asyncio.wrap_future(future) for future in pending], timeout=timeout)
+        return len(not_done)
+    
+    async def _fetch_with_slot_async(self, session, source, article_type):
+        async with self._domain_semaphore(source['url']):
+            return await self.fetch_from_source_async(session, source, article_type)
+    
+    async def _fetch_source_guarded_async(self, session, source, article_type):
+        """抓取单个源，异常不向外传播"""
+        start = time.time()
+        try:
+            # 整个源（含排队、重试）必须在剩余预算内完成，否则取消
+            articles = await asyncio.wait_for(
+                self._fetch_with_slot_async(session, source, article_type),
+                timeout=self.deadline.remaining(),
+            )
+        except (asyncio.TimeoutError, DeadlineExceeded):
+            self.deadline.drop('抓取', source['name'])
+            print(f"  ⏱️  {source['name']} 超出时间预算，已取消")
+            articles = []
+        except Exception as e:
+            print(f"  ❌ {source['name']} 抓取失败: {e}")
+            articles = []
+        return source, articles, time.time() - start
+    
+    async def fetch_many_async(self, session, sources, article_type='ai'):
+        """
+        并发抓取多个新闻源，按完成顺序逐个产出结果
+        
+        Yields:
+            tuple: (源在 sources 中的下标, source, articles, 耗时秒数)
+        """
+        async def fetch_indexed(index, source):
+            return (index, *await self._fetch_source_guarded_async(session, source, article_type))
+        
+        tasks = [asyncio.create_task(fetch_indexed(index, source)) for index, source in enumerate(sources)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def _request_async(self, session, source, url, headers, timeout, max_retries=3, base_delay=2,
+                             cache_entry=None, reader=None):
+        """
+        异步发起带重试的 GET 请求（熔断、重试预算、Retry-After 处理与同步版本一致）
+        
+        没有 reader 的请求按 URL 合并（返回值与同步版本不同，使用单独的键）。
+        
+        Args:
+            reader: 见 _get_async（流式读取的结果与读取方式有关，不合并）
+        
+        Returns:
+            tuple: (状态码, 响应头, 响应体bytes, 字符集)；失败返回 None
+        """
+        if reader is not None:
+            return await self._request_with_retries_async(session, source, url, headers, timeout,
+                                                          max_retries, base_delay, cache_entry, reader)
+        return await self.inflight_requests.do_async(
+            ('async', self._request_key(url, cache_entry)), self._request_with_retries_async,
+            session, source, url, headers, timeout, max_retries, base_delay, cache_entry
+        )
+    
+    async def _request_with_retries_async(self, session, source, url, headers, timeout, max_retries, base_delay,
+                                          cache_entry, reader=None):
+        if not self.circuit_breaker.allow(source['url'], source['name']):
+            print(f"  ⛔ {source['name']} 近期持续失败，熔断中，跳过")
+            return None
+        
+        request_headers = dict(headers)
+        request_headers.update(self.http_cache.conditional_headers(cache_entry))
+        
+        for attempt in range(max_retries):
+            retry_after = None
+            request_timeout = self.deadline.cap_timeout(timeout)
+            try:
+                await self._wait_if_needed_async(url)
+                result = await self._get_async(session, url, request_headers, request_timeout, reader)
+                action, retry_after = self._classify_response(source, result[0], result[1], cache_entry)
+                if action == 'ok':
+                    self.circuit_breaker.record_success(source['url'])
+                    return result
+                if action == 'gone':
+                    self.circuit_breaker.record_failure(source['url'], permanent=True)
+                    return None
+                if action == 'give_up':
+                    # 服务器正常响应，只是要求等待过久，不计入熔断
+                    return None
+            except asyncio.TimeoutError:
+                self._check_shortened_timeout(source, request_timeout, timeout)
+                print(f"  ⚠️  {source['name']} 请求超时")
+            except aiohttp.ClientConnectionError as e:
+                print(f"  ⚠️  {source['name']} 连接错误: {e}")
+            except aiohttp.ClientError as e:
+                print(f"  ⚠️  {source['name']} 请求失败: {e}")
+            
+            delay = self._next_retry_delay(source, attempt, max_retries, base_delay, retry_after)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+        
+        self.circuit_breaker.record_failure(source['url'])
+        return None
+    
+    async def fetch_arxiv_async(self, session, source):
+        """异步抓取Arxiv AI论文（重试策略与同步版本一致）"""
+        self._require_async()
+        articles = []
+        
+        cache_entry, cached = self._cache_lookup(source, source['url'], 'ai')
+        if cached is None:
+            result = await self._request_async(session, source, source['url'], self._get_headers(source['url']), 20,
+                                               max_retries=3, base_delay=3, cache_entry=cache_entry)
+            if result is None:
+                return articles
+            status, response_headers, body, _ = result
+            if status == 304:
+                cached = self._cache_revalidated(source, cache_entry, response_headers)
+        if cached is not None:
+            missing = self._restore_arxiv_metadata(cache_entry, cached)
+            if missing and await self.prefetch_arxiv_metadata_async(session, missing):
+                self._update_arxiv_cache(cache_entry)
+            return cached
+        
+        try:
+            parsed = await self.parse_stage.run_async(parse_arxiv_listing, body, source)
+            if parsed is None:
+                print(f"  ⚠️  {source['name']} 未找到 <dt> 元素")
+                return articles
+            await self.prefetch_arxiv_metadata_async(session, parsed)
+            articles = await self._translate_articles_async(parsed)
+        except Exception as e:
+            print(f"  ⚠️  {source['name']} 抓取失败: {e}")
+            return articles
+        
+        self._cache_store(source, source['url'], 'ai', response_headers, articles,
+                          {'abstracts': self._arxiv_abstracts(articles)})
+        print(f"  ✓ {source['name']} 抓取完成 ({len(articles)}篇)")
+        return articles
+    
+    async def fetch_rss_async(self, session, source, article_type='ai'):
+        """异步RSS抓取（重试策略与同步版本一致）"""
+        self._require_async()
         articles = []
+        
+        cache_entry, cached = self._cache_lookup(source, source['url'], article_type)
+        if cached is not None:
+            return cached
+        
+        reader = None
+        if self.stream_feeds:
+            reader = lambda response: self._stream_feed_async(source, response, article_type)
+        
+        result = await self._request_async(session, source, source['url'], self._get_headers(source['url']), 25,
+                                           max_retries=3, base_delay=2, cache_entry=cache_entry, reader=reader)
+        if result is None:
+            return articles
+        status, response_headers, body, _ = result
+        if status == 304:
+            return self._cache_revalidated(source, cache_entry, response_headers)
+        
         try:
-            async with session.get(source['url'], timeout=aiohttp.ClientTimeout(total=15)) as response:
-                if response.status == 200:
-                    text = await response.text()
-                    feed = feedparser.parse(text)
-                    seen_links = set()
-                    
-                    for entry in feed.entries[:20]:
-                        if len(articles) >= 5:
-                            break
-                        
-                        pub_time = None
-                        if hasattr(entry, 'published_parsed'):
-                            pub_time = datetime(*entry.published_parsed[:6])
-                        elif hasattr(entry, 'updated_parsed'):
-                            pub_time = datetime(*entry.updated_parsed[:6])
-                        
-                        if not pub_time:
-                            pub_time = datetime.now()
-                        
-                        if pub_time < self.forty_eight_hours_ago:
-                            continue
-                        
-                        title = entry.get('title', '').strip()
-                        summary = entry.get('summary', '').strip()
-                        link = entry.get('link', '').strip()
-                        
-                        link_hash = hashlib.md5(link.encode()).hexdigest()
-                        if link_hash in seen_links:
-                            continue
-                        seen_links.add(link_hash)
-                        
-                        if summary:
-                            soup = BeautifulSoup(summary, 'html.parser')
-                            summary = soup.get_text()[:250]
-                        
-                        article = {
-                            'id': link_hash[:8],
-                            'title': title[:150],
-                            'link': link,
-                            'source': source['name'],
-                            'summary': summary[:250] + '...' if len(summary) > 250 else summary,
-                            'category': source.get('category', 'general'),
-                            'lang': source.get('lang', 'en'),
-                            'importance': 6,
-                            'time': pub_time.strftime('%Y-%m-%d %H:%M'),
-                            'type': article_type
-                        }
-                        
-                        if article['lang'] == 'en':
-                            translated = self.baidu_translate(title, summary)
-                            article['title_translated'] = translated['title']
-                            article['summary_translated'] = translated['summary']
-                        
-                        if article_type == 'ai':
-                            if self._is_ai_related(title, summary):
-                                article['importance'] = 8
-                                articles.append(article)
-                        else:
-                            articles.append(article)
-                    
-                    print(f"  ✓ {source['name']} 抓取完成 ({len(articles)}篇)")
+            parsed = None
+            if self.stream_feeds:
+                parsed, body = body.finish(), body.content
+            
+            if parsed is None:
+                parsed = await self.parse_stage.run_async(
+                    parse_rss_feed, body, source, article_type, self.forty_eight_hours_ago,
+                    self.charsets.resolve(source['url'], body, response_headers.get('Content-Type'))
+                )
+            if parsed is None:
+                print(f"  ⚠️  {source['name']} 返回空内容")
+                return articles
+            articles = await self._translate_articles_async(parsed)
         except Exception as e:
-            print(f"  ❌ {source['name']} 抓取出错: {e}")
+            print(f"  ⚠️  {source['name']} 抓取失败: {e}")
+            return articles
         
+        self._cache_store(source, source['url'], article_type, response_headers, articles)
+        print(f"  ✓ {source['name']} 抓取完成 ({len(articles)}篇)")
         return articles
+    
+    async def _stream_feed_async(self, source, response, article_type):
+        """边下载边解析 RSS，提前结束时未读完的连接在退出请求上下文时被关闭"""
+        parser = StreamingFeedParser(source, article_type, self.forty_eight_hours_ago)
+        async for chunk in response.content.iter_chunked(self.stream_chunk_size):
+            if parser.feed(chunk):
+                break
+        # 压缩传输时拿不到线路字节数，节省量记为未知
+        wire_bytes = None if response.headers.get('Content-Encoding') else parser.bytes_read
+        self._record_stream(source, wire_bytes, response.headers.get('Content-Length'), parser.stopped_early)
+        return parser
+    
+    async def fetch_html_async(self, session, source, article_type='fact'):
+        """异步HTML页面解析（重试策略与同步版本一致）"""
+        self._require_async()
+        articles = []
+        
+        cache_entry, cached = self._cache_lookup(source, source['url'], article_type)
+        if cached is not None:
+            return cached
+        
+        result = await self._request_async(session, source, source['url'], self._html_request_headers(source['url']), 25,
+                                           max_retries=2, base_delay=3, cache_entry=cache_entry)
+        if result is None:
+            return articles
+        status, response_headers, body, _ = result
+        if status == 304:
+            return self._cache_revalidated(source, cache_entry, response_headers)
+        
+        try:
+            encoding = self.charsets.resolve(source['url'], body, response_headers.get('Content-Type'))
+            articles, profile = await self.parse_stage.run_async(
+                parse_html_listing, body, source, article_type, encoding,
+                self.selector_profiles.get(source['url']), self.forty_eight_hours_ago
+            )
+            self._remember_selectors(source, profile)
+            articles = await self._translate_articles_async(articles)
+        except Exception as e:
+            print(f"  ❌ {source['name']} HTML解析出错: {e}")
+            return []
+        
+        self._cache_store(source, source['url'], article_type, response_headers, articles)
+        print(f"  ✓ {source['name']} HTML解析完成 ({len(articles)}篇)")
+        return articles
+    
+    async def fetch_hackernews_async(self, session, source, article_type='ai'):
+        """异步Hacker News抓取（重试策略与同步版本一致）"""
+        self._require_async()
+        articles = []
+        
+        url, headers = self._hackernews_request(source, article_type)
+        
+        # 请求 URL 带每次运行都不同的时间戳，缓存按源配置的 URL 保存
+        cache_entry, cached = self._cache_lookup(source, source['url'], article_type)
+        if cached is not None:
+            return cached
+        
+        result = await self._request_async(session, source, url, headers, 20,
+                                           max_retries=3, base_delay=2, cache_entry=cache_entry)
+        if result is None:
+            return articles
+        status, response_headers, body, _ = result
+        if status == 304:
+            return self._cache_revalidated(source, cache_entry, response_headers)
+        
+        try:
+            articles = await self.parse_stage.run_async(parse_hackernews, body, source, article_type)
+            articles = await self._translate_articles_async(articles)
+        except Exception as e:
+            print(f"  ⚠️  {source['name']} 抓取出错: {e}")
+            return []
+        
+        self._cache_store(source, source['url'], article_type, response_headers, articles)
+        print(f"  ✓ {source['name']} 抓取完成 ({len(articles)}篇)")
+        return articles
+    
+    async def fetch_from_source_async(self, session, source, article_type='ai'):
+        """
+        根据源类型自动选择合适的异步抓取方法
+        
+        Args:
+            session: aiohttp.ClientSession
+            source: 新闻源配置字典
+            article_type: 'ai' 或 'fact'
+        
+        Returns:
+            list: 抓取到的文章列表
+        """
+        source_type = source.get('type', 'rss')
+        
+        if source_type == 'arxiv':
+            return await self.fetch_arxiv_async(session, source)
+        elif source_type == 'rss':
+            return await self.fetch_rss_async(session, source, article_type)
+        elif source_type == 'html':
+            return await self.fetch_html_async(session, source, article_type)
+        elif source_type == 'hn_api':
+            return await self.fetch_hackernews_async(session, source, article_type)
+        else:
+            print(f"  ⚠️  未知的源类型: {source_type}")
+            return []
 
 
 if __name__ == "__main__":
@@ -0,0 +1,938 @@
+#!/usr/bin/env python3
+"""
+新闻解析模块
+把原始响应内容解析为规范化的文章字典（不做翻译，不访问网络）。
+各解析函数只负责从文档中逐条取出原始条目，过滤与规范化交给 article_pipeline 中的流水线。
+所有解析函数都是模块级纯函数，既可以在线程池中执行，也可以在进程池中执行。
+"""
+
+import re
+import html
+import json
+import asyncio
+import multiprocessing
+from collections import Counter
+from datetime import datetime
+from urllib.parse import urljoin
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from bs4 import BeautifulSoup
+import feedparser
+from feedparser.datetimes import _parse_date
+from feedparser.mixin import _FeedParserMixin
+from lxml import etree
+
+from article_pipeline import (
+    SUMMARY_MAX_CHARS, ArticlePipeline, Dedupe, KeywordFilter, Normalize, TimeWindow,
+    matches_keywords, require_title_and_link,
+)
+from charset_resolver import declared_encoding
+from deadline import DeadlineExceeded
+from structured_data import extract_structured_entries, page_article_entry
+
+
+AI_KEYWORDS = [
+    'ai', 'artificial intelligence', 'machine learning',
+    'deep learning', 'neural network', 'llm', 'gpt', 'transformer',
+    '人工智能', '机器学习', '深度学习', '大模型', '生成式AI',
+    '计算机视觉', '图像生成', '训练', 'AIGC', 'Diffusion模型',
+    'MoE模型', 'RLHF'
+]
+
+HN_AI_KEYWORDS = ['ai', 'llm', 'gpt', 'openai', 'anthropic']
+
+# 每个 RSS 源最多查看的条目数与最多保留的文章数
+RSS_MAX_ENTRIES = 20
+RSS_MAX_ARTICLES = 5
+
+# 流式解析时连续遇到多少条超出时间窗口的条目就停止下载（feed 通常按时间倒序）
+RSS_STALE_LIMIT = 3
+
+HTML_SELECTORS = [
+    'article', 'div.post-block', 'div.post-card',
+    'div.tease-card', 'div.article-card', 'div.entry-content',
+    'div.content-card', 'section.article',
+]
+
+
+def is_ai_related(title, summary=''):
+    """检查内容是否与AI相关"""
+    return matches_keywords(AI_KEYWORDS, title, summary)
+
+
+# 标签、注释、脚本/样式块、文本段（依次尝试）
+_MARKUP = re.compile(
+    r'<!--.*?(?:-->|$)'
+    r'|<(?:script|style)\b.*?(?:</(?:script|style)\s*>|$)'
+    r'|<[!?][^>]*>'
+    r'|</?([a-zA-Z][\w:-]*)(?:[^>"\']|"[^"]*"|\'[^\']*\')*>'
+    r'|[^<]+'
+    r'|<',
+    re.S | re.I,
+)
+_BLOCK_TAGS = frozenset([
+    'address', 'article', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'figcaption', 'figure',
+    'footer', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'ol', 'p', 'pre',
+    'section', 'table', 'td', 'th', 'tr', 'ul',
+])
+
+
+def strip_html(markup, limit=None):
+    """
+    把 HTML 片段转换为纯文本：去掉标签、解码实体、合并空白
+
+    指定 limit 时凑够字数即停止，剩余内容不再扫描和解码。
+    """
+    if not markup:
+        return ''
+    if '<' not in markup and '&' not in markup:
+        text = ' '.join(markup.split())
+        return text[:limit] if limit else text
+
+    parts = []
+    length = 0
+    pending_space = False
+    for match in _MARKUP.finditer(markup):
+        token = match.group(0)
+        if token[0] == '<' and len(token) > 1:
+            # 块级标签两侧的文字之间补一个空格
+            if match.group(1) and match.group(1).lower() in _BLOCK_TAGS:
+                pending_space = True
+            continue
+
+        text = html.unescape(token) if '&' in token else token
+        words = text.split()
+        if not words:
+            pending_space = pending_space or bool(text)
+            continue
+        if parts and (pending_space or text[0].isspace()):
+            parts.append(' ')
+            length += 1
+        chunk = ' '.join(words)
+        parts.append(chunk)
+        length += len(chunk)
+        pending_space = text[-1].isspace()
+        if limit and length >= limit:
+            break
+
+    text = ''.join(parts)
+    return text[:limit] if limit else text
+
+
+def _make_soup(content, encoding=None):
+    """构造 BeautifulSoup；bytes 直接交给解析器按 encoding 解码，不先转换成 str"""
+    from_encoding = encoding if isinstance(content, bytes) else None
+    try:
+        return BeautifulSoup(content, 'lxml', from_encoding=from_encoding)
+    except:
+        return BeautifulSoup(content, 'html.parser', from_encoding=from_encoding)
+
+
+def _arxiv_paper_id(href):
+    """从论文链接中提取 arXiv ID"""
+    if '/abs/' in href:
+        return href.split('/abs/')[-1].strip('/')
+    if '/html/' in href:
+        return href.split('/html/')[-1].split('/')[0]
+    return None
+
+
+def _arxiv_article(paper_id, title, authors, abstract, source):
+    title = title.replace('Title:', '').strip()
+    authors = authors.replace('Authors:', '').strip()
+    abstract = abstract.strip()
+    return {
+        'id': f"arxiv_{paper_id}",
+        'title': f"[论文] {title[:120]}",
+        'link': f'https://arxiv.org/abs/{paper_id}',
+        'source': source['name'],
+        'summary': abstract[:250] + '...' if len(abstract) > 250 else abstract,
+        'authors': authors,
+        'category': 'research',
+        'importance': 9,
+        'time': datetime.now().strftime('%Y-%m-%d %H:%M'),
+        'type': 'ai',
+        'lang': 'en'
+    }
+
+
+def _xpath_class(name):
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+# arXiv 列表页只需要前 10 个 <dt>/<dd>，XPath 预编译后只访问这些节点
+ARXIV_MAX_PAPERS = 10
+_ARXIV_DT = etree.XPath(f'(//dt)[position() <= {ARXIV_MAX_PAPERS}]')
+_ARXIV_DD = etree.XPath(f'(//dd)[position() <= {ARXIV_MAX_PAPERS}]')
+_ARXIV_HREFS = etree.XPath('.//a/@href')
+_ARXIV_TITLE = etree.XPath(f'(.//div[{_xpath_class("list-title")}])[1]')
+_ARXIV_AUTHORS = etree.XPath(f'string((.//div[{_xpath_class("list-authors")}])[1])')
+_ARXIV_ABSTRACT = etree.XPath(f'(.//p[{_xpath_class("abstract")}])[1]')
+_ARXIV_FIRST_P = etree.XPath('(.//p)[1]')
+
+
+def _parse_arxiv_listing_lxml(content, source, encoding):
+    """用 lxml + 预编译 XPath 解析 arXiv 列表页"""
+    if isinstance(content, bytes):
+        root = etree.fromstring(content, etree.HTMLParser(encoding=encoding))
+    else:
+        root = etree.fromstring(content, etree.HTMLParser())
+    if root is None:
+        raise ValueError('空文档')
+
+    dt_list = _ARXIV_DT(root)
+    if not dt_list:
+        return None
+
+    articles = []
+    for dt, dd in zip(dt_list, _ARXIV_DD(root)):
+        paper_id = None
+        for href in _ARXIV_HREFS(dt):
+            paper_id = _arxiv_paper_id(href)
+            if paper_id:
+                break
+        if not paper_id:
+            continue
+
+        title_elems = _ARXIV_TITLE(dd)
+        if not title_elems:
+            continue
+        title = ''.join(title_elems[0].itertext())
+        abstract_elems = _ARXIV_ABSTRACT(dd) or _ARXIV_FIRST_P(dd)
+        abstract = ''.join(abstract_elems[0].itertext()) if abstract_elems else ''
+        articles.append(_arxiv_article(paper_id, title, _ARXIV_AUTHORS(dd), abstract, source))
+
+    return articles
+
+
+def _parse_arxiv_listing_bs(content, source, encoding):
+    """用 BeautifulSoup 解析 arXiv 列表页（lxml 解析失败时的后备方案）"""
+    soup = _make_soup(content, encoding)
+
+    dt_list = soup.find_all('dt')
+    dd_list = soup.find_all('dd')
+
+    if not dt_list:
+        return None
+
+    articles = []
+    for dt, dd in zip(dt_list[:ARXIV_MAX_PAPERS], dd_list[:ARXIV_MAX_PAPERS]):
+        paper_id = None
+        for link_elem in dt.find_all('a', href=True):
+            paper_id = _arxiv_paper_id(link_elem['href'])
+            if paper_id:
+                break
+
+        if not paper_id:
+            continue
+
+        title_elem = dd.find('div', class_='list-title')
+        authors_elem = dd.find('div', class_='list-authors')
+        abstract_elem = dd.find('p', class_='abstract') or dd.find('p')
+
+        if title_elem:
+            authors = authors_elem.get_text() if authors_elem else ''
+            abstract = abstract_elem.get_text() if abstract_elem else ''
+            articles.append(_arxiv_article(paper_id, title_elem.get_text(), authors, abstract, source))
+
+    return articles
+
+
+def parse_arxiv_listing(content, source, encoding='utf-8'):
+    """
+    解析 arXiv 列表页（优先使用 lxml XPath，失败时退回 BeautifulSoup）
+
+    Returns:
+        list: 文章列表；页面中没有论文条目时返回 None
+    """
+    try:
+        articles = _parse_arxiv_listing_lxml(content, source, encoding)
+    except Exception:
+        articles = _parse_arxiv_listing_bs(content, source, encoding)
+    if articles is None:
+        return None
+    # 与其他源一样按链接去重
+    return list(ArticlePipeline([Dedupe()]).run(articles))
+
+
+_ATOM_NS = {'atom': 'http://www.w3.org/2005/Atom', 'arxiv': 'http://arxiv.org/schemas/atom'}
+_ARXIV_VERSION = re.compile(r'v\d+$')
+
+
+def _collapse_whitespace(text):
+    return ' '.join((text or '').split())
+
+
+def parse_arxiv_api(content):
+    """
+    解析 arXiv API（Atom）返回的论文元数据
+
+    Returns:
+        dict: {论文ID（不含版本号）: {'title', 'summary', 'authors', 'categories', 'published', 'updated'}}
+    """
+    root = etree.fromstring(content, etree.XMLParser(resolve_entities=False, no_network=True))
+    papers = {}
+    for entry in root.iterfind('atom:entry', _ATOM_NS):
+        entry_id = entry.findtext('atom:id', '', _ATOM_NS)
+        # 出错时 API 返回 id 为 .../api/errors 的条目
+        if '/abs/' not in entry_id:
+            continue
+        paper_id = _ARXIV_VERSION.sub('', entry_id.split('/abs/')[-1].strip('/'))
+        papers[paper_id] = {
+            'title': _collapse_whitespace(entry.findtext('atom:title', '', _ATOM_NS)),
+            'summary': _collapse_whitespace(entry.findtext('atom:summary', '', _ATOM_NS)),
+            'authors': [
+                _collapse_whitespace(name.text)
+                for name in entry.iterfind('atom:author/atom:name', _ATOM_NS)
+            ],
+            'categories': [
+                category.get('term')
+                for category in entry.iterfind('atom:category', _ATOM_NS)
+                if category.get('term')
+            ],
+            'published': entry.findtext('atom:published', '', _ATOM_NS),
+            'updated': entry.findtext('atom:updated', '', _ATOM_NS),
+        }
+    return papers
+
+
+def _rss_pipeline(source, article_type, cutoff):
+    """
+    RSS 条目的处理流水线：时间窗口 → 去重 → 清洗摘要 → AI 过滤，最多查看 20 条、保留 5 篇
+
+    Returns:
+        tuple: (流水线, 时间窗口阶段)；流式解析根据时间窗口的连续过期数决定是否提前停止
+    """
+    window = TimeWindow(cutoff)
+    pipeline = ArticlePipeline([
+        window,
+        require_title_and_link,
+        Dedupe(),
+        Normalize(source, article_type, clean_summary=_clean_summary),
+        KeywordFilter(article_type, AI_KEYWORDS, importance=8),
+    ], max_entries=RSS_MAX_ENTRIES, max_articles=RSS_MAX_ARTICLES)
+    return pipeline, window
+
+
+def _clean_summary(summary):
+    return strip_html(summary, limit=SUMMARY_MAX_CHARS)
+
+
+def _feed_entry(title, summary, link, published):
+    return {'title': title, 'summary': summary, 'link': link, 'published': published}
+
+
+def parse_rss_feed(content, source, article_type, cutoff, encoding=None):
+    """
+    解析 RSS/Atom 内容
+
+    格式规范的文档走 lxml 快速路径（只提取用到的字段，凑够文章即停止），
+    不规范时退回 feedparser。
+
+    Args:
+        cutoff: 时间窗口起点，早于该时间的条目被丢弃
+        encoding: 已识别的编码；为 None 时根据 XML 声明识别
+
+    Returns:
+        list: 文章列表；feed 中没有条目时返回 None
+    """
+    articles = _parse_rss_lxml(content, source, article_type, cutoff, encoding)
+    if articles is None:
+        articles = _parse_rss_feedparser(content, source, article_type, cutoff, encoding)
+    return articles
+
+
+def _parse_rss_lxml(content, source, article_type, cutoff, encoding=None):
+    """lxml 快速路径：文档不规范或没有条目时返回 None"""
+    # 完整文档不按连续过期条目提前停止，保持与 feedparser 相同的扫描范围
+    parser = StreamingFeedParser(source, article_type, cutoff, encoding, stale_limit=None)
+    parser.feed(content)
+    return parser.finish()
+
+
+def _parse_rss_feedparser(content, source, article_type, cutoff, encoding=None):
+    """feedparser 完整解析（bytes 直接交给 feedparser，编码以 HTTP 字符集的方式告诉它）"""
+    response_headers = None
+    if encoding and isinstance(content, bytes):
+        response_headers = {'content-type': f'application/xml; charset={encoding}'}
+    feed = feedparser.parse(content, response_headers=response_headers)
+
+    if not feed.entries:
+        return None
+
+    pipeline, _ = _rss_pipeline(source, article_type, cutoff)
+    return list(pipeline.run(_feedparser_entries(feed)))
+
+
+def _feedparser_entries(feed):
+    for entry in feed.entries:
+        pub_time = None
+        if hasattr(entry, 'published_parsed'):
+            pub_time = datetime(*entry.published_parsed[:6])
+        elif hasattr(entry, 'updated_parsed'):
+            pub_time = datetime(*entry.updated_parsed[:6])
+
+        title = entry.get('title', '')
+        if entry.get('title_detail', {}).get('type') in _HTML_CONTENT_TYPES:
+            title = strip_html(title)
+        yield _feed_entry(title, entry.get('summary', ''), entry.get('link', ''), pub_time)
+
+
+# 与 feedparser 一致：先取发布时间，没有时再取更新时间
+_FEED_DATE_TAGS = ('pubDate', 'published', 'issued', 'updated', 'date', 'modified')
+
+# feedparser 判定为 HTML 的标题类型（标题中的标签和实体要去掉）
+_HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+
+def _localname(elem):
+    return etree.QName(elem).localname
+
+
+def _feed_title(elem):
+    """
+    标题的纯文本：与 feedparser 的标题再经 strip_html 的结果一致
+
+    Atom 的 type="html" 标题是转义后的 HTML，type="xhtml" 标题是内嵌的元素（取文字即可），
+    默认的 type="text" 原样保留；RSS 的标题由 feedparser 按内容猜测是否为 HTML，这里用同一个判断。
+    """
+    text = ''.join(elem.itertext())
+    if etree.QName(elem).namespace == _ATOM_NS['atom']:
+        content_type = elem.get('type', 'text')
+        if content_type == 'xhtml':
+            return ' '.join(text.split())
+        return strip_html(text) if content_type == 'html' else text
+    return strip_html(text) if _FeedParserMixin.looks_like_html(text) else text
+
+
+def _feed_entry_fields(elem):
+    """从 <item>/<entry> 元素中取出标题、摘要、链接和发布时间"""
+    fields = {}
+    link = ''
+    for child in elem:
+        if not isinstance(child.tag, str):
+            continue
+        name = _localname(child)
+        if name == 'link':
+            # RSS 的 <link> 是文本，Atom 的 <link> 用 href 属性
+            if not link:
+                if child.text and child.text.strip():
+                    link = child.text
+                elif child.get('href') and child.get('rel', 'alternate') == 'alternate':
+                    link = child.get('href')
+        elif name == 'title':
+            if 'title' not in fields:
+                fields['title'] = _feed_title(child)
+        elif name not in fields:
+            fields[name] = ''.join(child.itertext())
+
+    summary = fields.get('description') or fields.get('summary') or fields.get('encoded') or fields.get('content') or ''
+
+    pub_time = None
+    for tag in _FEED_DATE_TAGS:
+        if fields.get(tag):
+            parsed = _parse_date(fields[tag].strip())
+            if parsed:
+                pub_time = datetime(*parsed[:6])
+                break
+
+    return fields.get('title', ''), summary, link, pub_time
+
+
+class StreamingFeedParser:
+    """
+    增量解析 RSS/Atom：边下载边解析，收集到足够文章或条目超出时间窗口后即可停止下载
+
+    XML 解析出错时不再增量解析，只继续缓存数据，
+    由调用方在下载完成后改用 parse_rss_feed 完整解析。
+    """
+
+    def __init__(self, source, article_type, cutoff, encoding=None, stale_limit=RSS_STALE_LIMIT):
+        """
+        Args:
+            encoding: 已识别的编码（覆盖 XML 声明）；为 None 时根据 XML 声明识别
+            stale_limit: 连续多少条超出时间窗口后停止；None 表示不因此停止
+        """
+        self.stale_limit = stale_limit
+        try:
+            self._parser = etree.XMLPullParser(
+                events=('end',), resolve_entities=False, no_network=True, encoding=encoding
+            )
+        except LookupError:
+            self._parser = etree.XMLPullParser(events=('end',), resolve_entities=False, no_network=True)
+        self._pipeline, self._window = _rss_pipeline(source, article_type, cutoff)
+        self.articles = []
+        self._chunks = []
+        self.bytes_read = 0
+        self.failed = False
+        self.stopped_early = False
+
+    @property
+    def done(self):
+        if self.stale_limit is not None and self._window.stale >= self.stale_limit:
+            return True
+        return self._pipeline.full
+
+    def feed(self, chunk):
+        """喂入一块数据，返回 True 表示已经可以停止下载"""
+        self.bytes_read += len(chunk)
+        self._chunks.append(chunk)
+        if self.failed:
+            return False
+        try:
+            self._parser.feed(chunk)
+            for _, elem in self._parser.read_events():
+                if not isinstance(elem.tag, str) or _localname(elem) not in ('item', 'entry'):
+                    continue
+                article = self._pipeline.push(_feed_entry(*_feed_entry_fields(elem)))
+                if article is not None:
+                    self.articles.append(article)
+                # 已处理的条目不再需要，释放内存
+                elem.clear()
+                parent = elem.getparent()
+                while parent is not None and elem.getprevious() is not None:
+                    del parent[0]
+                if self.done:
+                    self.stopped_early = True
+                    return True
+        except (etree.XMLSyntaxError, ValueError, LookupError):
+            self.failed = True
+        return False
+
+    @property
+    def content(self):
+        """目前为止收到的全部原始数据"""
+        return b''.join(self._chunks)
+
+    def finish(self):
+        """
+        结束解析
+
+        Returns:
+            list: 文章列表；解析失败或没有任何条目时返回 None（调用方改用完整解析）
+        """
+        if not self.stopped_early and not self.failed:
+            try:
+                self._parser.close()
+            except etree.XMLSyntaxError:
+                self.failed = True
+        if self.failed or self._pipeline.scanned == 0:
+            return None
+        return self.articles
+
+
+# 每个 HTML 列表页最多查看的条目数与最多保留的文章数
+HTML_MAX_ITEMS = 15
+HTML_MAX_ARTICLES = 5
+
+# 没有命中任何条目选择器时退回到所有二、三级标题
+HTML_HEADING_SELECTOR = 'h2, h3'
+_EXCERPT_CLASS = re.compile(r'excerpt|summary|description')
+_CSS_IDENT = re.compile(r'^[A-Za-z_][\w-]*$')
+
+
+def _html_item_fields(item, profile):
+    """
+    提取单个条目的标题、链接和摘要元素
+
+    优先使用 profile 中学习到的子选择器，未命中时按通用规则查找。
+
+    Returns:
+        tuple: (标题元素, 链接元素, 摘要元素, {'title': 命中的标题子选择器, 'excerpt': 命中的摘要子选择器})
+    """
+    used = {'title': None, 'excerpt': None}
+
+    title_elem = None
+    if item.name in ['h2', 'h3']:
+        title_elem = item
+        used['title'] = 'self'
+    else:
+        learned = profile.get('title')
+        if learned and learned != 'self':
+            title_elem = item.find(learned)
+            used['title'] = learned if title_elem else None
+        if not title_elem:
+            for tag in ('h2', 'h3', 'h1'):
+                title_elem = item.find(tag)
+                if title_elem:
+                    used['title'] = tag
+                    break
+
+    link_elem = item.find(profile.get('link') or 'a')
+
+    excerpt_elem = None
+    learned = profile.get('excerpt')
+    if learned:
+        excerpt_elem = item.select_one(learned)
+    if excerpt_elem is None:
+        excerpt_elem = item.find(class_=_EXCERPT_CLASS)
+        if excerpt_elem is not None:
+            matched = next((c for c in excerpt_elem.get('class', []) if _EXCERPT_CLASS.search(c)), None)
+            # 只记录可以直接写进 CSS 选择器的类名
+            learned = f"{excerpt_elem.name}.{matched}" if matched and _CSS_IDENT.match(matched) else None
+        elif item.name == 'article':
+            excerpt_elem = item.find('p')
+            learned = 'p'
+    if excerpt_elem is not None:
+        used['excerpt'] = learned
+
+    return title_elem, link_elem, excerpt_elem, used
+
+
+def _learned_items(soup, profile):
+    """用学习到的条目选择器做定向选择；选不出带标题和链接的条目时返回 None"""
+    learned = profile.get('item')
+    if not learned:
+        return None
+    items = soup.select(learned)
+    for item in items[:HTML_MAX_ITEMS]:
+        title_elem, link_elem, _, _ = _html_item_fields(item, profile)
+        if title_elem and link_elem:
+            return items
+    return None
+
+
+def _select_html_items(soup, profile):
+    """
+    选出列表条目：先用学习到的条目选择器做一次定向选择，失败时再按 HTML_SELECTORS 依次尝试
+
+    Returns:
+        tuple: (条目列表, 命中的条目选择器, 是否重新学习)
+    """
+    items = _learned_items(soup, profile)
+    if items is not None:
+        return items, profile['item'], False
+
+    for selector in HTML_SELECTORS:
+        items = soup.select(selector)
+        if items:
+            return items, selector, True
+
+    return soup.select(HTML_HEADING_SELECTOR), HTML_HEADING_SELECTOR, True
+
+
+# 局部解析时每次喂给 lxml 的字节数
+PARTIAL_CHUNK_BYTES = 16 * 1024
+_SIMPLE_SELECTOR = re.compile(r'^([a-zA-Z][\w-]*)?(?:\.([\w-]+))?$')
+
+
+def _selector_matcher(selector):
+    """
+    把 'tag' / 'tag.class' / '.class' 及其逗号列表转换为 lxml 元素的判断函数
+
+    Returns:
+        function: elem -> bool；选择器更复杂（后代、属性、伪类等）时返回 None
+    """
+    rules = []
+    for part in selector.split(','):
+        match = _SIMPLE_SELECTOR.match(part.strip())
+        if not match or not any(match.groups()):
+            return None
+        tag, cls = match.groups()
+        rules.append((tag.lower() if tag else None, cls))
+
+    def matches(elem):
+        if not isinstance(elem.tag, str):
+            return False
+        for tag, cls in rules:
+            if tag and elem.tag != tag:
+                continue
+            if cls and cls not in (elem.get('class') or '').split():
+                continue
+            return True
+        return False
+    return matches
+
+
+def _partial_items_markup(content, encoding, selector, limit=HTML_MAX_ITEMS):
+    """
+    用 lxml 增量解析页面，只取出前 limit 个匹配条目选择器的元素，凑够后不再解析剩余部分
+
+    Returns:
+        str: 这些条目拼接成的 HTML 片段；选择器无法增量匹配、页面中没有匹配或解析出错时返回 None
+    """
+    matches = _selector_matcher(selector)
+    if matches is None:
+        return None
+    if isinstance(content, str):
+        content, encoding = content.encode('utf-8'), 'utf-8'
+
+    try:
+        parser = etree.HTMLPullParser(events=('end',), encoding=encoding)
+    except LookupError:
+        parser = etree.HTMLPullParser(events=('end',))
+
+    fragments = []
+
+    def collect():
+        for _, elem in parser.read_events():
+            if matches(elem):
+                fragments.append(etree.tostring(elem, encoding='unicode', method='html', with_tail=False))
+                # 已取出的条目不再需要，释放其子树
+                elem.clear(keep_tail=True)
+                if len(fragments) >= limit:
+                    return True
+        return False
+
+    try:
+        for start in range(0, len(content), PARTIAL_CHUNK_BYTES):
+            parser.feed(content[start:start + PARTIAL_CHUNK_BYTES])
+            if collect():
+                break
+        else:
+            parser.close()
+            collect()
+    except (etree.LxmlError, ValueError, LookupError):
+        return None
+    return ''.join(fragments) or None
+
+
+def _partial_soup(content, encoding, profile):
+    """
+    只为学习到的条目选择器命中的前几个条目构造 soup
+
+    Returns:
+        tuple: (soup, 条目列表)；不适用局部解析或学习到的选择器已失效时返回 (None, None)
+    """
+    markup = _partial_items_markup(content, encoding, profile['item']) if profile.get('item') else None
+    if markup is None:
+        return None, None
+    soup = _make_soup(markup)
+    items = _learned_items(soup, profile)
+    if items is None:
+        soup.decompose()
+        return None, None
+    return soup, items
+
+
+def parse_html_listing(content, source, article_type, encoding=None, profile=None, cutoff=None):
+    """
+    解析HTML列表页（bytes 且未指定编码时由解析器根据 <meta> 识别）
+
+    优先读取 JSON-LD 结构化元数据（不构建 DOM，带真实发布时间），没有时再按选择器在 DOM 中查找条目；
+    DOM 中也没有列表条目、而页面本身是一篇文章（og:type=article）时，用 OpenGraph 元数据作为唯一的条目。
+
+    Args:
+        profile: 该源上次学习到的选择器 {'item', 'title', 'link', 'excerpt'}，没有时做完整的选择器遍历
+        cutoff: 时间窗口起点；结构化数据给出发布时间时，早于该时间的条目被丢弃
+
+    Returns:
+        tuple: (文章列表, 本次使用的选择器 profile；走结构化数据或没有任何有效条目时为 None)
+    """
+    if isinstance(content, bytes) and not encoding:
+        encoding = declared_encoding(content)[0]
+    structured = extract_structured_entries(content, encoding)
+    if structured is not None:
+        return _structured_articles(structured, source, article_type, cutoff), None
+    articles, learned_profile = _parse_html_dom(content, source, article_type, encoding, profile)
+    if learned_profile is None:
+        entry = page_article_entry(content, encoding)
+        if entry is not None:
+            return _structured_articles([entry], source, article_type, cutoff), None
+    return articles, learned_profile
+
+
+def _parse_html_dom(content, source, article_type, encoding=None, profile=None, partial=True):
+    """
+    在 DOM 中按选择器查找列表条目（发布时间一律记为当前时间）
+
+    已有学习到的条目选择器时先做局部解析：只构建前 HTML_MAX_ITEMS 个条目的子树，
+    选择器失效或无法局部匹配时再解析整个页面并重新学习。
+
+    Args:
+        partial: 是否允许局部解析
+    """
+    profile = profile or {}
+    soup, article_items = _partial_soup(content, encoding, profile) if partial else (None, None)
+    if soup is not None:
+        item_selector, relearned = profile['item'], False
+    else:
+        soup = _make_soup(content, encoding)
+        article_items, item_selector, relearned = _select_html_items(soup, profile)
+    if relearned:
+        # 条目选择器变了，子选择器也需要重新学习
+        profile = {}
+
+    title_hits = Counter()
+    excerpt_hits = Counter()
+
+    def entries():
+        for item in article_items[:HTML_MAX_ITEMS]:
+            title_elem, link_elem, excerpt_elem, used = _html_item_fields(item, profile)
+
+            if not title_elem or not link_elem:
+                continue
+
+            title = title_elem.get_text().strip()
+            link = link_elem.get('href', '')
+
+            if link and not link.startswith('http'):
+                link = urljoin(source['url'], link)
+
+            if not title or not link:
+                continue
+
+            title_hits[used['title']] += 1
+            if used['excerpt']:
+                excerpt_hits[used['excerpt']] += 1
+
+            # 摘要延迟到条目通过去重和 AI 过滤之后才提取
+            yield {
+                'title': title,
+                'link': link,
+                'summary': excerpt_elem.get_text if excerpt_elem is not None else '',
+            }
+
+    pipeline = ArticlePipeline([
+        Dedupe(),
+        KeywordFilter(article_type, AI_KEYWORDS, use_summary=False),
+        Normalize(source, article_type),
+    ], max_articles=HTML_MAX_ARTICLES)
+    articles = list(pipeline.run(entries()))
+    # BeautifulSoup 的树带有循环引用，用完立即拆除，不等垃圾回收
+    soup.decompose()
+
+    if not title_hits:
+        return articles, None
+
+    learned_profile = {
+        'item': item_selector,
+        'title': title_hits.most_common(1)[0][0] if title_hits else profile.get('title'),
+        'link': 'a',
+        'excerpt': excerpt_hits.most_common(1)[0][0] if excerpt_hits else profile.get('excerpt'),
+    }
+    return articles, learned_profile
+
+
+def _structured_articles(entries, source, article_type, cutoff):
+    """结构化元数据条目走与 DOM 条目相同的流水线，另外按真实发布时间过滤"""
+    for entry in entries:
+        if entry['link'] and not entry['link'].startswith('http'):
+            entry['link'] = urljoin(source['url'], entry['link'])
+
+    stages = [TimeWindow(cutoff)] if cutoff else []
+    pipeline = ArticlePipeline(stages + [
+        require_title_and_link,
+        Dedupe(),
+        KeywordFilter(article_type, AI_KEYWORDS, use_summary=False),
+        Normalize(source, article_type, clean_summary=_clean_summary),
+    ], max_entries=HTML_MAX_ITEMS, max_articles=HTML_MAX_ARTICLES)
+    return list(pipeline.run(entries))
+
+
+def parse_hackernews(content, source, article_type):
+    """解析 Hacker News API 返回的 JSON（bytes 或 str）"""
+    data = json.loads(content)
+
+    def entries():
+        for hit in data.get('hits', []):
+            yield {
+                'id': f"hn_{hit.get('objectID', '')}",
+                'title': hit.get('title', ''),
+                'link': hit.get('url', f"https://news.ycombinator.com/item?id={hit.get('objectID')}"),
+                'points': hit.get('points', 0),
+                'comments': hit.get('num_comments', 0),
+                'importance': min(9, 6 + (hit.get('points', 0) // 20)),
+                'published': datetime.fromtimestamp(hit.get('created_at_i', 0)),
+            }
+
+    pipeline = ArticlePipeline([
+        Dedupe(),
+        KeywordFilter(article_type, HN_AI_KEYWORDS, use_summary=False),
+        Normalize(source, article_type, default_category='tech'),
+    ], max_entries=10)
+    return list(pipeline.run(entries()))
+
+
+class ParseStage:
+    """
+    解析阶段：把原始响应字节交给执行器解析，返回规范化的文章字典
+
+    默认使用线程池：每个源的响应只有几十 KB，解析只要几毫秒，而 spawn 进程池的每个子进程
+    都要重新导入主脚本（连同 google.generativeai 等依赖），启动开销远大于它分担的解析
+    （python benchmarks.py pool）。use_processes=True（主脚本的 --parse-processes）时使用进程池，
+    无法创建或中途崩溃时自动退回线程池，保证解析始终可用。
+    """
+
+    def __init__(self, max_workers=None, use_processes=False):
+        self.max_workers = max_workers or min(4, multiprocessing.cpu_count())
+        self.use_processes = use_processes
+        self._executor = None
+        self._is_process_pool = False
+        self._closed = False
+
+    def _get_executor(self):
+        if self._closed:
+            # 关闭之后不再重新创建执行器（被放弃的抓取线程晚到的解析请求直接失败）
+            raise RuntimeError("解析阶段已关闭")
+        if self._executor is None:
+            if self.use_processes:
+                try:
+                    # spawn 避免在多线程进程中 fork
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context('spawn'),
+                    )
+                    self._is_process_pool = True
+                    return self._executor
+                except (OSError, ValueError, NotImplementedError, ImportError) as e:
+                    print(f"  ⚠️  解析进程池不可用，改用线程池: {e}")
+            self._fallback_to_threads()
+        return self._executor
+
+    def _fallback_to_threads(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self.use_processes = False
+        self._is_process_pool = False
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='news-parse')
+
+    def submit(self, func, *args):
+        """提交解析任务，返回 concurrent.futures.Future"""
+        try:
+            return self._get_executor().submit(func, *args)
+        except (BrokenProcessPool, RuntimeError, OSError) as e:
+            if not self._is_process_pool or self._closed:
+                raise
+            print(f"  ⚠️  解析进程池异常，改用线程池: {e}")
+            self._fallback_to_threads()
+            return self._executor.submit(func, *args)
+
+    def run(self, func, *args, deadline=None):
+        """
+        同步执行解析任务（阻塞当前线程直到结果返回）
+
+        Args:
+            deadline: 可选的 Deadline；到期前没有解析完时抛出 DeadlineExceeded，不再等待
+        """
+        try:
+            return self._result(self.submit(func, *args), deadline)
+        except BrokenProcessPool as e:
+            print(f"  ⚠️  解析进程池崩溃，改用线程池: {e}")
+            self._fallback_to_threads()
+            return self._result(self._executor.submit(func, *args), deadline)
+
+    @staticmethod
+    def _result(future, deadline):
+        try:
+            return future.result(timeout=deadline.remaining() if deadline is not None else None)
+        except FutureTimeoutError:
+            future.cancel()
+            raise DeadlineExceeded("解析未在时间预算内完成")
+
+    async def run_async(self, func, *args):
+        """在事件循环中等待解析结果（解析本身不占用事件循环）"""
+        try:
+            return await asyncio.wrap_future(self.submit(func, *args))
+        except BrokenProcessPool as e:
+            print(f"  ⚠️  解析进程池崩溃，改用线程池: {e}")
+            self._fallback_to_threads()
+            return await asyncio.wrap_future(self._executor.submit(func, *args))
+
+    def shutdown(self):
+        self._closed = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
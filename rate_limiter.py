@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+请求频率控制模块
+按域名分别维护令牌桶：同一域名的请求按配置的速率放行，不同域名互不阻塞。
+同时支持线程（time.sleep）和协程（asyncio.sleep）两种等待方式。
+"""
+
+import time
+import asyncio
+import threading
+from urllib.parse import urlparse
+
+from deadline import DeadlineExceeded
+
+
+def extract_domain(url):
+    """从URL提取域名（去掉 www. 前缀）"""
+    try:
+        domain = urlparse(url).netloc.lower()
+        if domain.startswith('www.'):
+            domain = domain[4:]
+        return domain
+    except Exception:
+        return 'unknown'
+
+
+class TokenBucket:
+    """令牌桶：每秒补充 rate 个令牌，最多积累 burst 个"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait=None):
+        """
+        预留一个令牌，返回调用方需要等待的秒数
+
+        令牌数允许为负（表示已被预留），等待在锁外进行，
+        因此同一个桶的多个等待者按预留顺序依次放行。
+
+        Args:
+            max_wait: 需要等待的时间不少于该秒数时不预留令牌（不影响后面的调用方），返回 None
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.rate > 0:
+                self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+            else:
+                self.tokens = float(self.burst)
+            self.updated_at = now
+            wait_time = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+            if max_wait is not None and wait_time >= max_wait:
+                return None
+            self.tokens -= 1
+            return wait_time
+
+
+class DomainRateLimiter:
+    """按域名限速的令牌桶集合（线程安全，也可在协程中使用）"""
+
+    def __init__(self, min_interval=2, burst=1, domain_limits=None):
+        """
+        Args:
+            min_interval: 默认同一域名两次请求之间的最小间隔（秒），0 表示不限速
+            burst: 默认允许的突发请求数
+            domain_limits: 按域名覆盖的配置 {'arxiv.org': {'rate': 0.2, 'burst': 1}}
+        """
+        self.default_rate = 1.0 / min_interval if min_interval > 0 else 0
+        self.default_burst = burst
+        # 保留调用方传入的字典（即使为空），之后对它的修改在创建该域名的令牌桶时生效
+        self.domain_limits = domain_limits if domain_limits is not None else {}
+        self._buckets = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, domain):
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket is None:
+                limits = self.domain_limits.get(domain, {})
+                bucket = TokenBucket(
+                    limits.get('rate', self.default_rate),
+                    limits.get('burst', self.default_burst),
+                )
+                self._buckets[domain] = bucket
+            return bucket
+
+    def _reserve(self, url, deadline=None):
+        """预留令牌并返回等待秒数；剩余时间不够等待（或已到期）时不预留，抛出 DeadlineExceeded"""
+        domain = extract_domain(url)
+        wait_time = self._bucket(domain).reserve(deadline.remaining() if deadline is not None else None)
+        if wait_time is None:
+            raise DeadlineExceeded(f"剩余时间不够等待请求 {domain} 的频率限制")
+        with self._lock:
+            stats = self._stats.setdefault(domain, {'requests': 0, 'waits': 0, 'wait_time': 0.0})
+            stats['requests'] += 1
+            if wait_time > 0:
+                stats['waits'] += 1
+                stats['wait_time'] += wait_time
+        if wait_time > 0:
+            print(f"  ⏳ 频率控制: 等待 {wait_time:.1f} 秒后再请求 {domain}")
+        return wait_time
+
+    def acquire(self, url, deadline=None):
+        """
+        同步等待：只阻塞当前线程
+
+        Args:
+            deadline: 可选的 Deadline；剩余时间不够等待（或已到期）时抛出 DeadlineExceeded，不再等待
+        """
+        wait_time = self._reserve(url, deadline)
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    async def acquire_async(self, url, deadline=None):
+        """异步等待：只挂起当前协程，不阻塞事件循环（deadline 同 acquire）"""
+        wait_time = self._reserve(url, deadline)
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+    def get_stats(self):
+        """返回每个域名的请求数、等待次数和累计等待秒数"""
+        with self._lock:
+            return {domain: dict(stats) for domain, stats in self._stats.items()}
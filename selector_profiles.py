@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+HTML 选择器学习模块
+记录每个 HTML 源上次命中的条目选择器和标题/链接/摘要子选择器，
+下次抓取时直接定向选择，选不出有效条目时由解析器重新学习。
+"""
+
+import os
+import time
+import threading
+
+from http_cache import DEFAULT_CACHE_DIR
+from json_store import load_json, save_json
+
+
+class SelectorProfileStore:
+    """按源 URL 保存选择器 profile（持久化到磁盘）"""
+
+    def __init__(self, cache_dir=None):
+        self.path = os.path.join(cache_dir or DEFAULT_CACHE_DIR, 'selector_profiles.json')
+        self._lock = threading.Lock()
+        self._profiles = load_json(self.path)
+        self._dirty = False
+
+    def get(self, key):
+        """返回该源的选择器 profile（只含选择器字段）；没有时返回 None"""
+        with self._lock:
+            stored = self._profiles.get(key)
+            if not stored:
+                return None
+            return {name: stored.get(name) for name in ('item', 'title', 'link', 'excerpt')}
+
+    def update(self, key, profile):
+        """
+        记录本次解析使用的 profile
+
+        Returns:
+            bool: 条目选择器是否发生了变化（首次学习或重新学习）
+        """
+        if not profile:
+            return False
+        with self._lock:
+            stored = self._profiles.get(key, {})
+            changed = stored.get('item') != profile['item']
+            if changed:
+                if stored.get('item'):
+                    stored['relearned'] = stored.get('relearned', 0) + 1
+                stored['learned_at'] = time.strftime('%Y-%m-%d %H:%M')
+            stored.update(profile)
+            stored['uses'] = 1 if changed else stored.get('uses', 0) + 1
+            self._profiles[key] = stored
+            self._dirty = True
+            return changed
+
+    def save(self):
+        """把 profile 写回磁盘（没有变化时跳过）"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = dict(self._profiles)
+            self._dirty = False
+        try:
+            save_json(self.path, data)
+        except OSError as e:
+            print(f"  ⚠️  保存选择器配置失败: {e}")
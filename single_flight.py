@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+请求合并（single-flight）模块
+相同键的调用同时进行时只真正执行一次：并发到达的调用等待第一次调用的结果。
+默认调用完成后立即忘掉这个键，之后到达的调用重新执行；keep_results=True 时保留成功的结果，
+同一次运行中之后到达的相同调用直接共享（调用方负责让结果足够轻量，如只保留响应体而不是响应对象）。
+用于同一 URL 被配置为多个源、同一段文本被多个源提交翻译等情况。
+"""
+
+import asyncio
+import threading
+from collections import Counter
+from concurrent.futures import CancelledError, Future
+
+
+class SingleFlight:
+    """按键合并进行中的调用（线程安全；协程通过 do_async 共享同一份结果）"""
+
+    def __init__(self, keep_results=False):
+        """
+        Args:
+            keep_results: 是否保留成功完成的结果（失败或被取消的调用总是忘掉，之后重新执行）
+        """
+        self.keep_results = keep_results
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.stats = Counter()
+
+    def claim(self, key):
+        """
+        登记对 key 的一次调用
+
+        Returns:
+            tuple: (Future, 是否为首个调用者)。首个调用者负责执行并设置 Future 的结果，
+                   其他调用者等待同一个 Future；Future 完成（或被取消）后 key 即被忘掉，
+                   keep_results=True 时只忘掉失败或被取消的调用
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.stats['shared'] += 1
+                return future, False
+            future = self._calls[key] = Future()
+            self.stats['executed'] += 1
+        future.add_done_callback(lambda done: self._forget(key, done))
+        return future, True
+
+    def _forget(self, key, future):
+        if self.keep_results and not future.cancelled() and future.exception() is None:
+            return
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def do(self, key, func, *args, **kwargs):
+        """执行 func(*args, **kwargs)；相同 key 正在执行时等待并返回同一结果"""
+        while True:
+            future, leader = self.claim(key)
+            if leader:
+                try:
+                    future.set_result(func(*args, **kwargs))
+                except BaseException as e:
+                    future.set_exception(e)
+            try:
+                return future.result()
+            except CancelledError:
+                # 首个调用者（协程）被取消：这次调用作废，重新执行
+                if not future.cancelled():
+                    raise
+
+    async def do_async(self, key, func, *args, **kwargs):
+        """
+        do 的异步版本，func 为协程函数
+
+        取消只属于被取消的调用方：首个调用者被取消时撤销这次调用，等待它的调用方重新执行；
+        等待中的调用方被取消也不影响首个调用者。
+        """
+        while True:
+            future, leader = self.claim(key)
+            if leader:
+                try:
+                    future.set_result(await func(*args, **kwargs))
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+                except BaseException as e:
+                    future.set_exception(e)
+            try:
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+
+    def get_stats(self):
+        """返回实际执行和共享结果的调用次数"""
+        with self._lock:
+            return {'executed': self.stats['executed'], 'shared': self.stats['shared']}
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+结构化元数据提取模块
+直接在原始字节上用正则找出 JSON-LD（application/ld+json）和 OpenGraph/article 元标签，
+取出标题、链接、真实发布时间和描述，不构建 DOM 树。
+页面没有可用的 JSON-LD 列表时返回 None，由调用方退回 DOM 启发式解析；
+OpenGraph 描述的是页面本身，只在 DOM 中也找不到列表条目时才作为唯一的条目。
+"""
+
+import re
+import html
+import json
+from datetime import datetime
+
+from feedparser.datetimes import _parse_date
+
+# JSON-LD 至少给出这么多条带标题和链接的条目才视为列表页的结构化数据，
+# 否则多半只是页面上某一篇推荐文章，仍需 DOM 解析
+STRUCTURED_MIN_ITEMS = 3
+
+ARTICLE_TYPES = frozenset([
+    'Article', 'NewsArticle', 'ReportageNewsArticle', 'AnalysisNewsArticle', 'OpinionNewsArticle',
+    'BackgroundNewsArticle', 'BlogPosting', 'LiveBlogPosting', 'TechArticle', 'Report',
+])
+
+_LD_JSON = re.compile(
+    rb'<script\b[^>]*\btype\s*=\s*["\']?application/ld\+json\b[^>]*>(.*?)</script\s*>', re.I | re.S
+)
+_CDATA_WRAPPER = re.compile(r'^\s*(?:/\*\s*)?<!\[CDATA\[(?:\s*\*/)?|(?:/\*\s*)?\]\]>(?:\s*\*/)?\s*$')
+_HEAD_END = re.compile(rb'</head\s*>|<body\b', re.I)
+_META_TAG = re.compile(rb'<meta\b[^>]*>', re.I)
+_ATTRIBUTE = re.compile(rb'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))')
+
+
+def _text(value):
+    """JSON-LD 字段值转为纯文本（列表取第一个，HTML 实体解码）"""
+    if isinstance(value, list):
+        value = value[0] if value else ''
+    if not isinstance(value, str):
+        return ''
+    return html.unescape(value).strip()
+
+
+def _node_url(value):
+    """url / mainEntityOfPage 可以是字符串，也可以是带 @id 或 url 的对象"""
+    if isinstance(value, dict):
+        value = value.get('url') or value.get('@id')
+    return _text(value)
+
+
+def parse_published(value):
+    """解析 ISO 8601 / RFC 822 时间，与 RSS 路径一致换算为 UTC 的 naive datetime；无法解析时返回 None"""
+    value = _text(value)
+    parsed = _parse_date(value) if value else None
+    return datetime(*parsed[:6]) if parsed else None
+
+
+def _types(node):
+    node_type = node.get('@type', ())
+    return {node_type} if isinstance(node_type, str) else set(t for t in node_type if isinstance(t, str))
+
+
+def _ld_nodes(data):
+    """展开顶层列表与 @graph，按文档顺序产出各个对象"""
+    if isinstance(data, list):
+        for item in data:
+            yield from _ld_nodes(item)
+    elif isinstance(data, dict):
+        if isinstance(data.get('@graph'), list):
+            yield from _ld_nodes(data['@graph'])
+        else:
+            yield data
+
+
+def _ld_entry(node, url=''):
+    return {
+        'title': _text(node.get('headline') or node.get('name')),
+        'link': _node_url(node.get('url')) or _node_url(node.get('mainEntityOfPage')) or url,
+        'summary': _text(node.get('description')),
+        'published': parse_published(node.get('datePublished') or node.get('dateCreated')),
+    }
+
+
+def _item_list_entries(node):
+    """ItemList 的每个元素可以是 URL 字符串、ListItem（item 为对象或 URL）或文章对象本身"""
+    elements = node.get('itemListElement') or []
+    if isinstance(elements, dict):
+        elements = [elements]
+    for element in elements:
+        if isinstance(element, str):
+            yield _ld_entry({}, element)
+        elif isinstance(element, dict):
+            item = element.get('item')
+            if isinstance(item, dict):
+                entry = _ld_entry(item, _node_url(element.get('url')))
+                entry['title'] = entry['title'] or _text(element.get('name'))
+                yield entry
+            else:
+                yield _ld_entry(element, _node_url(item))
+
+
+def json_ld_entries(content, encoding=None):
+    """从页面中所有 JSON-LD 块里取出文章条目（ItemList 元素与文章类型对象，按文档顺序）"""
+    entries = []
+    for match in _LD_JSON.finditer(content):
+        text = _CDATA_WRAPPER.sub('', match.group(1).decode(encoding or 'utf-8', 'replace'))
+        try:
+            data = json.loads(text, strict=False)
+        except ValueError:
+            continue
+        for node in _ld_nodes(data):
+            types = _types(node)
+            if 'ItemList' in types:
+                entries.extend(_item_list_entries(node))
+            elif types & ARTICLE_TYPES:
+                entries.append(_ld_entry(node))
+    return entries
+
+
+def meta_properties(content, encoding=None):
+    """读取 <head> 中 OpenGraph / article 元标签，返回 {property: content}（同名取第一个）"""
+    head_end = _HEAD_END.search(content)
+    head = content[:head_end.start()] if head_end else content
+    properties = {}
+    for tag in _META_TAG.finditer(head):
+        attrs = {}
+        for name, *values in _ATTRIBUTE.findall(tag.group(0)):
+            value = next((v for v in values if v), b'')
+            attrs[name.decode('ascii').lower()] = value.decode(encoding or 'utf-8', 'replace')
+        key = attrs.get('property') or attrs.get('name')
+        if key and 'content' in attrs:
+            properties.setdefault(key.lower(), html.unescape(attrs['content']).strip())
+    return properties
+
+
+def og_article_entry(properties):
+    """页面本身是一篇文章（og:type=article）时，用 OpenGraph 元数据组成一个条目"""
+    if properties.get('og:type') != 'article' or not properties.get('og:title'):
+        return None
+    return {
+        'title': properties['og:title'],
+        'link': properties.get('og:url', ''),
+        'summary': properties.get('og:description', ''),
+        'published': parse_published(properties.get('article:published_time')),
+    }
+
+
+def _as_bytes(content, encoding):
+    if isinstance(content, str):
+        return content.encode('utf-8'), 'utf-8'
+    return content, encoding
+
+
+def extract_structured_entries(content, encoding=None):
+    """
+    从页面的 JSON-LD 中提取列表页的文章条目
+
+    Args:
+        content: 页面 bytes（str 时按 UTF-8 处理）
+        encoding: 已识别的编码
+
+    Returns:
+        list: 条目字典 {'title', 'link', 'summary', 'published'}；没有足够的结构化数据时返回 None
+    """
+    content, encoding = _as_bytes(content, encoding)
+    entries = json_ld_entries(content, encoding)
+    if sum(1 for entry in entries if entry['title'] and entry['link']) >= STRUCTURED_MIN_ITEMS:
+        return entries
+    return None
+
+
+def page_article_entry(content, encoding=None):
+    """
+    页面本身是一篇文章（og:type=article）时的 OpenGraph 条目，否则返回 None
+
+    很多列表页和首页也声明 og:type=article，调用方只应在 DOM 中找不到列表条目时使用。
+    """
+    content, encoding = _as_bytes(content, encoding)
+    return og_article_entry(meta_properties(content, encoding))
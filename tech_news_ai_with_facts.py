@@ -8,17 +8,22 @@ import os
 import re
 import json
 import requests
-import hashlib
+import heapq
 from datetime import datetime, timedelta
 import time
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from collections import Counter
+from concurrent.futures import wait
 import random  # 用于生成 salt
 import google.generativeai as genai
 
 # 导入新闻抓取模块
 from news_fetcher import NewsFetcher, AsyncNewsFetcher
+from article_pipeline import apply_translation
+from deadline import Deadline, parse_budget
+from translation import BaiduTranslator
+from translation_memory import TranslationMemory
 
 # 尝试导入 fake_useragent（可选）
 try:
@@ -45,14 +50,30 @@ except ImportError as e:
     asyncio = None
     aiohttp = None
 
+# 抓取阶段最多使用的时间预算比例（其余留给深度分析和报告生成）
+FETCH_BUDGET_FRACTION = 0.6
+# 一次 Gemini 分析至少需要的剩余时间（秒），不足时使用备用分析
+GEMINI_MIN_SECONDS = 15
+
 class EnhancedNewsAnalyzer:
-    def __init__(self):
+    def __init__(self, budget_seconds=None, parse_processes=False):
         self.server_chan_key = os.getenv('SERVER_CHAN_KEY')
         self.gemini_api_key = os.getenv('GEMINI_API_KEY')
         self.forty_eight_hours_ago = datetime.now() - timedelta(hours=48)
         
-        # 初始化新闻抓取器（传入百度翻译函数）
-        self.news_fetcher = NewsFetcher(baidu_translate_func=self.baidu_translate)
+        # 整次运行的时间预算（None 表示不限时）
+        self.deadline = Deadline(budget_seconds)
+        
+        # 百度翻译批量队列：各源的标题和摘要合并成尽量少的请求，翻译过的文本跨运行复用
+        self.translation_memory = TranslationMemory()
+        self.translator = BaiduTranslator(deadline=self.deadline, memory=self.translation_memory)
+        
+        # 初始化新闻抓取器（传入百度翻译函数和批量翻译器；同时提供同步与异步抓取方法）
+        self.news_fetcher = AsyncNewsFetcher(baidu_translate_func=self.baidu_translate, translator=self.translator)
+        # 抓取阶段不翻译，排序筛选后只翻译报告中展示的文章（见 translate_rendered_articles）
+        self.news_fetcher.translate_on_fetch = False
+        # 解析默认在线程池中进行；源很多、响应很大时可改用进程池（--parse-processes）
+        self.news_fetcher.parse_stage.use_processes = parse_processes
         
         # 防御性检查：API密钥配置提醒
         if not self.gemini_api_key:
@@ -104,6 +125,7 @@ class EnhancedNewsAnalyzer:
         self.deep_analyses = []
         self.featured_article = None
         self.featured_fact = None
+        self.translation_savings = None
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
@@ -160,83 +182,19 @@ class EnhancedNewsAnalyzer:
             return 'unknown'
     
     def _wait_if_needed(self, url):
-        """根据频率控制策略等待适当时间"""
-        domain = self._extract_domain(url)
-        current_time = time.time()
-        
-        if domain in self.domain_delays:
-            elapsed = current_time - self.domain_delays[domain]
-            if elapsed < self.min_delay_between_requests:
-                wait_time = self.min_delay_between_requests - elapsed
-                print(f"  ⏳ 频率控制: 等待 {wait_time:.1f} 秒后再请求 {domain}")
-                time.sleep(wait_time)
-        
-        # 更新该域名的最后请求时间
-        self.domain_delays[domain] = time.time()
+        """根据频率控制策略等待适当时间（与抓取器共用按域名的令牌桶）"""
+        self.news_fetcher._wait_if_needed(url)
     
     # ==================== 新增：百度翻译函数 ====================
     def baidu_translate(self, title, summary):
-        """使用百度API翻译英文到中文，提供贴合实际的翻译，失败时返回标记"""
-        appid = os.getenv('BAIDU_APPID')
-        secret_key = os.getenv('BAIDU_SECRET_KEY')
-        if not appid or not secret_key:
-            print("⚠️ 未配置百度翻译密钥，跳过翻译")
-            # 返回特殊标记表示未翻译
-            return {
-                'title': f"{title} (未翻译)",
-                'summary': f"{summary} (未翻译)" if summary else "(未翻译)"
-            }
-        
-        try:
-            query = title + '\n' + summary if summary else title
-            from_lang = 'en'
-            to_lang = 'zh'
-            salt = str(random.randint(32768, 65536))
-            sign = hashlib.md5((appid + query + salt + secret_key).encode('utf-8')).hexdigest()
-            
-            url = 'http://api.fanyi.baidu.com/api/trans/vip/translate'
-            params = {
-                'q': query,
-                'from': from_lang,
-                'to': to_lang,
-                'appid': appid,
-                'salt': salt,
-                'sign': sign
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            result = response.json()
-            
-            if 'trans_result' in result:
-                trans_result = result['trans_result'][0]['dst']
-                parts = trans_result.split('\n')
-                translated_title = parts[0].strip()
-                translated_summary = parts[1].strip() if len(parts) > 1 else ''
-                return {
-                    'title': translated_title,
-                    'summary': translated_summary
-                }
-            else:
-                print(f"⚠️ 百度翻译失败: {result.get('error_msg', '未知错误')}")
-                # 翻译失败也返回标记
-                return {
-                    'title': f"{title} (未翻译)",
-                    'summary': f"{summary} (未翻译)" if summary else "(未翻译)"
-                }
-        except Exception as e:
-            print(f"⚠️ 百度翻译请求失败: {e}")
-            # 异常情况下也返回标记
-            return {
-                'title': f"{title} (未翻译)",
-                'summary': f"{summary} (未翻译)" if summary else "(未翻译)"
-            }
+        """使用百度API翻译英文到中文（经批量翻译队列发送），失败时返回标记"""
+        return self.translator.translate(title, summary)
     
     # ==================== 新闻抓取方法（已迁移到 news_fetcher.py）====================
     def fetch_arxiv(self, source):
         """抓取Arxiv AI论文（委托给 news_fetcher 模块）"""
         articles = self.news_fetcher.fetch_arxiv(source)
-        self.all_articles.extend(articles)
-        self.ai_articles.extend(articles)
+        self._collect(articles, 'ai')
         return len(articles)
     
     async def fetch_rss_async(self, session, source, article_type='ai'):
@@ -244,101 +202,131 @@ class EnhancedNewsAnalyzer:
         if not ASYNC_AVAILABLE:
             raise RuntimeError("异步功能不可用：请先安装 aiohttp (pip install aiohttp)")
         
-        async_fetcher = AsyncNewsFetcher(baidu_translate_func=self.baidu_translate)
-        articles = await async_fetcher.fetch_rss_async(session, source, article_type)
+        articles = await self.news_fetcher.fetch_rss_async(session, source, article_type)
         
-        self.all_articles.extend(articles)
-        if article_type == 'ai':
-            self.ai_articles.extend(articles)
-        else:
-            self.fact_articles.extend(articles)
+        self._collect(articles, article_type)
         
         return len(articles)
     
     async def fetch_hackernews_async(self, session, source, article_type='ai'):
         """异步Hacker News抓取方法（委托给 news_fetcher 模块）"""
-        # 异步 HN 抓取暂未实现，使用同步版本
-        return self.fetch_hackernews(source, article_type)
+        if not ASYNC_AVAILABLE:
+            raise RuntimeError("异步功能不可用：请先安装 aiohttp (pip install aiohttp)")
+        
+        articles = await self.news_fetcher.fetch_hackernews_async(session, source, article_type)
+        
+        self._collect(articles, article_type)
+        
+        return len(articles)
 
     # ==================== 新增：抓取事实新闻 ====================
     def fetch_fact_news(self):
         """抓取多方面事实新闻"""
         print("\n📰 开始抓取多方面事实新闻（过去48小时）...")
-        
-        for source in self.fact_news_sources:
-            print(f"  → {source['name']}")
-            try:
-                # 使用新闻抓取模块
-                articles = self.news_fetcher.fetch_from_source(source, article_type='fact')
-                self.all_articles.extend(articles)
-                self.fact_articles.extend(articles)
-                time.sleep(1)  # 礼貌延迟
-            except Exception as e:
-                print(f"    ❌ 抓取失败: {e}")
-                continue
-        
+        self._fetch_sources(self.fact_news_sources, 'fact')
         print(f"✅ 事实新闻抓取完成！共获得 {len(self.fact_articles)} 篇")
-        
-        # 去重和筛选最重要的10篇
-        unique_facts = []
+        self._finalize_fact_articles()
+    
+    def _collect(self, articles, article_type):
+        """把一个源的文章并入总列表和对应类型的列表"""
+        self.all_articles.extend(articles)
+        if article_type == 'ai':
+            self.ai_articles.extend(articles)
+        else:
+            self.fact_articles.extend(articles)
+    
+    def _finalize_fact_articles(self):
+        """事实新闻去重，并筛选最重要的10篇"""
+        self.fact_articles = heapq.nlargest(
+            10,
+            self._unique_by_id(self.fact_articles),
+            key=lambda x: (x.get('importance', 5), datetime.strptime(x['time'], '%Y-%m-%d %H:%M') if x.get('time') else datetime.now())
+        )
+    
+    @staticmethod
+    def _unique_by_id(articles):
+        """按 id 去重（惰性产出，保留首次出现的文章）"""
         seen_ids = set()
-        for article in self.fact_articles:
+        for article in articles:
             if article['id'] not in seen_ids:
-                unique_facts.append(article)
                 seen_ids.add(article['id'])
-        self.fact_articles = sorted(
-            unique_facts, 
-            key=lambda x: (x.get('importance', 5), datetime.strptime(x['time'], '%Y-%m-%d %H:%M') if x.get('time') else datetime.now()), 
-            reverse=True
-        )[:10]
+                yield article
     
     # ==================== 新闻抓取方法（已迁移到 news_fetcher.py）====================
     def fetch_rss(self, source, article_type='ai'):
         """通用RSS抓取方法（委托给 news_fetcher 模块）"""
         articles = self.news_fetcher.fetch_rss(source, article_type)
-        self.all_articles.extend(articles)
-        if article_type == 'ai':
-            self.ai_articles.extend(articles)
-        else:
-            self.fact_articles.extend(articles)
+        self._collect(articles, article_type)
         return len(articles)
     
     def fetch_hackernews(self, source, article_type='ai'):
         """通用Hacker News抓取方法（委托给 news_fetcher 模块）"""
         articles = self.news_fetcher.fetch_hackernews(source, article_type)
-        self.all_articles.extend(articles)
-        if article_type == 'ai':
-            self.ai_articles.extend(articles)
-        else:
-            self.fact_articles.extend(articles)
+        self._collect(articles, article_type)
         return len(articles)
     
     def fetch_html(self, source, article_type='fact'):
         """HTML页面解析方法（委托给 news_fetcher 模块）"""
         articles = self.news_fetcher.fetch_html(source, article_type)
-        self.all_articles.extend(articles)
-        if article_type == 'ai':
-            self.ai_articles.extend(articles)
-        else:
-            self.fact_articles.extend(articles)
+        self._collect(articles, article_type)
         return len(articles)
     
+    def _fetch_sources(self, sources, article_type):
+        """线程池并行抓取一组新闻源，按配置顺序合并结果（频率控制由抓取器按域名处理）"""
+        start = time.time()
+        results = self.news_fetcher.fetch_many(sources, article_type)
+        
+        for source, articles, elapsed in results:
+            print(f"  → {source['name']}: {len(articles)}篇，耗时 {elapsed:.1f} 秒")
+            self._collect(articles, article_type)
+        
+        print(f"  ⏱️  {len(sources)} 个源并行抓取耗时 {time.time() - start:.1f} 秒")
+    
     def fetch_all_news(self):
         """抓取所有新闻"""
         print("📡 开始抓取AI科技新闻（过去48小时）...")
-        for source in self.ai_news_sources:
-            print(f"  → {source['name']}")
-            try:
-                # 使用新闻抓取模块
-                articles = self.news_fetcher.fetch_from_source(source, article_type='ai')
-                self.all_articles.extend(articles)
-                self.ai_articles.extend(articles)
-                time.sleep(1)
-            except Exception as e:
-                print(f"    ❌ 抓取失败: {e}")
+        self._fetch_sources(self.ai_news_sources, 'ai')
         
         print(f"✅ AI新闻抓取完成！共获得 {len(self.ai_articles)} 篇")
     
+    # ==================== 异步并发抓取 ====================
+    async def _fetch_sources_async(self, session, sources, article_type):
+        """
+        并发抓取一组新闻源，每个源完成后立即合并结果
+
+        全部完成后再把这一组的文章按配置顺序重排（与同步模式一致，排序和筛选结果不随完成顺序变化）；
+        中途因时间预算被取消时，已完成的源仍保留在结果中。
+        """
+        collected = self.ai_articles if article_type == 'ai' else self.fact_articles
+        start = len(collected)
+        results = [None] * len(sources)
+        async for index, source, articles, elapsed in self.news_fetcher.fetch_many_async(session, sources, article_type):
+            print(f"  ⏱️  {source['name']} 完成，耗时 {elapsed:.1f} 秒")
+            results[index] = articles
+            self._collect(articles, article_type)
+        
+        collected[start:] = [article for articles in results if articles for article in articles]
+    
+    async def fetch_all_news_async(self, session=None):
+        """异步并发抓取所有AI新闻"""
+        if session is None:
+            async with self.news_fetcher.create_session() as session:
+                return await self.fetch_all_news_async(session)
+        
+        print("📡 开始并发抓取AI科技新闻（过去48小时）...")
+        await self._fetch_sources_async(session, self.ai_news_sources, 'ai')
+        print(f"✅ AI新闻抓取完成！共获得 {len(self.ai_articles)} 篇")
+    
+    async def fetch_fact_news_async(self, session=None):
+        """异步并发抓取多方面事实新闻"""
+        if session is None:
+            async with self.news_fetcher.create_session() as session:
+                return await self.fetch_fact_news_async(session)
+        
+        print("\n📰 开始并发抓取多方面事实新闻（过去48小时）...")
+        await self._fetch_sources_async(session, self.fact_news_sources, 'fact')
+        print(f"✅ 事实新闻抓取完成！共获得 {len(self.fact_articles)} 篇")
+        self._finalize_fact_articles()
 
 
     def fetch_arxiv_abstract(self, url):
@@ -350,6 +338,11 @@ class EnhancedNewsAnalyzer:
         if not api_key:
             print("  ⚠️  未配置 GEMINI_API_KEY，使用备用分析")
             return self._fallback_analysis(article)
+        
+        if not self.deadline.can_afford(GEMINI_MIN_SECONDS):
+            self.deadline.drop('深度分析', article['title'][:40], '剩余时间不足，改用备用分析')
+            print("  ⏱️  剩余时间不足，使用备用分析")
+            return self._fallback_analysis(article)
     
         try:
             genai.configure(api_key=api_key)
@@ -364,10 +357,15 @@ class EnhancedNewsAnalyzer:
             model = None
             last_error = None
             for model_name in models_to_try:
+                if self.deadline.expired():
+                    break
                 try:
                     test_model = genai.GenerativeModel(model_name)
                     # 测试模型是否可用
-                    test_response = test_model.generate_content("test")
+                    test_response = test_model.generate_content(
+                        "test",
+                        request_options={'timeout': self.deadline.cap_timeout(30)}
+                    )
                     if test_response and test_response.text:
                         print(f"  ✓ 使用模型: {model_name}")
                         model = test_model
@@ -382,6 +380,10 @@ class EnhancedNewsAnalyzer:
                     print(f"     最后错误: {last_error}")
                 return self._fallback_analysis(article)
     
+            if not self.deadline.can_afford(GEMINI_MIN_SECONDS):
+                self.deadline.drop('深度分析', article['title'][:40], '剩余时间不足，改用备用分析')
+                return self._fallback_analysis(article)
+            
             # 如果是ArXiv，优先获取真实摘要（已带缓存）
             full_abstract = ""
             if 'arxiv.org' in article['link']:
@@ -406,7 +408,10 @@ class EnhancedNewsAnalyzer:
     直接返回JSON，无多余文字。
     """
     
-            response = model.generate_content(prompt)
+            response = model.generate_content(
+                prompt,
+                request_options={'timeout': self.deadline.cap_timeout(60)}
+            )
             
             # 检查响应是否为空
             if not response or not response.text:
@@ -544,19 +549,26 @@ class EnhancedNewsAnalyzer:
             'key_points': tags
         }
     
+    def _deep_analysis_candidates(self, limit=3):
+        """重要度最高的几篇AI文章（深度分析对象）"""
+        return sorted(
+            self.ai_articles,
+            key=lambda x: x.get('importance', 5),
+            reverse=True
+        )[:limit]
+    
     def generate_deep_analyses(self, limit=3):
         """生成深度分析（AI新闻）"""
         if not self.ai_articles:
             return []
         
-        important_articles = sorted(
-            self.ai_articles,
-            key=lambda x: x.get('importance', 5),
-            reverse=True
-        )[:limit]
+        important_articles = self._deep_analysis_candidates(limit)
         
         print(f"\n🔍 开始深度分析 {len(important_articles)} 篇AI文章...")
         
+        # 一次请求取回待分析论文的完整摘要（本次已抓取过元数据的论文不会重复请求）
+        self.news_fetcher.prefetch_arxiv_metadata(important_articles)
+        
         analyses = []
         for i, article in enumerate(important_articles, 1):
             print(f"  {i}. 分析: {article['title'][:60]}...")
@@ -594,7 +606,7 @@ class EnhancedNewsAnalyzer:
                 'text': analysis_text
             })
             
-            if self.gemini_api_key:
+            if self.gemini_api_key and self.deadline.can_afford(1):
                 time.sleep(1)  # API调用间隔
         
         self.deep_analyses = analyses
@@ -629,6 +641,54 @@ class EnhancedNewsAnalyzer:
             if scored_facts:
                 self.featured_fact = scored_facts[0]
     
+    def _ai_digest(self):
+        """AI快讯摘要中展示的文章：前15篇按类别分组，每类最多3篇"""
+        ai_by_category = {}
+        for article in self.ai_articles[:15]:
+            cat = article.get('category', 'other')
+            if cat not in ai_by_category:
+                ai_by_category[cat] = []
+            ai_by_category[cat].append(article)
+        return {cat: articles[:3] for cat, articles in ai_by_category.items()}
+    
+    def translate_rendered_articles(self):
+        """
+        只翻译报告中实际展示的英文文章（需在选出精选文章之后调用）
+        
+        精选文章和深度分析文章翻译标题和摘要，列表中的文章只翻译标题。
+        """
+        full, title_only, seen = [], [], set()
+        featured = [self.featured_article, self.featured_fact] + self._deep_analysis_candidates()
+        listed = [a for articles in self._ai_digest().values() for a in articles] + self.fact_articles[:10]
+        for group, articles in ((full, featured), (title_only, listed)):
+            for article in articles:
+                if article and article.get('lang') == 'en' and id(article) not in seen:
+                    seen.add(id(article))
+                    group.append(article)
+        pairs = [(a['title'], a.get('summary', '')) for a in full] + [(a['title'], '') for a in title_only]
+        
+        # 抓取阶段逐源翻译时会翻译的全部英文文章，用于估算省下的请求
+        fetched = [(a['title'], a.get('summary', '')) for a in self.all_articles if a.get('lang') == 'en']
+        self.translation_savings = {
+            'fetched': len(fetched),
+            'translated': len(pairs),
+            'texts_avoided': sum(1 + bool(summary) for _, summary in fetched) - sum(1 + bool(summary) for _, summary in pairs),
+            'requests_avoided': max(0, self.translator.estimate_requests(fetched) - self.translator.estimate_requests(pairs)),
+        }
+        if not pairs:
+            return
+        
+        print(f"\n🌐 翻译报告中展示的 {len(pairs)} 篇英文文章（共抓取 {len(fetched)} 篇）...")
+        futures = self.translator.submit_many(pairs)
+        done, not_done = wait(futures, timeout=self.deadline.remaining())
+        for article, future in zip(full, futures):
+            if future in done:
+                apply_translation(article, future.result())
+        for article, future in zip(title_only, futures[len(full):]):
+            if future in done:
+                article['title_translated'] = future.result()['title']
+        self._report_untranslated(len(not_done))
+    
     def format_fact_news_section(self):
         """格式化事实新闻部分，按中文/国际分组展示"""
         if not self.fact_articles:
@@ -728,6 +788,23 @@ class EnhancedNewsAnalyzer:
         
         return section
     
+    def format_budget_section(self):
+        """汇总因时间预算被放弃的工作"""
+        dropped = self.deadline.summary()
+        if not dropped:
+            return ""
+        
+        section = f"""
+## ⏱️ 时间预算说明
+
+本次运行预算 {self.deadline.budget_seconds:.0f} 秒，以下内容因超出预算被跳过：
+"""
+        for stage, items in dropped.items():
+            preview = '、'.join(items[:5])
+            more = f" 等{len(items)}项" if len(items) > 5 else ""
+            section += f"- **{stage}**: {preview}{more}\n"
+        return section
+    
     def generate_report(self):
         """生成完整报告"""
         current_time = datetime.now().strftime('%Y-%m-%d %H:%M')
@@ -750,12 +827,7 @@ class EnhancedNewsAnalyzer:
 ### 🚀 AI快讯摘要
 """
             # 按类别分组展示AI新闻
-            ai_by_category = {}
-            for article in self.ai_articles[:15]:
-                cat = article.get('category', 'other')
-                if cat not in ai_by_category:
-                    ai_by_category[cat] = []
-                ai_by_category[cat].append(article)
+            ai_by_category = self._ai_digest()
             
             category_names = {
                 'research': '🧪 研究前沿',
@@ -767,7 +839,7 @@ class EnhancedNewsAnalyzer:
             for cat, articles in ai_by_category.items():
                 name = category_names.get(cat, '📌 其他')
                 report += f"\n**{name}**\n"
-                for i, article in enumerate(articles[:3], 1):
+                for i, article in enumerate(articles, 1):
                     title_display = article.get('title_translated', article['title'])
                     report += f"{i}. {title_display}\n"
                     report += f"   📍 {article['source']} | 🔗 [阅读原文]({article['link']})\n"
@@ -798,6 +870,9 @@ class EnhancedNewsAnalyzer:
         # 2. 事实新闻部分
         report += self.format_fact_news_section()
         
+        # 时间预算说明（仅在有内容因预算被放弃时出现）
+        report += self.format_budget_section()
+        
         # 3. 总结
         report += f"""
 
@@ -878,21 +953,28 @@ class EnhancedNewsAnalyzer:
         print("=" * 70)
         
         try:
-            # 1. 异步抓取AI新闻
-            await self.fetch_all_news_async()
+            # 抓取阶段只使用部分预算，保证分析和报告仍有时间
+            self.news_fetcher.deadline = self.deadline.stage(FETCH_BUDGET_FRACTION)
             
-            # 2. 异步抓取事实新闻
-            await self.fetch_fact_news_async()
+            # 1-2. 共用一个会话，并发抓取AI新闻与事实新闻
+            fetch_start = time.time()
+            async with self.news_fetcher.create_session() as session:
+                await asyncio.gather(
+                    self.fetch_all_news_async(session),
+                    self.fetch_fact_news_async(session),
+                )
+            print(f"⏱️  抓取阶段耗时 {time.time() - fetch_start:.1f} 秒")
             
             if not self.all_articles:
                 print("❌ 未抓取到任何文章，程序退出")
                 return self._generate_error_report("未抓取到任何新闻文章"), "抓取失败"
             
-            # 3. 生成AI深度分析
-            self.generate_deep_analyses(limit=3)
-            
-            # 4. 选择精选文章
+            # 3. 选择精选文章，只翻译报告中展示的英文文章
             self.select_featured_articles()
+            self.translate_rendered_articles()
+            
+            # 4. 生成AI深度分析
+            self.generate_deep_analyses(limit=3)
             
             # 5. 生成报告
             report, title = self.generate_report()
@@ -904,6 +986,7 @@ class EnhancedNewsAnalyzer:
             print(f"   AI资讯: {len(self.ai_articles)} 篇")
             print(f"   事实资讯: {len(self.fact_articles)} 篇")
             print(f"   报告标题: {title}")
+            self._print_run_stats()
             
             return report, title
             
@@ -916,6 +999,11 @@ class EnhancedNewsAnalyzer:
             import traceback
             print(f"详细错误信息:\n{traceback.format_exc()}")
             return self._generate_error_report(f"执行异常: {str(e)}"), "执行失败"
+        
+        finally:
+            self.news_fetcher.close()
+            self.translator.close()
+            self.translation_memory.close()
     
     def run(self):
         """主执行函数（带异常处理）"""
@@ -925,6 +1013,9 @@ class EnhancedNewsAnalyzer:
         print("=" * 70)
         
         try:
+            # 抓取阶段只使用部分预算，保证分析和报告仍有时间
+            self.news_fetcher.deadline = self.deadline.stage(FETCH_BUDGET_FRACTION)
+            
             # 1. 抓取AI新闻
             self.fetch_all_news()
             
@@ -935,11 +1026,12 @@ class EnhancedNewsAnalyzer:
                 print("❌ 未抓取到任何文章，程序退出")
                 return self._generate_error_report("未抓取到任何新闻文章"), "抓取失败"
             
-            # 3. 生成AI深度分析
-            self.generate_deep_analyses(limit=3)
-            
-            # 4. 选择精选文章
+            # 3. 选择精选文章，只翻译报告中展示的英文文章
             self.select_featured_articles()
+            self.translate_rendered_articles()
+            
+            # 4. 生成AI深度分析
+            self.generate_deep_analyses(limit=3)
             
             # 5. 生成报告
             report, title = self.generate_report()
@@ -951,6 +1043,7 @@ class EnhancedNewsAnalyzer:
             print(f"   AI资讯: {len(self.ai_articles)} 篇")
             print(f"   事实资讯: {len(self.fact_articles)} 篇")
             print(f"   报告标题: {title}")
+            self._print_run_stats()
             
             return report, title
             
@@ -963,6 +1056,82 @@ class EnhancedNewsAnalyzer:
             import traceback
             print(f"详细错误信息:\n{traceback.format_exc()}")
             return self._generate_error_report(f"执行异常: {str(e)}"), "执行失败"
+        
+        finally:
+            self.news_fetcher.close()
+            self.translator.close()
+            self.translation_memory.close()
+    
+    def _report_untranslated(self, unfinished):
+        if unfinished:
+            print(f"⚠️ {unfinished} 篇文章的翻译未在时间预算内完成，报告中显示原文")
+    
+    def _print_run_stats(self):
+        """打印本次运行的网络、缓存与时间预算统计"""
+        conn_stats = self.news_fetcher.get_connection_stats()
+        print(f"   🔌 HTTP连接: 请求 {conn_stats['requests']} 次 | "
+              f"新建连接 {conn_stats['new']} 条 | 复用连接 {conn_stats['reused']} 次")
+        
+        rate_stats = self.news_fetcher.get_rate_limit_stats()
+        waited = {domain: stats for domain, stats in rate_stats.items() if stats['waits']}
+        if waited:
+            print("   ⏳ 频率控制等待:")
+            for domain, stats in waited.items():
+                print(f"      {domain}: 等待 {stats['waits']}/{stats['requests']} 次，"
+                      f"累计 {stats['wait_time']:.1f} 秒")
+        
+        stream_stats = self.news_fetcher.get_stream_stats()
+        early = [stats for stats in stream_stats.values() if stats['early']]
+        if early:
+            saved = sum(stats['saved'] for stats in early if stats['saved'] is not None)
+            print(f"   📉 流式下载: {len(early)}/{len(stream_stats)} 个源提前结束，节省约 {saved / 1024:.1f} KB")
+        
+        charset_stats = self.news_fetcher.get_charset_stats()
+        if charset_stats:
+            print("   🔤 编码识别: " + " | ".join(f"{how} {count}" for how, count in charset_stats.items()))
+        
+        translate_stats = self.translator.get_stats()
+        if translate_stats['texts']:
+            print(f"   🌐 百度翻译: {translate_stats['texts']} 篇合并为 {translate_stats['requests']} 次请求"
+                  + (f"，失败 {translate_stats['failed']} 篇" if translate_stats['failed'] else ''))
+            if translate_stats['throttled_seconds'] or translate_stats['throttled']:
+                print(f"   🚦 翻译限速: {self.translator.qps:g} QPS，等待 {translate_stats['throttled_seconds']} 秒"
+                      + (f"，被限频 {translate_stats['throttled']} 次" if translate_stats['throttled'] else ''))
+        
+        if self.translation_savings:
+            savings = self.translation_savings
+            print(f"   🪶 延迟翻译: 只翻译 {savings['translated']}/{savings['fetched']} 篇英文文章，"
+                  f"少翻译 {savings['texts_avoided']} 段文本，省去约 {savings['requests_avoided']} 次请求")
+        
+        memory_stats = self.translation_memory.get_stats()
+        lookups = memory_stats['hits'] + memory_stats['misses']
+        if lookups:
+            print(f"   🧠 翻译记忆: 命中 {memory_stats['hits']}/{lookups} 段 ({memory_stats['hits'] / lookups:.0%})，"
+                  f"新增 {memory_stats['stored']} 段" + (f"，淘汰 {memory_stats['evicted']} 段" if memory_stats['evicted'] else ''))
+        
+        coalesce_stats = self.news_fetcher.get_coalesce_stats()
+        if coalesce_stats['shared'] or translate_stats['coalesced']:
+            print(f"   🔗 请求合并: {coalesce_stats['shared']} 次下载共享了相同 URL 的响应，"
+                  f"{translate_stats['coalesced']} 篇重复文章共享翻译结果")
+        
+        retry_stats = self.news_fetcher.get_retry_stats()
+        print(f"   🔁 重试: 已用 {retry_stats['used']}/{retry_stats['limit']} 次"
+              + (f"，预算不足拒绝 {retry_stats['denied']} 次" if retry_stats['denied'] else ''))
+        if retry_stats['skipped']:
+            print(f"   ⛔ 熔断跳过: {', '.join(retry_stats['skipped'])}")
+        
+        dropped = self.deadline.summary()
+        if dropped:
+            print(f"   ⏱️  时间预算 {self.deadline.budget_seconds:.0f} 秒，已放弃:")
+            for stage, items in dropped.items():
+                print(f"      {stage}: {len(items)} 项")
+        
+        cache_stats = self.news_fetcher.get_cache_stats()
+        if cache_stats:
+            print("   🗄️  HTTP缓存:")
+            for name, stats in cache_stats.items():
+                print(f"      {name}: 命中 {stats.get('hit', 0)} | "
+                      f"304验证 {stats.get('revalidated', 0)} | 未命中 {stats.get('miss', 0)}")
     
     def _generate_error_report(self, error_message):
         """生成错误情况下的简化报告"""
@@ -1017,9 +1186,13 @@ def main():
     
     parser = argparse.ArgumentParser(description='AI科技资讯分析系统')
     parser.add_argument('--use-async', action='store_true', help='使用异步模式加速抓取')
+    parser.add_argument('--budget', type=parse_budget, default=None,
+                        help='整次运行的时间预算，如 120s、2m（超时的工作会被跳过，报告仍会生成）')
+    parser.add_argument('--parse-processes', action='store_true',
+                        help='在 spawn 进程池中解析响应（默认使用线程池，见 python benchmarks.py pool）')
     args = parser.parse_args()
     
-    analyzer = EnhancedNewsAnalyzer()
+    analyzer = EnhancedNewsAnalyzer(budget_seconds=args.budget, parse_processes=args.parse_processes)
     
     if args.use_async:
         # 异步模式
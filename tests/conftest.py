@@ -0,0 +1,71 @@
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pytest
+
+# 模块都在仓库根目录下，没有打包安装
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StubServer:
+    """
+    本地替身 HTTP 服务
+
+    routes: {路径: 函数(请求)}，函数返回 (状态码, 响应头字典, 响应体 bytes)；
+    requests: 收到的每个请求 (路径含查询串, 请求头)
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub.requests.append((self.path, dict(self.headers)))
+                route = stub.routes.get(urlsplit(self.path).path)
+                status, headers, body = route(self) if route else (404, {}, b'')
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self._server.server_port}{path}"
+
+    def hits(self, path):
+        return sum(1 for requested, _ in self.requests if urlsplit(requested).path == path)
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def offline_fetcher(tmp_path):
+    """缓存目录在临时目录、不限速的 NewsFetcher"""
+    from news_fetcher import NewsFetcher
+    from rate_limiter import DomainRateLimiter
+
+    fetcher = NewsFetcher(cache_dir=str(tmp_path))
+    fetcher.rate_limiter = DomainRateLimiter(min_interval=0)
+    yield fetcher
+    fetcher.close()
@@ -0,0 +1,91 @@
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from benchmarks import synthetic_arxiv_listing
+from news_fetcher import NewsFetcher
+from rate_limiter import DomainRateLimiter
+
+PAPERS = 3
+
+
+def _api_feed(request):
+    ids = parse_qs(urlsplit(request.path).query)['id_list'][0].split(',')
+    entries = ''.join(
+        f"<entry><id>http://arxiv.org/abs/{paper_id}v1</id><title>T</title>"
+        f"<summary>Full abstract of {paper_id}</summary><author><name>Alice Zhang</name></author>"
+        f"<category term='cs.AI'/><category term='cs.LG'/><published>2024-10-01T00:00:00Z</published></entry>"
+        for paper_id in ids
+    )
+    return 200, {'Content-Type': 'application/atom+xml'}, f"<feed xmlns='http://www.w3.org/2005/Atom'>{entries}</feed>".encode()
+
+
+@pytest.fixture
+def arxiv(stub_server, tmp_path, monkeypatch):
+    """列表页与 API 替身；每次 run() 相当于一次新的运行（共享缓存目录）"""
+    state = {'api_up': True, 'listing_headers': {'Cache-Control': 'max-age=3600'}}
+    listing = synthetic_arxiv_listing(PAPERS)
+
+    def listing_route(request):
+        headers = state['listing_headers']
+        if headers.get('ETag') and request.headers.get('If-None-Match') == headers['ETag']:
+            return 304, headers, b''
+        return 200, dict(headers, **{'Content-Type': 'text/html; charset=utf-8'}), listing
+
+    stub_server.routes['/list'] = listing_route
+    stub_server.routes['/api'] = lambda request: _api_feed(request) if state['api_up'] else (500, {}, b'')
+    monkeypatch.setenv('ARXIV_API_URL', stub_server.url('/api'))
+    source = {'name': 'Arxiv', 'url': stub_server.url('/list'), 'type': 'arxiv', 'category': 'ai_research'}
+
+    def run():
+        fetcher = NewsFetcher(cache_dir=str(tmp_path))
+        fetcher.rate_limiter = DomainRateLimiter(min_interval=0)
+        fetcher.retry_budget.max_retries = 0
+        fetcher.circuit_breaker.failure_threshold = 99
+        try:
+            return fetcher.fetch_arxiv(source), fetcher.abstract_cache
+        finally:
+            fetcher.close()
+
+    state['run'] = run
+    return state
+
+
+def _assert_metadata(articles, abstract_cache):
+    assert len(articles) == PAPERS
+    for article in articles:
+        paper_id = article['id'][len('arxiv_'):]
+        assert abstract_cache[article['link']] == f"Full abstract of {paper_id}"
+        assert article['categories'] == ['cs.AI', 'cs.LG']
+        assert article['published'] == '2024-10-01'
+        assert article['authors']
+        assert article['summary']
+
+
+def test_metadata_is_fetched_and_restored_on_cache_hit(arxiv, stub_server):
+    _assert_metadata(*arxiv['run']())
+    assert stub_server.hits('/api') == 1
+
+    # 下一次运行新鲜命中：摘要从缓存条目恢复，不再请求列表页和 API
+    _assert_metadata(*arxiv['run']())
+    assert stub_server.hits('/list') == 1
+    assert stub_server.hits('/api') == 1
+
+
+def test_metadata_missing_from_cache_is_filled_after_304(arxiv, stub_server):
+    arxiv['listing_headers'] = {'ETag': '"v1"', 'Cache-Control': 'max-age=0'}
+    arxiv['api_up'] = False
+    articles, abstract_cache = arxiv['run']()
+    assert len(articles) == PAPERS
+    assert not any('categories' in article for article in articles)
+    assert not abstract_cache
+
+    # 304：缓存的文章缺少元数据，补请求 API 并写回缓存条目
+    arxiv['api_up'] = True
+    _assert_metadata(*arxiv['run']())
+    api_calls = stub_server.hits('/api')
+
+    _assert_metadata(*arxiv['run']())
+    assert stub_server.hits('/api') == api_calls
+    assert stub_server.hits('/list') == 3
+    assert stub_server.requests[-1][1].get('If-None-Match') == '"v1"'
@@ -0,0 +1,35 @@
+import asyncio
+import warnings
+
+with warnings.catch_warnings():
+    # google.generativeai 导入时给出弃用警告
+    warnings.simplefilter('ignore', FutureWarning)
+    from tech_news_ai_with_facts import EnhancedNewsAnalyzer
+
+
+class ReversedFetcher:
+    """按配置的逆序完成各源，并记录每个源完成时已经合并的文章数"""
+
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        self.merged_before = []
+
+    async def fetch_many_async(self, session, sources, article_type):
+        for index in reversed(range(len(sources))):
+            self.merged_before.append(len(self.analyzer.ai_articles))
+            articles = [{'id': f"{sources[index]['name']}-{i}"} for i in range(2)]
+            yield index, sources[index], articles, 0.1
+
+
+def test_async_results_merge_incrementally_and_end_in_source_order():
+    analyzer = EnhancedNewsAnalyzer.__new__(EnhancedNewsAnalyzer)
+    analyzer.all_articles, analyzer.ai_articles, analyzer.fact_articles = [], [{'id': 'earlier'}], []
+    analyzer.news_fetcher = ReversedFetcher(analyzer)
+    sources = [{'name': f"S{i}"} for i in range(3)]
+
+    asyncio.run(analyzer._fetch_sources_async(None, sources, 'ai'))
+
+    # 每个源完成后立即并入，全部完成后按配置顺序排列（之前已有的文章不动）
+    assert analyzer.news_fetcher.merged_before == [1, 3, 5]
+    assert [a['id'] for a in analyzer.ai_articles] == ['earlier', 'S0-0', 'S0-1', 'S1-0', 'S1-1', 'S2-0', 'S2-1']
+    assert len(analyzer.all_articles) == 6
@@ -0,0 +1,19 @@
+from charset_resolver import CharsetResolver
+
+
+def test_declared_charset_wins(tmp_path):
+    resolver = CharsetResolver(str(tmp_path))
+    content = '<?xml version="1.0" encoding="gb2312"?><rss>人工智能</rss>'.encode('gb18030')
+    assert resolver.resolve(None, content) == 'gb18030'
+    assert resolver.get_stats() == {'document': 1}
+
+
+def test_detected_charset_is_remembered_across_runs(tmp_path):
+    content = ('<html><body>' + '人工智能大模型新闻摘要。' * 50 + '</body></html>').encode('gb18030')
+    resolver = CharsetResolver(str(tmp_path))
+    assert resolver.resolve('https://example.cn/', content) == 'gb18030'
+    resolver.save()
+
+    next_run = CharsetResolver(str(tmp_path))
+    assert next_run.resolve('https://example.cn/', content) == 'gb18030'
+    assert next_run.get_stats() == {'memory': 1}
@@ -0,0 +1,37 @@
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def _tripped_breaker(tmp_path):
+    breaker = CircuitBreaker(str(tmp_path), failure_threshold=1, base_cooldown=0)
+    breaker.record_failure('https://example.com/feed')
+    assert breaker._states['https://example.com/feed']['state'] == OPEN
+    return breaker
+
+
+def test_half_open_lets_a_single_probe_through(tmp_path):
+    breaker = _tripped_breaker(tmp_path)
+
+    assert breaker.allow('https://example.com/feed', 'Example')
+    assert breaker._states['https://example.com/feed']['state'] == HALF_OPEN
+    assert not breaker.allow('https://example.com/feed', 'Example')
+    assert breaker.get_open_sources() == ['Example']
+
+
+def test_probe_success_closes_the_breaker(tmp_path):
+    breaker = _tripped_breaker(tmp_path)
+
+    assert breaker.allow('https://example.com/feed')
+    breaker.record_success('https://example.com/feed')
+    assert breaker._states['https://example.com/feed']['state'] == CLOSED
+    assert breaker.allow('https://example.com/feed')
+    assert breaker.allow('https://example.com/feed')
+
+
+def test_unfinished_probe_is_retried_next_run(tmp_path):
+    breaker = _tripped_breaker(tmp_path)
+    assert breaker.allow('https://example.com/feed')
+    breaker.save()
+
+    next_run = CircuitBreaker(str(tmp_path), failure_threshold=1, base_cooldown=0)
+    assert next_run.allow('https://example.com/feed')
+    assert not next_run.allow('https://example.com/feed')
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+
+import pytest
+
+from news_parsers import _parse_rss_feedparser, _parse_rss_lxml
+
+SOURCE = {'name': 'Parity', 'url': 'https://example.com/', 'category': 'tech', 'lang': 'en'}
+
+
+def feed_corpus():
+    """RSS/Atom 对照语料：覆盖常见格式变体"""
+    now = datetime.now()
+    rfc = lambda h: format_datetime(now - timedelta(hours=h))
+    iso = lambda h: (now - timedelta(hours=h)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    corpus = []
+    items = ''.join(
+        f"<item><title>AI news {i} &amp; more</title><link>https://example.com/rss/{i}</link>"
+        f"<description>Summary about LLM {i} with &lt;b&gt;bold&lt;/b&gt; text</description>"
+        f"<pubDate>{rfc(i * 5)}</pubDate><guid>g{i}</guid></item>" for i in range(15))
+    corpus.append(('RSS 2.0', f'<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel><title>T</title>{items}</channel></rss>'.encode()))
+    items = ''.join(
+        f"<item><title><![CDATA[GPT model {i}]]></title><link>https://example.com/cdata/{i}</link>"
+        f"<dc:creator>Ann</dc:creator><description><![CDATA[<p>Deep learning <a href='x'>story</a> {i}</p>]]></description>"
+        f"<content:encoded><![CDATA[<p>Full body {i}</p>]]></content:encoded>"
+        f"<pubDate>{rfc(i)}</pubDate></item>" for i in range(8))
+    corpus.append(('RSS 2.0 + CDATA/content:encoded', (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/" '
+        f'xmlns:dc="http://purl.org/dc/elements/1.1/"><channel><title>T</title>{items}</channel></rss>').encode()))
+    items = ''.join(
+        f"<item><title>AI only content {i}</title><link>https://example.com/c/{i}</link>"
+        f"<content:encoded><![CDATA[<p>Body only {i}</p>]]></content:encoded><dc:date>{iso(i)}</dc:date></item>" for i in range(6))
+    corpus.append(('RSS 2.0 无 description + dc:date', (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/" '
+        f'xmlns:dc="http://purl.org/dc/elements/1.1/"><channel><title>T</title>{items}</channel></rss>').encode()))
+    entries = ''.join(
+        f"<entry><title type='html'>Machine learning {i}</title><id>urn:{i}</id>"
+        f"<link rel='self' href='https://example.com/self/{i}'/><link rel='alternate' href='https://example.com/atom/{i}'/>"
+        f"<published>{iso(i * 3)}</published><updated>{iso(i)}</updated>"
+        f"<summary type='html'>&lt;p&gt;AI summary {i}&lt;/p&gt;</summary></entry>" for i in range(10))
+    corpus.append(('Atom', f'<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom"><title>T</title>{entries}</feed>'.encode()))
+    entries = ''.join(
+        f"<entry><title>LLM content {i}</title><id>urn:{i}</id><link href='https://example.com/ac/{i}'/>"
+        f"<updated>{iso(i)}</updated><content type='html'>&lt;p&gt;Content only {i}&lt;/p&gt;</content></entry>" for i in range(6))
+    corpus.append(('Atom 仅 content/updated', f'<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom"><title>T</title>{entries}</feed>'.encode()))
+    items = ''.join(
+        f"<item rdf:about='https://example.com/rdf/{i}'><title>AI rdf {i}</title><link>https://example.com/rdf/{i}</link>"
+        f"<description>RDF item {i}</description><dc:date>{iso(i)}</dc:date></item>" for i in range(6))
+    corpus.append(('RSS 1.0 (RDF)', (
+        '<?xml version="1.0" encoding="utf-8"?><rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" '
+        'xmlns="http://purl.org/rss/1.0/" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+        f'<channel rdf:about="x"><title>T</title></channel>{items}</rdf:RDF>').encode()))
+    items = ''.join(
+        f"<item><title>人工智能 大模型 {i}</title><link>https://example.cn/{i}</link>"
+        f"<description>中文摘要 {i}</description><pubDate>{rfc(i)}</pubDate></item>" for i in range(8))
+    corpus.append(('GB2312 声明', f'<?xml version="1.0" encoding="gb2312"?><rss version="2.0"><channel><title>T</title>{items}</channel></rss>'.encode('gb18030')))
+    items = ''.join(
+        f"<item><title>Old AI {i}</title><link>https://example.com/old/{i}</link><pubDate>{rfc(60 + i)}</pubDate></item>" for i in range(5))
+    corpus.append(('全部超出时间窗口', f'<?xml version="1.0"?><rss version="2.0"><channel>{items}</channel></rss>'.encode()))
+    corpus.append(('不规范 XML（未转义 &）', (
+        '<?xml version="1.0"?><rss version="2.0"><channel><item><title>AI & ML</title><link>https://example.com/bad</link>'
+        f'<pubDate>{rfc(1)}</pubDate></item></channel></rss>').encode()))
+    entries = ''.join(
+        f"<entry><title type='html'>AI &lt;b&gt;model&lt;/b&gt; {i} &amp;amp; &lt;em&gt;data&lt;/em&gt;</title>"
+        f"<link href='https://example.com/th/{i}'/><updated>{iso(i)}</updated>"
+        f"<summary>Plain summary {i}</summary></entry>"
+        f"<entry><title type='xhtml'><div xmlns='http://www.w3.org/1999/xhtml'>LLM <b>xhtml</b> {i} &amp; co</div></title>"
+        f"<link href='https://example.com/tx/{i}'/><updated>{iso(i)}</updated></entry>"
+        f"<entry><title>AI text title {i} &lt;not a tag&gt;</title>"
+        f"<link href='https://example.com/tt/{i}'/><updated>{iso(i)}</updated></entry>" for i in range(4))
+    corpus.append(('Atom 标题 type=html/xhtml/text', f'<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom"><title>T</title>{entries}</feed>'.encode()))
+    items = ''.join(
+        f"<item><title>AI &lt;i&gt;escaped&lt;/i&gt; markup {i}</title><link>https://example.com/rt/{i}</link><pubDate>{rfc(i)}</pubDate></item>"
+        f"<item><title>AT&amp;T   AI  spacing {i} &lt; 5</title><link>https://example.com/rp/{i}</link><pubDate>{rfc(i)}</pubDate></item>"
+        for i in range(4))
+    corpus.append(('RSS 标题含转义标签/实体', f'<?xml version="1.0"?><rss version="2.0"><channel>{items}</channel></rss>'.encode()))
+    return corpus
+
+
+_CORPUS = feed_corpus()
+
+
+def _comparable(articles):
+    """去掉与解析无关、每次都会变化的字段"""
+    return [{k: v for k, v in article.items() if k != 'time'} for article in articles or []]
+
+
+@pytest.mark.parametrize('article_type', ['fact', 'ai'])
+@pytest.mark.parametrize('label, content', _CORPUS, ids=[label for label, _ in _CORPUS])
+def test_lxml_fast_path_matches_feedparser(label, content, article_type):
+    cutoff = datetime.now() - timedelta(hours=48)
+    fast = _parse_rss_lxml(content, SOURCE, article_type, cutoff)
+    expected = _parse_rss_feedparser(content, SOURCE, article_type, cutoff)
+    if label.startswith('不规范'):
+        # 不规范的文档由 feedparser 兜底
+        assert fast is None
+        assert expected
+    else:
+        assert _comparable(fast) == _comparable(expected)
+
+
+def test_html_titles_are_plain_text():
+    content = dict(_CORPUS)['Atom 标题 type=html/xhtml/text']
+    titles = [a['title'] for a in _parse_rss_lxml(content, SOURCE, 'fact', datetime.now() - timedelta(hours=48))]
+    assert titles[:3] == ['AI model 0 & data', 'LLM xhtml 0 & co', 'AI text title 0 <not a tag>']
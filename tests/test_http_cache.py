@@ -0,0 +1,93 @@
+import time
+from datetime import datetime, timedelta
+from email.utils import format_datetime, formatdate
+
+from http_cache import HEURISTIC_MAX_LIFETIME, HTTPCache
+
+URL = 'https://example.com/feed'
+
+
+def test_max_age_sets_freshness_lifetime(tmp_path):
+    cache = HTTPCache(str(tmp_path))
+    entry = cache.store(URL, 'ai', {'Cache-Control': 'max-age=60', 'Date': formatdate(usegmt=True)}, [])
+
+    assert cache.is_fresh(entry)
+    assert not cache.is_fresh(entry, now=time.time() + 120)
+    assert cache.lookup(URL, 'ai')['freshness_lifetime'] == 60
+    # 变体不同的条目互不影响
+    assert cache.lookup(URL, 'fact') is None
+
+
+def test_age_header_counts_against_max_age(tmp_path):
+    cache = HTTPCache(str(tmp_path))
+    entry = cache.store(URL, 'ai', {'Cache-Control': 'max-age=60', 'Age': '90'}, [])
+
+    assert not cache.is_fresh(entry)
+
+
+def test_heuristic_freshness_from_last_modified(tmp_path):
+    cache = HTTPCache(str(tmp_path))
+    now = time.time()
+    headers = {'Date': formatdate(now, usegmt=True), 'Last-Modified': formatdate(now - 7200, usegmt=True)}
+    entry = cache.store(URL, 'ai', headers, [])
+
+    # Last-Modified 距今 2 小时的 10%
+    assert abs(entry['freshness_lifetime'] - 720) <= 1
+    headers['Last-Modified'] = formatdate(now - 30 * 86400, usegmt=True)
+    assert cache.store(URL, 'ai', headers, [])['freshness_lifetime'] == HEURISTIC_MAX_LIFETIME
+
+
+def test_no_cache_and_no_store(tmp_path):
+    cache = HTTPCache(str(tmp_path))
+    entry = cache.store(URL, 'ai', {'Cache-Control': 'no-cache, max-age=600', 'ETag': '"v1"'}, [])
+    assert not cache.is_fresh(entry)
+
+    assert cache.store(URL, 'ai', {'Cache-Control': 'no-store'}, []) is None
+    assert cache.lookup(URL, 'ai') is None
+
+
+def test_conditional_headers_and_refresh_on_304(tmp_path):
+    cache = HTTPCache(str(tmp_path))
+    last_modified = formatdate(time.time() - 3600, usegmt=True)
+    entry = cache.store(URL, 'ai', {'ETag': '"v1"', 'Last-Modified': last_modified, 'Cache-Control': 'max-age=0'},
+                        [{'title': 'AI story'}])
+
+    assert not cache.is_fresh(entry)
+    assert cache.conditional_headers(entry) == {'If-None-Match': '"v1"', 'If-Modified-Since': last_modified}
+    assert cache.conditional_headers(None) == {}
+
+    cache.refresh(entry, {'Cache-Control': 'max-age=300'})
+    stored = cache.lookup(URL, 'ai')
+    assert cache.is_fresh(stored)
+    assert stored['etag'] == '"v1"'
+    assert stored['articles'] == [{'title': 'AI story'}]
+
+
+def _feed():
+    now = datetime.now()
+    items = ''.join(
+        f"<item><title>AI model {i}</title><link>https://example.com/{i}</link>"
+        f"<description>LLM news {i}</description><pubDate>{format_datetime(now - timedelta(hours=i))}</pubDate></item>"
+        for i in range(3)
+    )
+    return f'<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>{items}</channel></rss>'.encode()
+
+
+def test_fetcher_revalidates_with_etag_and_serves_304_from_cache(stub_server, offline_fetcher):
+    feed = _feed()
+
+    def route(request):
+        if request.headers.get('If-None-Match') == '"v1"':
+            return 304, {'ETag': '"v1"', 'Cache-Control': 'max-age=0'}, b''
+        return 200, {'ETag': '"v1"', 'Cache-Control': 'max-age=0', 'Content-Type': 'application/rss+xml'}, feed
+
+    stub_server.routes['/feed'] = route
+    source = {'name': 'Stub', 'url': stub_server.url('/feed'), 'type': 'rss', 'category': 'ai'}
+
+    first = offline_fetcher.fetch_rss(source)
+    second = offline_fetcher.fetch_rss(source)
+
+    assert [a['title'] for a in first] == ['AI model 0', 'AI model 1', 'AI model 2']
+    assert [a['title'] for a in second] == [a['title'] for a in first]
+    assert stub_server.requests[1][1].get('If-None-Match') == '"v1"'
+    assert offline_fetcher.get_cache_stats() == {'Stub': {'miss': 1, 'revalidated': 1}}
@@ -0,0 +1,29 @@
+import os
+
+import pytest
+
+from json_store import load_json, save_json
+
+
+def test_round_trip_creates_missing_directory(tmp_path):
+    path = str(tmp_path / 'state' / 'profiles.json')
+    assert load_json(path) == {}
+
+    save_json(path, {'源': {'item': 'article'}})
+    assert load_json(path) == {'源': {'item': 'article'}}
+
+
+def test_failed_save_keeps_old_file_and_removes_temp_file(tmp_path):
+    path = str(tmp_path / 'breakers.json')
+    save_json(path, {'a': 1})
+
+    with pytest.raises(TypeError):
+        save_json(path, {'a': object()})
+    assert load_json(path) == {'a': 1}
+    assert os.listdir(tmp_path) == ['breakers.json']
+
+
+def test_corrupt_file_loads_as_empty(tmp_path):
+    path = tmp_path / 'charsets.json'
+    path.write_text('{"truncated', encoding='utf-8')
+    assert load_json(str(path)) == {}
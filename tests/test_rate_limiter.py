@@ -0,0 +1,48 @@
+import time
+
+import pytest
+
+from deadline import Deadline, DeadlineExceeded
+from rate_limiter import DomainRateLimiter
+
+
+def test_override_added_after_construction_is_used():
+    # NewsFetcher 先把空的 domain_rate_limits 交给限速器，之后才写入按域名的覆盖配置
+    domain_limits = {}
+    limiter = DomainRateLimiter(min_interval=2, domain_limits=domain_limits)
+    domain_limits['example.com'] = {'rate': 100, 'burst': 3}
+
+    for _ in range(3):
+        limiter.acquire('https://www.example.com/feed')
+
+    stats = limiter.get_stats()['example.com']
+    assert stats == {'requests': 3, 'waits': 0, 'wait_time': 0.0}
+
+
+def test_default_interval_applies_without_override():
+    limiter = DomainRateLimiter(min_interval=2)
+    assert limiter._reserve('https://example.org/a') == 0.0
+    assert limiter._reserve('https://example.org/b') > 1.5
+
+
+def test_wait_beyond_deadline_raises_instead_of_sleeping():
+    limiter = DomainRateLimiter(min_interval=30)
+    deadline = Deadline(5)
+    limiter.acquire('https://example.net/a', deadline)
+
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        limiter.acquire('https://example.net/b', deadline)
+    assert time.monotonic() - start < 1
+
+
+def test_refused_acquire_does_not_hold_a_token():
+    limiter = DomainRateLimiter(min_interval=1)
+    limiter.acquire('https://example.io/a')
+
+    # 预算不够等待的调用方不预留令牌，后面的调用方不必替它多等一个间隔
+    for _ in range(3):
+        with pytest.raises(DeadlineExceeded):
+            limiter.acquire('https://example.io/b', Deadline(0.5))
+    assert limiter._reserve('https://example.io/c') <= 1.0
+    assert limiter.get_stats()['example.io']['requests'] == 2
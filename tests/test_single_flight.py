@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+
+from single_flight import SingleFlight
+
+
+def test_completed_calls_are_forgotten():
+    flights = SingleFlight()
+    calls = []
+
+    assert flights.do('key', calls.append, 1) is None
+    assert flights.do('key', calls.append, 2) is None
+    assert calls == [1, 2]
+    assert flights.get_stats() == {'executed': 2, 'shared': 0}
+
+
+def test_kept_results_are_shared_by_later_calls():
+    flights = SingleFlight(keep_results=True)
+    calls = []
+
+    def fetch(value):
+        calls.append(value)
+        return value
+
+    assert flights.do('key', fetch, 1) == 1
+    assert flights.do('key', fetch, 2) == 1
+    assert calls == [1]
+    assert flights.get_stats() == {'executed': 1, 'shared': 1}
+
+
+def test_failed_calls_are_not_kept():
+    flights = SingleFlight(keep_results=True)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ValueError('boom')
+        return 'body'
+
+    with pytest.raises(ValueError):
+        flights.do('key', fetch)
+    assert flights.do('key', fetch) == 'body'
+    assert flights.do('key', fetch) == 'body'
+    assert calls == [1, 1]
+
+
+def test_sequential_same_url_fetches_share_one_request(stub_server, offline_fetcher):
+    # 同一 URL 先后作为 AI 源和事实源抓取（不同的缓存变体），只发一次 GET
+    listing = ''.join(
+        f"<article class='post-card'><h2><a href='/post/{i}'>AI story {i}</a></h2>"
+        f"<p class='excerpt'>Large language models keep improving, story {i}.</p></article>"
+        for i in range(3)
+    )
+    body = f"<html><head><meta charset='utf-8'></head><body><main>{listing}</main></body></html>".encode()
+    stub_server.routes['/ai/'] = lambda request: (200, {'Content-Type': 'text/html; charset=utf-8'}, body)
+    url = stub_server.url('/ai/')
+
+    ai = offline_fetcher.fetch_html({'name': 'TechCrunch AI', 'url': url, 'category': 'tech'}, 'ai')
+    fact = offline_fetcher.fetch_html({'name': 'TechCrunch HTML', 'url': url, 'category': 'tech'}, 'fact')
+
+    assert [a['title'] for a in ai] == [a['title'] for a in fact] == ['AI story 0', 'AI story 1', 'AI story 2']
+    assert stub_server.hits('/ai/') == 1
+    assert offline_fetcher.get_coalesce_stats() == {'executed': 1, 'shared': 1}
+
+
+def test_concurrent_async_callers_share_one_call():
+    flights = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 'body'
+
+    async def main():
+        return await asyncio.gather(*(flights.do_async('key', fetch) for _ in range(3)))
+
+    assert asyncio.run(main()) == ['body'] * 3
+    assert calls == [1]
+    assert flights.get_stats() == {'executed': 1, 'shared': 2}
+
+
+def test_leader_cancellation_is_not_shared():
+    flights = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'body'
+
+    async def main():
+        leader = asyncio.create_task(flights.do_async('key', fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.do_async('key', fetch))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower, leader.cancelled()
+
+    assert asyncio.run(main()) == ('body', True)
+    assert calls == [1, 1]
+
+
+def test_follower_cancellation_does_not_affect_leader():
+    flights = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return 'body'
+
+    async def main():
+        leader = asyncio.create_task(flights.do_async('key', fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.do_async('key', fetch))
+        await asyncio.sleep(0.01)
+        follower.cancel()
+        return await leader, follower.cancelled()
+
+    assert asyncio.run(main()) == ('body', True)
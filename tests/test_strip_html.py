@@ -0,0 +1,26 @@
+import pytest
+
+from news_parsers import strip_html
+
+
+@pytest.mark.parametrize('markup, text', [
+    ("<p>OpenAI&#8217;s <a href='x'>new <strong>model</strong></a>&nbsp;ships</p>", 'OpenAI’s new model ships'),
+    # 块级标签之间补空格，行内标签不拆开单词
+    ('<div><p>One</p><p>Two</p></div><ul><li>A</li><li>B</li></ul>', 'One Two A B'),
+    ('<p>Hello <b>wor</b>ld</p>', 'Hello world'),
+    ('a<br>b', 'a b'),
+    # 实体只解码一层
+    ('AT&amp;T &lt;b&gt; &amp;amp;', 'AT&T <b> &amp;'),
+    ('<script>track();</script>AI <style>p {}</style>news', 'AI news'),
+    ('a < b and c > d', 'a < b and c > d'),
+    ('  plain \n  text ', 'plain text'),
+    ('', ''),
+    (None, ''),
+])
+def test_strip_html(markup, text):
+    assert strip_html(markup) == text
+
+
+def test_limit_stops_early():
+    assert strip_html('<p>abcdef <i>ghij</i> klm</p>', 8) == 'abcdef g'
+    assert strip_html('plain text only', 5) == 'plain'
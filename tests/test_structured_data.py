@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+from news_parsers import parse_html_listing
+from structured_data import STRUCTURED_MIN_ITEMS, extract_structured_entries
+
+SOURCE = {'name': 'Listing', 'url': 'https://example.com/ai/', 'category': 'tech', 'lang': 'en'}
+
+
+def _listing(ld_items, dom_items=5, head=''):
+    """JSON-LD 与 DOM 的标题不同，据此判断走了哪条路径"""
+    now = datetime.now()
+    elements = ','.join(
+        f'{{"@type":"ListItem","position":{i + 1},"item":{{"@type":"NewsArticle","headline":"LD AI story {i}",'
+        f'"url":"/ld/{i}","datePublished":"{(now - timedelta(hours=24 * i)).strftime("%Y-%m-%dT%H:%M:%S")}"}}}}'
+        for i in range(ld_items)
+    )
+    ld_json = f'{{"@context":"https://schema.org","@type":"ItemList","itemListElement":[{elements}]}}'
+    articles = ''.join(
+        f"<article class='post-card'><h2><a href='/dom/{i}'>DOM AI story {i}</a></h2>"
+        f"<p class='excerpt'>Large language models keep improving, story {i}.</p></article>"
+        for i in range(dom_items)
+    )
+    return (
+        f"<html><head><meta charset='utf-8'>{head}<script type='application/ld+json'>{ld_json}</script></head>"
+        f"<body><main>{articles}</main></body></html>"
+    ).encode('utf-8')
+
+
+def test_json_ld_is_preferred_over_dom():
+    cutoff = datetime.now() - timedelta(hours=60)
+    articles, profile = parse_html_listing(_listing(4), SOURCE, 'ai', cutoff=cutoff)
+
+    # 结构化数据带真实发布时间，超出时间窗口的第 4 条被丢弃
+    assert [a['title'] for a in articles] == ['LD AI story 0', 'LD AI story 1', 'LD AI story 2']
+    assert articles[0]['link'] == 'https://example.com/ld/0'
+    assert profile is None
+
+
+def test_too_few_json_ld_items_fall_back_to_dom():
+    content = _listing(STRUCTURED_MIN_ITEMS - 1)
+    assert extract_structured_entries(content) is None
+
+    articles, profile = parse_html_listing(content, SOURCE, 'ai')
+    assert [a['title'] for a in articles][:2] == ['DOM AI story 0', 'DOM AI story 1']
+    assert profile is not None
+
+
+def test_open_graph_article_only_when_dom_has_no_list():
+    head = ("<meta property='og:type' content='article'><meta property='og:title' content='OG AI feature'>"
+            "<meta property='og:url' content='https://example.com/feature'>")
+
+    articles, _ = parse_html_listing(_listing(0, head=head), SOURCE, 'ai')
+    assert [a['title'] for a in articles][:1] == ['DOM AI story 0']
+
+    articles, profile = parse_html_listing(_listing(0, dom_items=0, head=head), SOURCE, 'ai')
+    assert [a['title'] for a in articles] == ['OG AI feature']
+    assert profile is None
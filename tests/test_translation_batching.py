@@ -0,0 +1,91 @@
+import threading
+import time
+
+from deadline import Deadline
+from translation import BaiduTranslator
+
+
+class FakeBaidu:
+    """替身 session：按行返回 trans_result，记录每次请求的 q"""
+
+    def __init__(self, drop_line=None):
+        self.queries = []
+        self.drop_line = drop_line
+        self._lock = threading.Lock()
+
+    def post(self, url, data, timeout):
+        with self._lock:
+            self.queries.append(data['q'])
+        lines = [line for line in data['q'].split('\n') if line != self.drop_line]
+        result = {'trans_result': [{'src': line, 'dst': f"译:{line}"} for line in lines]}
+        return type('Response', (), {'json': lambda self: result})()
+
+
+def _translator(fake, **kwargs):
+    translator = BaiduTranslator('appid', 'secret', linger=0.05, qps=1000, **kwargs)
+    translator.session = fake
+    return translator
+
+
+def test_batched_lines_map_back_to_their_articles():
+    fake = FakeBaidu()
+    translator = _translator(fake)
+    pairs = [('AI model A', 'Summary A'), ('AI model B', ''), ('AI model C', 'Summary A')]
+    try:
+        results = translator.translate_many(pairs)
+    finally:
+        translator.close()
+
+    assert results == [
+        {'title': '译:AI model A', 'summary': '译:Summary A'},
+        {'title': '译:AI model B', 'summary': ''},
+        {'title': '译:AI model C', 'summary': '译:Summary A'},
+    ]
+    # 一次请求，重复的摘要行只发送一次
+    assert fake.queries == ['AI model A\nSummary A\nAI model B\nAI model C']
+
+
+def test_query_byte_limit_splits_batches():
+    fake = FakeBaidu()
+    translator = _translator(fake, max_query_bytes=30)
+    pairs = [(f"AI title {i}", f"Summary {i}") for i in range(4)]
+    try:
+        results = translator.translate_many(pairs)
+    finally:
+        translator.close()
+
+    assert results == [{'title': f"译:AI title {i}", 'summary': f"译:Summary {i}"} for i in range(4)]
+    assert len(fake.queries) == 4
+    assert all(len(query.encode('utf-8')) <= 30 for query in fake.queries)
+
+
+def test_missing_line_is_matched_by_source_text():
+    fake = FakeBaidu(drop_line='Summary B')
+    translator = _translator(fake)
+    try:
+        results = translator.translate_many([('AI model A', 'Summary A'), ('AI model B', 'Summary B')])
+    finally:
+        translator.close()
+
+    # 返回的行数对不上时按原文对应，缺少译文的文章标记为未翻译
+    assert results[0] == {'title': '译:AI model A', 'summary': '译:Summary A'}
+    assert results[1] == {'title': 'AI model B (未翻译)', 'summary': 'Summary B (未翻译)'}
+    assert translator.get_stats()['failed'] == 1
+
+
+def test_close_resolves_queued_items_when_the_worker_misses_the_deadline():
+    fake = FakeBaidu()
+    translator = BaiduTranslator('appid', 'secret', deadline=Deadline(0.3), linger=1.0, qps=1000)
+    translator.session = fake
+    futures = translator.submit_many([('AI model A', 'Summary A')])
+    time.sleep(0.05)  # 后台线程进入 linger 等待
+
+    translator.close()
+    assert futures[0].done()
+    assert futures[0].result() == {'title': 'AI model A (未翻译)', 'summary': 'Summary A (未翻译)'}
+    assert translator.deadline.summary() == {'翻译': ['AI model A']}
+
+    # 后台线程醒来后正常退出，不再发送
+    translator._worker.join(timeout=2)
+    assert not translator._worker.is_alive()
+    assert fake.queries == []
@@ -0,0 +1,41 @@
+import pytest
+
+import translation_memory
+from translation_memory import TranslationMemory
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(translation_memory.time, 'time', lambda: now[0])
+    return now
+
+
+def test_expired_entries_are_ignored_and_purged_on_open(tmp_path, clock):
+    memory = TranslationMemory(str(tmp_path), ttl=100)
+    memory.put_many({'AI model': '人工智能模型'})
+    assert memory.get_many(['AI  model']) == {'AI  model': '人工智能模型'}
+
+    clock[0] += 101
+    assert memory.get_many(['AI model']) == {}
+    memory.close()
+
+    reopened = TranslationMemory(str(tmp_path), ttl=100)
+    assert reopened._conn.execute('SELECT COUNT(*) FROM translations').fetchone()[0] == 0
+    reopened.close()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    memory = TranslationMemory(str(tmp_path), max_entries=2)
+    memory.put_many({'first': '一'})
+    clock[0] += 1
+    memory.put_many({'second': '二'})
+    clock[0] += 1
+    # 读取刷新最近使用时间，之后被淘汰的是 second
+    assert memory.get_many(['first']) == {'first': '一'}
+    clock[0] += 1
+    memory.put_many({'third': '三'})
+
+    assert memory.get_many(['first', 'second', 'third']) == {'first': '一', 'third': '三'}
+    assert memory.get_stats() == {'hits': 3, 'misses': 1, 'stored': 3, 'evicted': 1}
+    memory.close()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+百度翻译批量队列
+各抓取线程/协程把待翻译的 (标题, 摘要) 放入队列，后台线程稍等片刻收集同时到达的内容，
+按百度接口的 q 长度上限把尽可能多的条目拼进一次请求（每行一段文本），
+再把 trans_result 按行映射回各条目。对外仍是 {'title', 'summary'} 的翻译结果。
+配置了翻译记忆时，已经翻译过的行直接取记忆中的译文，不再发送。
+打包好的请求交给发送线程池，按账号等级的 QPS 用令牌桶限速；调用方拿到的是 Future，
+抓取不必等待翻译完成。同一次运行中相同的 (标题, 摘要) 只提交一次，重复提交共享同一个 Future。
+"""
+
+import os
+import time
+import random
+import hashlib
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from deadline import Deadline
+from rate_limiter import TokenBucket
+from single_flight import SingleFlight
+
+BAIDU_TRANSLATE_URL = 'http://api.fanyi.baidu.com/api/trans/vip/translate'
+
+# 百度建议单次请求的 q 不超过 6000 字节（UTF-8）
+BAIDU_MAX_QUERY_BYTES = 6000
+
+# 百度翻译各账号等级的 QPS：标准版 1、高级版 10、尊享版 100（可通过 BAIDU_TRANSLATE_QPS 修改）
+BAIDU_DEFAULT_QPS = 1
+
+# 百度返回“访问频率受限”的错误码
+BAIDU_QPS_LIMITED = '54003'
+
+# 按额定 QPS 的 90% 发送，给网络抖动留出余量（请求到达服务端的间隔可能略小于发送间隔）
+QPS_HEADROOM = 0.9
+
+
+def untranslated(title, summary):
+    """翻译不可用时返回的带标记结果"""
+    return {
+        'title': f"{title} (未翻译)",
+        'summary': f"{summary} (未翻译)" if summary else "(未翻译)"
+    }
+
+
+def _one_line(text):
+    """百度按换行拆分文本，每段内容必须压成一行"""
+    return ' '.join((text or '').split())
+
+
+class BaiduTranslator:
+    """把多篇文章的标题和摘要合并成尽量少的百度翻译请求（线程安全）"""
+
+    def __init__(self, appid=None, secret_key=None, deadline=None, linger=0.2,
+                 max_query_bytes=BAIDU_MAX_QUERY_BYTES, memory=None, qps=None, workers=2):
+        """
+        Args:
+            appid / secret_key: 百度翻译密钥，默认读取 BAIDU_APPID / BAIDU_SECRET_KEY
+            deadline: 运行时间预算，到期后不再发出翻译请求
+            linger: 收到第一条待翻译内容后等待多少秒再发送，让同时完成的其他源一起合并
+            max_query_bytes: 单次请求 q 的最大字节数
+            memory: 可选的翻译记忆（translation_memory.TranslationMemory），发请求前先查询
+            qps: 每秒最多发出的请求数，默认读取 BAIDU_TRANSLATE_QPS（未设置时按标准版 1 QPS）
+            workers: 并行发送请求的线程数
+        """
+        self.appid = appid or os.getenv('BAIDU_APPID')
+        self.secret_key = secret_key or os.getenv('BAIDU_SECRET_KEY')
+        # 可通过 BAIDU_TRANSLATE_URL 指向本地替身服务
+        self.url = os.getenv('BAIDU_TRANSLATE_URL', BAIDU_TRANSLATE_URL)
+        self.deadline = deadline or Deadline()
+        self.linger = linger
+        self.max_query_bytes = max_query_bytes
+        self.memory = memory
+        self.qps = qps or float(os.getenv('BAIDU_TRANSLATE_QPS') or BAIDU_DEFAULT_QPS)
+        self.workers = workers
+        self._bucket = TokenBucket(self.qps * QPS_HEADROOM)
+        self._executor = None
+        self._flights = SingleFlight(keep_results=True)
+        self.session = requests.Session()
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+        self._pending = []
+        self._cond = threading.Condition()
+        self._worker = None
+        self._closed = False
+        self._warned = False
+
+    @property
+    def configured(self):
+        return bool(self.appid and self.secret_key)
+
+    def translate(self, title, summary):
+        """翻译一篇文章（与逐篇翻译函数的接口一致）"""
+        return self.translate_many([(title, summary)])[0]
+
+    def translate_many(self, pairs):
+        """翻译多篇文章，返回与 pairs 顺序一致的 [{'title', 'summary'}]"""
+        return [future.result() for future in self.submit_many(pairs)]
+
+    def submit_many(self, pairs):
+        """
+        把多篇文章放入翻译队列
+
+        Returns:
+            list: 每篇文章一个 concurrent.futures.Future，结果为 {'title', 'summary'}
+                  （与正在翻译的内容相同时，返回同一个 Future）
+        """
+        futures = []
+        claimed = []
+        for title, summary in pairs:
+            summary = summary or ''
+            future, leader = self._flights.claim((_one_line(title), _one_line(summary)))
+            futures.append(future)
+            if leader:
+                claimed.append((title, summary, future))
+
+        remembered = {}
+        if self.memory is not None and claimed:
+            remembered = self.memory.get_many(
+                line for title, summary, _ in claimed for line in (_one_line(title), _one_line(summary))
+            )
+
+        pending = []
+        for title, summary, future in claimed:
+            known = {line: remembered[line] for line in (_one_line(title), _one_line(summary)) if line in remembered}
+            recalled = self._assemble(title, summary, known)
+            if recalled is not None:
+                future.set_result(recalled)
+            elif not self.configured:
+                self._warn_unconfigured()
+                future.set_result(untranslated(title, summary))
+            elif self.deadline.expired():
+                self.deadline.drop('翻译', title[:40])
+                future.set_result(untranslated(title, summary))
+            else:
+                pending.append((title, summary, future, known))
+
+        if pending:
+            with self._cond:
+                self._pending.extend(pending)
+                self._start_worker()
+                self._cond.notify()
+        return futures
+
+    def estimate_requests(self, pairs):
+        """估算翻译这些 (标题, 摘要) 需要的请求次数（不考虑翻译记忆）"""
+        return sum(1 for _ in self._pack([(title, summary or '', None, {}) for title, summary in pairs]))
+
+    def _warn_unconfigured(self):
+        if not self._warned:
+            self._warned = True
+            print("⚠️ 未配置百度翻译密钥，跳过翻译")
+
+    def _start_worker(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='baidu-send')
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name='baidu-translate', daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+            # 稍等片刻，让同时完成的其他源把待翻译内容也放进队列
+            if not self._closed:
+                time.sleep(self.linger)
+            with self._cond:
+                batch, self._pending = self._pending, []
+            for items in self._pack(batch):
+                self._dispatch(items)
+
+    def _dispatch(self, items):
+        """把一组条目交给发送线程池；close() 已停止发送时按超出时间预算放弃"""
+        with self._cond:
+            if self._executor is not None:
+                self._executor.submit(self._send_guarded, items)
+                return
+        self._drop(items)
+
+    def _send_guarded(self, items):
+        try:
+            self._send(items)
+        except Exception as e:
+            print(f"⚠️ 百度翻译请求失败: {e}")
+            self._resolve_untranslated(items)
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def _drop(self, items):
+        for title, _, _, _ in items:
+            self.deadline.drop('翻译', title[:40])
+        self._resolve_untranslated(items)
+
+    def _throttle(self, items):
+        """按 QPS 取得发送令牌；需要等待但时间预算不够时丢弃这一批，返回 False"""
+        wait = self._bucket.reserve(self.deadline.remaining())
+        if wait is None:
+            self._drop(items)
+            return False
+        if wait > 0:
+            self._count('throttled_seconds', wait)
+            time.sleep(wait)
+        return True
+
+    def _lines(self, title, summary):
+        return [line for line in (_one_line(title), _one_line(summary)) if line]
+
+    def _pack(self, batch):
+        """按 q 的字节上限把条目分组（单个条目超过上限时单独成组）"""
+        group, size = [], 0
+        for item in batch:
+            item_size = sum(len(line.encode('utf-8')) + 1 for line in self._lines(item[0], item[1]) if line not in item[3])
+            if group and size + item_size > self.max_query_bytes:
+                yield group
+                group, size = [], 0
+            group.append(item)
+            size += item_size
+        if group:
+            yield group
+
+    def _resolve_untranslated(self, items):
+        for title, summary, future, _ in items:
+            if not future.done():
+                future.set_result(untranslated(title, summary))
+
+    @staticmethod
+    def _assemble(title, summary, translations):
+        """用 {原文行: 译文} 拼出一篇文章的翻译结果；标题或摘要缺少译文时返回 None"""
+        title_line, summary_line = _one_line(title), _one_line(summary)
+        if not title_line or title_line not in translations:
+            return None
+        if summary_line and summary_line not in translations:
+            return None
+        return {'title': translations[title_line].strip(), 'summary': translations.get(summary_line, '').strip()}
+
+    def _send(self, items):
+        """发出一次翻译请求（翻译记忆中已有的行不再发送），并把结果按行分配回各条目"""
+        if self.deadline.expired():
+            self._drop(items)
+            return
+
+        # 同一批次中重复的行只翻译一次
+        lines = []
+        for title, summary, _, known in items:
+            for line in self._lines(title, summary):
+                if line not in known and line not in lines:
+                    lines.append(line)
+        if not lines:
+            self._resolve_untranslated(items)
+            return
+
+        query = '\n'.join(lines)
+        self._count('texts', len(items))
+        # 限速器与服务端的计时有偏差时可能仍被判为超频，稍后重试一次
+        for attempt in range(2):
+            if not self._throttle(items):
+                return
+            result = self._post(query)
+            if str(result.get('error_code')) != BAIDU_QPS_LIMITED:
+                break
+            self._count('throttled')
+
+        if 'trans_result' not in result:
+            print(f"⚠️ 百度翻译失败: {result.get('error_msg', '未知错误')}")
+            self._count('failed', len(items))
+            self._resolve_untranslated(items)
+            return
+
+        translated = [entry.get('dst') for entry in result['trans_result']]
+        if len(translated) != len(lines):
+            # 行数对不上时按原文匹配
+            by_source = {entry.get('src'): entry.get('dst') for entry in result['trans_result']}
+            translated = [by_source.get(line) for line in lines]
+        fresh = {line: dst for line, dst in zip(lines, translated) if dst is not None}
+        if self.memory is not None:
+            self.memory.put_many(fresh)
+
+        for title, summary, future, known in items:
+            translation = self._assemble(title, summary, {**known, **fresh})
+            if translation is None:
+                self._count('failed')
+                translation = untranslated(title, summary)
+            future.set_result(translation)
+
+    def _post(self, query):
+        salt = str(random.randint(32768, 65536))
+        sign = hashlib.md5((self.appid + query + salt + self.secret_key).encode('utf-8')).hexdigest()
+        params = {
+            'q': query,
+            'from': 'en',
+            'to': 'zh',
+            'appid': self.appid,
+            'salt': salt,
+            'sign': sign
+        }
+        self._count('requests')
+        response = self.session.post(self.url, data=params, timeout=self.deadline.cap_timeout(10))
+        return response.json()
+
+    def get_stats(self):
+        """返回翻译条目数、请求次数、失败条目数、被限频次数、限速等待秒数和合并的重复条目数"""
+        with self._stats_lock:
+            return {
+                'coalesced': self._flights.get_stats()['shared'],
+                'texts': self.stats['texts'],
+                'requests': self.stats['requests'],
+                'failed': self.stats['failed'],
+                'throttled': self.stats['throttled'],
+                'throttled_seconds': round(self.stats['throttled_seconds'], 1),
+            }
+
+    def close(self):
+        """
+        发送队列中剩余的内容并停止后台线程（等待已提交的请求完成）
+
+        后台线程没能在剩余时间内退出时，不再发送队列中的内容，对应的条目按超出时间预算放弃（标记为未翻译）。
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._worker is not None:
+            self._worker.join(timeout=self.deadline.cap_timeout(15))
+        with self._cond:
+            # 之后后台线程再取到的批次由 _dispatch 放弃
+            executor, self._executor = self._executor, None
+            remaining, self._pending = self._pending, []
+        self._drop(remaining)
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+翻译记忆模块
+把翻译过的文本按 (语言对, 规范化原文) 的哈希保存在 SQLite 中，跨运行复用。
+同一标题在连续几天的运行里反复出现时不再调用百度翻译。
+条目超过有效期（TTL）后失效，总数超过上限时按最近使用时间淘汰（LRU）。
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import Counter
+
+from http_cache import DEFAULT_CACHE_DIR
+
+# 翻译记忆最多保存的条目数
+MAX_ENTRIES = 20000
+
+# 翻译结果的有效期（秒）
+TTL_SECONDS = 30 * 86400
+
+# SQLite 单条语句的参数个数上限（旧版本为 999）
+_SQL_BATCH = 500
+
+
+def normalize_text(text):
+    """规范化原文：合并空白（大小写保留，专有名词的大小写会影响译文）"""
+    return ' '.join((text or '').split())
+
+
+def memory_key(text, from_lang='en', to_lang='zh'):
+    return hashlib.sha1(f"{from_lang}>{to_lang}\n{normalize_text(text)}".encode('utf-8')).hexdigest()
+
+
+class TranslationMemory:
+    """SQLite 翻译记忆（线程安全；数据库不可用时所有查询都按未命中处理）"""
+
+    def __init__(self, cache_dir=None, max_entries=MAX_ENTRIES, ttl=TTL_SECONDS):
+        self.path = os.path.join(cache_dir or DEFAULT_CACHE_DIR, 'translations.sqlite3')
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        self._conn = self._open()
+
+    def _open(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS translations ('
+                ' key TEXT PRIMARY KEY, source TEXT, translated TEXT,'
+                ' created_at REAL, last_used REAL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)')
+            # 打开时顺带清理过期条目
+            conn.execute('DELETE FROM translations WHERE created_at < ?', (time.time() - self.ttl,))
+            conn.commit()
+            return conn
+        except sqlite3.Error as e:
+            print(f"  ⚠️  翻译记忆不可用: {e}")
+            return None
+
+    def get_many(self, texts, from_lang='en', to_lang='zh'):
+        """
+        查询多段原文的译文
+
+        Returns:
+            dict: {原文: 译文}，只包含命中且未过期的条目
+        """
+        keys = {}
+        for text in texts:
+            if text:
+                keys.setdefault(memory_key(text, from_lang, to_lang), text)
+        if not keys:
+            return {}
+
+        found = {}
+        now = time.time()
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    key_list = list(keys)
+                    for start in range(0, len(key_list), _SQL_BATCH):
+                        batch = key_list[start:start + _SQL_BATCH]
+                        rows = self._conn.execute(
+                            f"SELECT key, translated FROM translations WHERE created_at >= ? "
+                            f"AND key IN ({','.join('?' * len(batch))})",
+                            [now - self.ttl] + batch,
+                        ).fetchall()
+                        for key, translated in rows:
+                            found[keys[key]] = translated
+                    if found:
+                        hit_keys = [key for key, text in keys.items() if text in found]
+                        self._conn.executemany(
+                            'UPDATE translations SET last_used = ? WHERE key = ?',
+                            [(now, key) for key in hit_keys],
+                        )
+                        self._conn.commit()
+                except sqlite3.Error as e:
+                    print(f"  ⚠️  查询翻译记忆失败: {e}")
+            self.stats['hits'] += len(found)
+            self.stats['misses'] += len(keys) - len(found)
+        return found
+
+    def put_many(self, translations, from_lang='en', to_lang='zh'):
+        """保存 {原文: 译文}，超出条目上限时淘汰最久未使用的条目"""
+        rows = [
+            (memory_key(text, from_lang, to_lang), normalize_text(text), translated, time.time(), time.time())
+            for text, translated in translations.items() if text and translated
+        ]
+        if not rows:
+            return
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._conn.executemany('INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)', rows)
+                overflow = self._conn.execute('SELECT COUNT(*) FROM translations').fetchone()[0] - self.max_entries
+                if overflow > 0:
+                    self._conn.execute(
+                        'DELETE FROM translations WHERE key IN '
+                        '(SELECT key FROM translations ORDER BY last_used LIMIT ?)',
+                        (overflow,),
+                    )
+                    self.stats['evicted'] += overflow
+                self._conn.commit()
+                self.stats['stored'] += len(rows)
+            except sqlite3.Error as e:
+                print(f"  ⚠️  保存翻译记忆失败: {e}")
+
+    def get_stats(self):
+        """返回本次运行的命中、未命中、新增和淘汰条目数"""
+        with self._lock:
+            return {name: self.stats[name] for name in ('hits', 'misses', 'stored', 'evicted')}
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None